@@ -2,7 +2,6 @@ from typing import List
 from src.models.position import Position
 from src.models.trend_analysis import TrendAnalysis, PerformanceTrend
 import numpy as np
-from scipy import stats
 
 class AdvancedAnalyzer:
     """
@@ -12,6 +11,7 @@ class AdvancedAnalyzer:
     def detect_trend(values: List[float]) -> TrendAnalysis:
         if not values or len(values) < 2:
             return TrendAnalysis(trend=PerformanceTrend.UNKNOWN, trend_data=values)
+        from scipy import stats  # deferred: scipy is only needed for regression
         x = np.arange(len(values))
         slope, intercept, r_value, p_value, std_err = stats.linregress(x, values)
         if p_value > 0.05:
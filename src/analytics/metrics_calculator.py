@@ -2,6 +2,7 @@ from typing import List, Dict, Any
 from src.models.position import Position
 from src.models.analytics_result import AnalyticsResult
 import numpy as np
+import pandas as pd
 
 class MetricsCalculator:
     """
@@ -45,6 +46,20 @@ class MetricsCalculator:
             grouped.setdefault(key, []).append(p)
         return grouped
 
+    @staticmethod
+    def filter_by_date_range(positions: List[Position], start=None, end=None) -> List[Position]:
+        """Keep positions whose entry date falls within [start, end] (inclusive, either bound optional)."""
+        if start is None and end is None:
+            return list(positions)
+        from src.utils.time_utils import to_timestamps
+        entry_dates = to_timestamps(p.entry_time() for p in positions).dt.normalize()
+        mask = entry_dates.notna()
+        if start is not None:
+            mask &= entry_dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= entry_dates <= pd.Timestamp(end)
+        return [p for p, keep in zip(positions, mask) if keep]
+
     @staticmethod
     def dte_bucket(dte: float) -> str:
         if dte <= 7:
@@ -56,6 +71,59 @@ class MetricsCalculator:
         else:
             return '60+'
 
+    @staticmethod
+    def chart_series(positions: List[Position]) -> Dict[str, Any]:
+        """Build the analytics inputs expected by ChartCoordinator.generate_all_charts."""
+        pnls = [p.pnl for p in positions if p.pnl is not None]
+        by_strategy = MetricsCalculator.group_by(positions, MetricsCalculator._position_strategy)
+        dte_groups = MetricsCalculator.group_by(
+            [p for p in positions if getattr(p, 'dte', None) is not None],
+            lambda p: MetricsCalculator.dte_bucket(p.dte)
+        )
+        return {
+            'pnl_series': pnls,
+            'win_loss': [pnl > 0 for pnl in pnls],
+            'strategy_pnls': {k: MetricsCalculator.total_pnl(v) for k, v in by_strategy.items()},
+            'dte_buckets': {k: MetricsCalculator.time_weighted_return(v) for k, v in dte_groups.items()},
+            'position_sizes': [sum(abs(t.quantity or 0) for t in p.entry_trades) for p in positions if p.entry_trades],
+            'comparison_data': {k: [p.pnl for p in v if p.pnl is not None] for k, v in by_strategy.items()},
+        }
+
+    @staticmethod
+    def positions_frame(positions: List[Position]) -> pd.DataFrame:
+        """One row per position, for tabular display."""
+        return pd.DataFrame({
+            'Symbol': [MetricsCalculator._position_symbol(p) for p in positions],
+            'Status': [p.status for p in positions],
+            'Entry Time': [p.entry_time() for p in positions],
+            'Exit Time': [p.exit_time() for p in positions],
+            'Quantity': [sum(abs(t.quantity or 0) for t in p.entry_trades) for p in positions],
+            'PnL': pd.Series([p.pnl for p in positions], dtype='float64'),
+            'Holding Period (days)': pd.Series([p.holding_period for p in positions], dtype='float64'),
+        })
+
+    @staticmethod
+    def _position_symbol(position: Position) -> str:
+        trades = position.entry_trades or position.exit_trades
+        return trades[0].symbol if trades else 'UNKNOWN'
+
+    @staticmethod
+    def strategy_groups(positions: List[Position]) -> Dict[str, Dict[str, Any]]:
+        """Trade count, win rate and total PnL per detected strategy (positions without one are left out)."""
+        tagged = [p for p in positions if getattr(p, 'strategy', None)]
+        return {
+            strategy: {
+                'num_trades': len(group),
+                'win_rate': MetricsCalculator.win_loss_ratio(group),
+                'total_pnl': MetricsCalculator.total_pnl(group),
+            }
+            for strategy, group in MetricsCalculator.group_by(tagged, lambda p: p.strategy).items()
+        }
+
+    @staticmethod
+    def _position_strategy(position: Position) -> str:
+        return getattr(position, 'strategy', None) or 'UNKNOWN'
+
     @staticmethod
     def calculate_all(positions: List[Position]) -> AnalyticsResult:
         result = AnalyticsResult()
@@ -65,6 +133,5 @@ class MetricsCalculator:
         result.holding_periods = MetricsCalculator.holding_periods(positions)
         result.risk_adjusted_return = MetricsCalculator.risk_adjusted_return(positions)
         result.num_trades = len(positions)
-        # Example grouping by DTE bucket (assuming each position has a dte attribute)
-        # result.grouped_results = MetricsCalculator.group_by(positions, lambda p: MetricsCalculator.dte_bucket(getattr(p, 'dte', 0)))
+        result.grouped_results = MetricsCalculator.strategy_groups(positions)
         return result 
\ No newline at end of file
@@ -0,0 +1,147 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.models.position import Position
+from src.utils.time_utils import to_timestamps
+
+# Sentinels for positions without an entry (never matched) or without an exit (still open)
+MISSING = np.iinfo(np.int64).max
+OPEN = np.iinfo(np.int64).max
+
+def _ns(values) -> np.ndarray:
+    stamps = to_timestamps(values)
+    return np.where(stamps.isna(), MISSING, stamps.to_numpy(dtype='datetime64[ns]').astype(np.int64))
+
+def _bounds(start, end) -> Tuple[int, int]:
+    """
+    Inclusive nanosecond bounds. A bare date (or "YYYY-MM-DD" string) as
+    ``end`` covers that whole day.
+    """
+    lo = pd.Timestamp(start).value if start is not None else np.iinfo(np.int64).min
+    if end is None:
+        hi = MISSING - 1
+    else:
+        hi = pd.Timestamp(end).value
+        whole_day = (isinstance(end, date) and not isinstance(end, datetime)) or (isinstance(end, str) and len(end) == 10)
+        if whole_day:
+            hi += pd.Timedelta(days=1).value - 1
+    return lo, hi
+
+class _Intervals:
+    """
+    Rows sorted by entry time, with a segment tree of max exit time, so
+    "rows in [lo, hi) still open at T" visits only subtrees that can match.
+    """
+    def __init__(self, entry: np.ndarray, exit: np.ndarray):
+        self.entry = entry
+        self.exit = exit
+        size = 1
+        while size < max(len(entry), 1):
+            size *= 2
+        self.size = size
+        tree = np.full(2 * size, np.iinfo(np.int64).min, dtype=np.int64)
+        tree[size:size + len(exit)] = exit
+        # Build one level at a time: nodes [n, 2n) are parents of [2n, 4n)
+        level = size // 2
+        while level >= 1:
+            tree[level:2 * level] = np.maximum(tree[2 * level:4 * level:2], tree[2 * level + 1:4 * level:2])
+            level //= 2
+        self.tree = tree
+
+    def exiting_after(self, lo: int, hi: int, when: int) -> List[int]:
+        """Rows in [lo, hi) whose exit is at or after ``when``, in row order."""
+        rows = []
+        stack = [(1, 0, self.size)]
+        tree = self.tree
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if node_hi <= lo or node_lo >= hi or tree[node] < when:
+                continue
+            if node_hi - node_lo == 1:
+                rows.append(node_lo)
+                continue
+            mid = (node_lo + node_hi) // 2
+            stack.append((2 * node + 1, mid, node_hi))
+            stack.append((2 * node, node_lo, mid))
+        return rows
+
+class PositionIndex:
+    """
+    Read-only index over linked positions for dashboard queries.
+
+    Positions are stored symbol-major and entry-sorted, so each symbol owns a
+    contiguous row range and date-range lookups are binary searches. A
+    max-exit segment tree answers "open at T" in O(log n + k); counts use
+    the sorted entry/exit endpoints alone.
+    """
+    def __init__(self, positions: List[Position]):
+        from src.analytics.metrics_calculator import MetricsCalculator
+        self._all = list(positions)
+        entry = _ns(p.entry_time() for p in self._all)
+        exit = _ns(p.exit_time() for p in self._all)
+        exit = np.where(exit == MISSING, OPEN, exit)
+        symbols = np.array([MetricsCalculator._position_symbol(p) for p in self._all], dtype=object)
+
+        # Symbol-major rows: symbol -> contiguous [lo, hi) range, entry-sorted inside it
+        codes, names = pd.factorize(symbols, sort=True) if len(symbols) else (np.array([], dtype=np.int64), [])
+        order = np.lexsort((entry, codes))
+        self._rows = [self._all[i] for i in order]
+        self._symbol_rows = _Intervals(entry[order], exit[order])
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        self._symbol_ranges: Dict[str, Tuple[int, int]] = {
+            str(name): (int(bounds[i]), int(bounds[i + 1])) for i, name in enumerate(names)
+        }
+
+        # Global entry order for queries across all symbols
+        by_entry = np.argsort(entry, kind='stable')
+        self._by_entry = [self._all[i] for i in by_entry]
+        self._entry_rows = _Intervals(entry[by_entry], exit[by_entry])
+        self._sorted_exits = np.sort(exit)
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def symbols(self) -> List[str]:
+        return list(self._symbol_ranges)
+
+    def _scope(self, symbol: Optional[str]):
+        if symbol is None:
+            return self._entry_rows, self._by_entry, 0, len(self._by_entry)
+        lo, hi = self._symbol_ranges.get(symbol, (0, 0))
+        return self._symbol_rows, self._rows, lo, hi
+
+    def for_symbol(self, symbol: str) -> List[Position]:
+        lo, hi = self._symbol_ranges.get(symbol, (0, 0))
+        return self._rows[lo:hi]
+
+    def entered_between(self, start=None, end=None, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Positions entered in [start, end] (dates cover whole days), oldest first.
+        With no bounds and no symbol, every position is returned in its original order.
+        """
+        if start is None and end is None and symbol is None:
+            return list(self._all)
+        intervals, rows, lo, hi = self._scope(symbol)
+        start_ns, end_ns = _bounds(start, end)
+        first = lo + int(np.searchsorted(intervals.entry[lo:hi], start_ns, side='left'))
+        last = lo + int(np.searchsorted(intervals.entry[lo:hi], end_ns, side='right'))
+        return rows[first:last]
+
+    def open_between(self, start, end, symbol: Optional[str] = None) -> List[Position]:
+        """Positions open at any moment in [start, end]: entered by ``end`` and not exited before ``start``."""
+        intervals, rows, lo, hi = self._scope(symbol)
+        start_ns, end_ns = _bounds(start, end)
+        last = lo + int(np.searchsorted(intervals.entry[lo:hi], end_ns, side='right'))
+        return [rows[i] for i in intervals.exiting_after(lo, last, start_ns)]
+
+    def open_at(self, when, symbol: Optional[str] = None) -> List[Position]:
+        """Positions open at ``when``; a bare date means at any time on that day."""
+        return self.open_between(when, when, symbol)
+
+    def count_open_at(self, when) -> int:
+        """Number of positions open at ``when``, from the sorted endpoints alone."""
+        start_ns, end_ns = _bounds(when, when)
+        entered = int(np.searchsorted(self._entry_rows.entry, end_ns, side='right'))
+        exited = int(np.searchsorted(self._sorted_exits, start_ns, side='left'))
+        return entered - exited
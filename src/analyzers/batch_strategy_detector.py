@@ -0,0 +1,156 @@
+import re
+from itertools import product
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.models.strategy_components import StrategyLeg, StrategyPattern
+from src.parsers.description_parser import DescriptionParser
+
+# A canonical leg is (expiry rank, strike rank, type, signed ratio) packed into LEG_BITS bits:
+# expiry rank (2 bits) | strike rank (2 bits) | put flag (1 bit) | signed ratio + RATIO_OFFSET (4 bits)
+MAX_LEGS = 4
+MAX_RATIO = 7
+RATIO_OFFSET = 8
+LEG_BITS = 9
+COUNT_SHIFT = LEG_BITS * MAX_LEGS
+UNCLASSIFIED = -1
+
+SELL_SIDES = ('sell', 'sto', 'stc')
+LEG_COLUMNS = ['order', 'symbol', 'expiry', 'strike', 'option_type', 'side', 'quantity']
+PATTERN_NAMES = [p.name for p in StrategyPattern]
+
+def _leg_code(expiry_rank, strike_rank, is_put, ratio):
+    """Pack canonical legs (scalars or numpy arrays) into integer codes."""
+    return (expiry_rank << 7) | (strike_rank << 5) | (is_put << 4) | (ratio + RATIO_OFFSET)
+
+def _signature(legs: Sequence[Tuple[int, int, int, int]]) -> int:
+    """Signature of one group's canonical legs, sorted the same way as the vectorized path."""
+    codes = sorted(_leg_code(*leg) for leg in legs)
+    return sum(code << (LEG_BITS * i) for i, code in enumerate(codes)) | (len(codes) << COUNT_SHIFT)
+
+def _templates() -> Iterable[Tuple[StrategyPattern, List[Tuple[int, int, int, int]]]]:
+    """Every canonical leg layout of each named pattern: (expiry rank, strike rank, is_put, signed ratio)."""
+    signs = (1, -1)
+    for put, sign in product((0, 1), signs):
+        yield StrategyPattern.SINGLE_LEG, [(0, 0, put, sign)]
+    for put, sign in product((0, 1), signs):
+        yield StrategyPattern.VERTICAL_SPREAD, [(0, 0, put, sign), (0, 1, put, -sign)]
+        yield StrategyPattern.CALENDAR_SPREAD, [(0, 0, put, sign), (1, 0, put, -sign)]
+        for low, high in product(range(1, MAX_RATIO + 1), repeat=2):
+            if low != high:
+                yield StrategyPattern.RATIO_SPREAD, [(0, 0, put, sign * low), (0, 1, put, -sign * high)]
+        # Long or short butterfly: 1 / -2 / 1 across three strikes of one type
+        yield StrategyPattern.BUTTERFLY, [(0, 0, put, sign), (0, 1, put, -2 * sign), (0, 2, put, sign)]
+    for s1, s2 in product(signs, repeat=2):
+        yield StrategyPattern.STRADDLE, [(0, 0, 0, s1), (0, 0, 1, s2)]
+        yield StrategyPattern.STRANGLE, [(0, 0, 1, s1), (0, 1, 0, s2)]
+        yield StrategyPattern.STRANGLE, [(0, 0, 0, s1), (0, 1, 1, s2)]
+    for sign in signs:
+        # Iron condor: long put wing, short put, short call, long call wing (or the reverse)
+        yield StrategyPattern.IRON_CONDOR, [(0, 0, 1, sign), (0, 1, 1, -sign), (0, 2, 0, -sign), (0, 3, 0, sign)]
+        # Iron butterfly: the short (or long) put and call share the middle strike
+        yield StrategyPattern.BUTTERFLY, [(0, 0, 1, sign), (0, 1, 1, -sign), (0, 1, 0, -sign), (0, 2, 0, sign)]
+
+SIGNATURE_PATTERNS: Dict[int, StrategyPattern] = {
+    _signature(legs): pattern for pattern, legs in _templates()
+}
+
+def leg_signature(legs: Sequence[StrategyLeg]) -> int:
+    """Signature of a single group of legs, encoded exactly like BatchStrategyDetector.signatures."""
+    if not legs or len(legs) > MAX_LEGS or len({leg.symbol for leg in legs}) != 1:
+        return UNCLASSIFIED
+    expiries = sorted({leg.expiry for leg in legs})
+    strikes = sorted({leg.strike for leg in legs})
+    smallest = min(abs(leg.quantity) for leg in legs)
+    if smallest == 0 or len(expiries) > 4 or len(strikes) > 4:
+        return UNCLASSIFIED
+    canonical = []
+    for leg in legs:
+        ratio, remainder = divmod(abs(leg.quantity), smallest)
+        if remainder or ratio > MAX_RATIO:
+            return UNCLASSIFIED
+        sign = -1 if leg.side.lower() in SELL_SIDES else 1
+        canonical.append((expiries.index(leg.expiry), strikes.index(leg.strike), int(leg.option_type.lower() == 'put'), sign * ratio))
+    return _signature(canonical)
+
+class BatchStrategyDetector:
+    """
+    Classifies many orders' legs at once.
+
+    Legs are grouped by order number, reduced to a canonical signature
+    (dense strike and expiry ranks, option type, side and quantity ratio)
+    with vectorized pandas/numpy operations, and looked up in a table of
+    precomputed pattern signatures. Strike *ranks* are compared, not
+    distances, so broken-wing variants classify with their base pattern.
+    """
+    @staticmethod
+    def legs_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Extract every leg from a TastyTrade frame's Description column in one
+        vectorized pass. Returns one row per leg with LEG_COLUMNS.
+        """
+        if df.empty:
+            return pd.DataFrame(columns=LEG_COLUMNS)
+        pattern = DescriptionParser.SINGLE_LEG_PATTERN
+        descriptions = df['Description'].astype(object)
+        descriptions = descriptions.where(descriptions.map(lambda d: isinstance(d, str)), '')
+        legs = descriptions.str.extractall(pattern.pattern, flags=re.IGNORECASE)
+        if legs.empty:
+            return pd.DataFrame(columns=LEG_COLUMNS)
+        rows = legs.index.get_level_values(0)
+        return pd.DataFrame({
+            'order': df['Order #'].loc[rows].astype(str).str.replace('#', '', regex=False).str.strip().to_numpy(),
+            'symbol': df['Symbol'].loc[rows].astype(str).to_numpy(),
+            'expiry': legs['expiry'].str.strip().to_numpy(),
+            'strike': legs['strike'].astype(float).to_numpy(),
+            'option_type': legs['type'].str.capitalize().to_numpy(),
+            'side': np.where(legs['side'].str.upper().isin(['STO', 'STC']), 'Sell', 'Buy'),
+            'quantity': legs['qty'].astype(int).to_numpy(),
+        })
+
+    @staticmethod
+    def signatures(legs: pd.DataFrame, group_by: Sequence[str] = ('order',)) -> pd.Series:
+        """Canonical signature per group (UNCLASSIFIED where no pattern can match)."""
+        group_by = list(group_by)
+        if legs.empty:
+            return pd.Series([], dtype=np.int64)
+        group = legs.groupby(group_by, sort=False, dropna=False).ngroup().to_numpy()
+        expiry_rank = legs.groupby(group)['expiry'].rank(method='dense').to_numpy(dtype=np.int64) - 1
+        strike_rank = legs.groupby(group)['strike'].rank(method='dense').to_numpy(dtype=np.int64) - 1
+        is_put = legs['option_type'].str.lower().eq('put').to_numpy(dtype=np.int64)
+        sells = legs['side'].str.lower().isin(SELL_SIDES).to_numpy()
+        size = np.abs(legs['quantity'].to_numpy(dtype=np.int64))
+        smallest = pd.Series(size).groupby(group).transform('min').to_numpy()
+        ratio = np.floor_divide(size, smallest, out=np.zeros_like(size), where=smallest > 0)
+        exact = (smallest > 0) & (ratio * smallest == size) & (ratio <= MAX_RATIO)
+        signed = np.where(sells, -ratio, ratio)
+
+        in_range = exact & (expiry_rank < 4) & (strike_rank < 4)
+        codes = _leg_code(np.minimum(expiry_rank, 3), np.minimum(strike_rank, 3), is_put, np.clip(signed, -MAX_RATIO, MAX_RATIO))
+        # Canonical order inside each group: sort by (group, code) and number the legs
+        order = np.lexsort((codes, group))
+        sorted_group = group[order]
+        position = np.arange(len(order)) - np.searchsorted(sorted_group, sorted_group, side='left')
+        shifted = np.where(position < MAX_LEGS, codes[order] << (LEG_BITS * np.minimum(position, MAX_LEGS - 1)), 0)
+
+        frame = pd.DataFrame({'group': sorted_group, 'shifted': shifted, 'ok': in_range[order]})
+        per_group = frame.groupby('group', sort=True).agg(signature=('shifted', 'sum'), legs=('shifted', 'size'), ok=('ok', 'all'))
+        symbols = legs.groupby(group)['symbol'].nunique()
+        signature = per_group['signature'].to_numpy() | (per_group['legs'].to_numpy() << COUNT_SHIFT)
+        valid = per_group['ok'].to_numpy() & (per_group['legs'].to_numpy() <= MAX_LEGS) & (symbols.to_numpy() == 1)
+        keys = legs.groupby(group_by, sort=False, dropna=False).size().index
+        # ngroup numbers groups in order of first appearance when sort=False
+        return pd.Series(np.where(valid, signature, UNCLASSIFIED), index=keys)
+
+    @staticmethod
+    def classify(legs: pd.DataFrame, group_by: Sequence[str] = ('order',)) -> pd.Series:
+        """Strategy pattern name per group, as a categorical Series indexed by the group keys."""
+        signatures = BatchStrategyDetector.signatures(legs, group_by)
+        lookup = {signature: pattern.name for signature, pattern in SIGNATURE_PATTERNS.items()}
+        names = signatures.map(lookup).fillna(StrategyPattern.COMPLEX.name)
+        return names.astype(pd.CategoricalDtype(PATTERN_NAMES))
+
+    @staticmethod
+    def classify_orders(df: pd.DataFrame) -> pd.Series:
+        """Classify every order in a TastyTrade frame straight from its Description column."""
+        return BatchStrategyDetector.classify(BatchStrategyDetector.legs_frame(df))
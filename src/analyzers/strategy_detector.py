@@ -1,10 +1,13 @@
 import logging
 from typing import List, Optional
 from src.models.strategy_components import StrategyPattern, StrategyLeg
+from src.analyzers.batch_strategy_detector import SIGNATURE_PATTERNS, leg_signature
 
 class StrategyDetector:
     """
     Detects common options strategies from parsed trade legs.
+    Uses the same canonical signatures as BatchStrategyDetector, so one
+    order classifies identically on its own or in a batch.
     """
     @staticmethod
     def detect(legs: List[StrategyLeg]) -> StrategyPattern:
@@ -13,48 +16,4 @@ class StrategyDetector:
             return StrategyPattern.COMPLEX
         if len(legs) == 1:
             return StrategyPattern.SINGLE_LEG
-        if StrategyDetector._is_vertical_spread(legs):
-            return StrategyPattern.VERTICAL_SPREAD
-        if StrategyDetector._is_straddle(legs):
-            return StrategyPattern.STRADDLE
-        if StrategyDetector._is_strangle(legs):
-            return StrategyPattern.STRANGLE
-        return StrategyPattern.COMPLEX
-
-    @staticmethod
-    def _is_vertical_spread(legs: List[StrategyLeg]) -> bool:
-        if len(legs) != 2:
-            return False
-        l1, l2 = legs
-        return (
-            l1.symbol == l2.symbol and
-            l1.expiry == l2.expiry and
-            l1.option_type == l2.option_type and
-            l1.side != l2.side and
-            l1.is_call() == l2.is_call() and
-            l1.strike != l2.strike
-        )
-
-    @staticmethod
-    def _is_straddle(legs: List[StrategyLeg]) -> bool:
-        if len(legs) != 2:
-            return False
-        l1, l2 = legs
-        return (
-            l1.symbol == l2.symbol and
-            l1.expiry == l2.expiry and
-            l1.strike == l2.strike and
-            {l1.option_type.lower(), l2.option_type.lower()} == {"call", "put"}
-        )
-
-    @staticmethod
-    def _is_strangle(legs: List[StrategyLeg]) -> bool:
-        if len(legs) != 2:
-            return False
-        l1, l2 = legs
-        return (
-            l1.symbol == l2.symbol and
-            l1.expiry == l2.expiry and
-            l1.option_type != l2.option_type and
-            l1.strike != l2.strike
-        ) 
\ No newline at end of file
+        return SIGNATURE_PATTERNS.get(leg_signature(legs), StrategyPattern.COMPLEX)
@@ -1,15 +1,29 @@
 import logging
-from typing import List
+from datetime import datetime
+from typing import Callable, List, Optional
 from src.models.trade import Trade
 from src.models.position import Position
 
+# Position groups linked between progress callbacks
+PROGRESS_INTERVAL = 500
+
+def _as_datetime(value):
+    # CSVProcessor keeps trade times as ISO-like strings
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
 class TradeLinker:
     """
     Links related trades into positions using strict matching criteria.
     """
 
     @staticmethod
-    def link_trades(trades: List[Trade]) -> List[Position]:
+    def link_trades(trades: List[Trade], progress: Optional[Callable[[int, int], None]] = None) -> List[Position]:
+        """
+        ``progress(groups_linked, total_groups)`` is called every
+        PROGRESS_INTERVAL contract groups and once at the end.
+        """
         # Group trades by (symbol, expiry, strike, option_type)
         grouped = {}
         for t in trades:
@@ -17,7 +31,9 @@ class TradeLinker:
             grouped.setdefault(key, []).append(t)
 
         positions = []
-        for key, group in grouped.items():
+        for linked, (key, group) in enumerate(grouped.items()):
+            if progress is not None and linked % PROGRESS_INTERVAL == 0 and linked:
+                progress(linked, len(grouped))
             # Sort by time
             group = sorted(group, key=lambda t: t.time)
             if not group:
@@ -60,8 +76,8 @@ class TradeLinker:
 
             # Fixed holding period calculation
             if entry_trades and exit_trades:
-                first_entry_time = min(t.time for t in entry_trades)
-                last_exit_time = max(t.time for t in exit_trades)
+                first_entry_time = min(_as_datetime(t.time) for t in entry_trades)
+                last_exit_time = max(_as_datetime(t.time) for t in exit_trades)
                 time_diff = last_exit_time - first_entry_time
                 pos.holding_period = time_diff.days + time_diff.seconds / 86400
             else:
@@ -70,4 +86,6 @@ class TradeLinker:
             pos.calculate_time_weighted_return()
             positions.append(pos)
 
+        if progress is not None:
+            progress(len(grouped), len(grouped))
         return positions
@@ -0,0 +1,148 @@
+import io
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+import streamlit as st
+from src.app.job_runner import Job, JobRunner
+from src.app.main_controller import MainController, chart_process_pool, filtered_stage, metrics_stage
+from src.analytics.position_index import PositionIndex
+from src.models.position import Position
+
+# Stages whose outputs depend only on the uploaded file's content
+INGEST_STAGES = ('load', 'duplicates', 'trades', 'legs', 'strategies', 'positions', 'index')
+
+# Share of the overall progress bar covered by the row-level stages
+PROGRESS_SPANS = {
+    'trades': (0.05, 0.45, 'Parsing rows'),
+    'positions': (0.45, 0.6, 'Linking positions'),
+}
+
+LLM_CACHE_PATH = 'data/llm_cache.db'
+
+# Workers in the stage pools shared by every session
+SHARED_LLM_WORKERS = 4
+SHARED_CHART_WORKERS = 2
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_ingest(content_key: str, _file_bytes: bytes, _progress: Optional[Dict[str, Callable[[int, int], None]]] = None) -> Dict[str, Any]:
+    """
+    Parse, de-duplicate and link an upload. Keyed by the upload's content hash
+    (``_file_bytes`` and ``_progress`` are excluded from Streamlit's hashing),
+    so widget interactions never re-parse the same file.
+    """
+    controller = MainController()
+    controller.progress_callbacks = _progress or {}
+    controller.pipeline.set_param('csv_source', io.BytesIO(_file_bytes), key=content_key)
+    return {name: controller.pipeline.run(name) for name in INGEST_STAGES}
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_metrics(content_key: str, start_date: Optional[date], end_date: Optional[date], _index: PositionIndex) -> Dict[str, Any]:
+    """Date-filter the cached position index and compute metrics; keyed by content hash and date range."""
+    filtered = filtered_stage(_index, start_date, end_date)
+    return {'filtered': filtered, 'metrics': metrics_stage(filtered)}
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_positions_table(content_key: str, start_date: Optional[date], end_date: Optional[date], _positions: List[Position]):
+    """Tabular view of the date-filtered positions; keyed like cached_metrics."""
+    from src.analytics.metrics_calculator import MetricsCalculator
+    return MetricsCalculator.positions_frame(_positions)
+
+@st.cache_resource(show_spinner=False)
+def shared_llm_client(request_timeout: float = 30.0):
+    from src.llm.async_openai_client import AsyncOpenAIClient
+    from src.llm.response_cache import ResponseCache
+    # Re-rendering a report for unchanged metrics answers from disk instead of the model
+    return AsyncOpenAIClient(cache=ResponseCache.from_env() or ResponseCache(LLM_CACHE_PATH), request_timeout=request_timeout)
+
+_chart_pool_lock = threading.Lock()
+
+# The LLM thread pool and chart process pool are shared by every session's
+# controller so sessions don't each start (and leak) their own pools.
+# Controllers don't shut down executors they were given.
+@st.cache_resource(show_spinner=False)
+def shared_llm_executor() -> Executor:
+    return ThreadPoolExecutor(max_workers=SHARED_LLM_WORKERS, thread_name_prefix='llm-stage')
+
+@st.cache_resource(show_spinner=False)
+def shared_chart_executor() -> Executor:
+    return chart_process_pool(SHARED_CHART_WORKERS)
+
+def replace_shared_chart_executor(broken: Executor) -> Executor:
+    """
+    Rebuild the shared chart pool once a dead worker has broken it, and return
+    the current pool. Sessions still holding the broken pool get the same
+    replacement instead of rebuilding it again.
+    """
+    with _chart_pool_lock:
+        if shared_chart_executor() is broken:
+            broken.shutdown(wait=False)
+            shared_chart_executor.clear()
+        return shared_chart_executor()
+
+def session_controller(app_config: Dict[str, Any]) -> MainController:
+    """Return this session's controller, creating it on the first run."""
+    if 'controller' not in st.session_state:
+        export_settings = app_config.get("export_settings", {})
+        llm_settings = app_config.get("llm_settings", {})
+        llm_client = shared_llm_client(llm_settings.get("request_timeout_seconds", 30.0)) \
+            if export_settings.get("include_llm_insights") else None
+        controller = MainController(config=app_config, llm_client=llm_client,
+                                    llm_executor=shared_llm_executor(), chart_executor=shared_chart_executor())
+        controller.replace_chart_executor = replace_shared_chart_executor
+        st.session_state.controller = controller
+    return st.session_state.controller
+
+def session_job_runner() -> JobRunner:
+    """Return this session's background job runner, creating it on the first run."""
+    if 'job_runner' not in st.session_state:
+        st.session_state.job_runner = JobRunner()
+    return st.session_state.job_runner
+
+def prepare_controller(controller: MainController, uploaded_file, start_date, end_date,
+                       progress: Optional[Dict[str, Callable[[int, int], None]]] = None) -> str:
+    """
+    Seed the controller with cached ingestion and metrics for this upload and
+    date range. Returns the upload's content key.
+    """
+    file_bytes = uploaded_file.getvalue()
+    content_key = MainController.content_key(uploaded_file)
+    controller.set_date_range(start_date, end_date)
+    ingested = cached_ingest(content_key, file_bytes, progress)
+    analysed = cached_metrics(content_key, start_date, end_date, ingested['index'])
+    controller.seed_stages(uploaded_file, {**ingested, **analysed}, content_key=content_key)
+    return content_key
+
+def _require(ok, controller: MainController):
+    if not ok:
+        raise RuntimeError(controller.get_error())
+    return ok
+
+def report_job(job: Job, controller: MainController, uploaded_file, start_date, end_date) -> Dict[str, Any]:
+    """
+    Run the whole workflow for an upload as a JobRunner job, reporting progress
+    from rows parsed and positions linked, and publishing LLM text as it
+    streams in. Returns the saved report's download info (path, file name,
+    MIME type), so the UI serves the file from disk.
+    """
+    job.update(0.0, "Loading CSV...")
+    callbacks = {stage: job.step(*span) for stage, span in PROGRESS_SPANS.items()}
+    controller.progress_callbacks = callbacks
+    controller.stream_callback = job.publish
+    try:
+        content_key = prepare_controller(controller, uploaded_file, start_date, end_date, progress=callbacks)
+        # Only row parsing, linking and streamed LLM text check for cancellation
+        # on their own, so check between the stages as well
+        job.raise_if_cancelled()
+        _require(controller.process_csv(uploaded_file, content_key=content_key), controller)
+        job.raise_if_cancelled()
+        _require(controller.analyze_trades(), controller)
+        job.update(0.65, "Generating LLM insights and charts...")
+        _require(controller.generate_insights_and_charts(), controller)
+        job.update(0.9, "Assembling report...")
+        _require(controller.assemble_report(), controller)
+        job.update(0.95, "Exporting report...")
+        return _require(controller.export_report_file(), controller)
+    finally:
+        controller.progress_callbacks = {}
+        controller.stream_callback = None
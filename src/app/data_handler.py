@@ -1,9 +1,10 @@
 import pandas as pd
-from typing import Optional, Dict, Any
+import streamlit as st
+from typing import Optional, Dict, Any, Callable
 from src.processors.csv_processor import CSVProcessor
 from src.processors.duplicate_detector import DuplicateDetector
+from src.analyzers.trade_linker import TradeLinker
 from src.models.trade import Trade
-from src.app.ui_components import progress_component
 
 class DataHandler:
     """
@@ -12,27 +13,35 @@ class DataHandler:
     def __init__(self):
         self.trades: Optional[list] = None
         self.duplicates: Optional[pd.DataFrame] = None
+        self.positions: Optional[list] = None
         self.progress: float = 0.0
 
-    def process_csv(self, file) -> Dict[str, Any]:
-        self.progress = 0.1
-        progress_component(self.progress, "Loading CSV...")
+    def process_csv(self, file, progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+        """
+        Load, de-duplicate, parse and link a CSV. ``progress(fraction, text)``
+        receives real progress from rows parsed and positions linked; by
+        default it drives a single Streamlit progress bar.
+        """
+        if progress is None:
+            bar = st.progress(0.0, text="Loading CSV...")
+            progress = lambda fraction, text: bar.progress(fraction, text=text)
+        def report(fraction: float, text: str):
+            self.progress = fraction
+            progress(fraction, text)
+        def step(start: float, end: float, text: str) -> Callable[[int, int], None]:
+            return lambda done, total: report(start + (end - start) * (done / total if total else 1.0), f"{text} ({done:,}/{total:,})")
+        report(0.0, "Loading CSV...")
         processor = CSVProcessor(file)
         df = processor.load_csv()
-        self.progress = 0.3
-        progress_component(self.progress, "Detecting duplicates...")
+        report(0.1, "Detecting duplicates...")
         dup_detector = DuplicateDetector(df)
         self.duplicates = dup_detector.find_duplicates()
-        self.progress = 0.5
-        progress_component(self.progress, "Parsing trades...")
-        self.trades = processor.to_trades()
-        self.progress = 0.8
-        progress_component(self.progress, "Linking trades...")
-        # Placeholder for linking logic
-        self.progress = 1.0
-        progress_component(self.progress, "Done!")
+        self.trades = processor.to_trades(progress=step(0.2, 0.8, "Parsing trades"))
+        self.positions = TradeLinker.link_trades(self.trades, progress=step(0.8, 1.0, "Linking trades"))
+        report(1.0, "Done!")
         return {
             'df': df,
             'duplicates': self.duplicates,
-            'trades': self.trades
-        } 
\ No newline at end of file
+            'trades': self.trades,
+            'positions': self.positions,
+        }
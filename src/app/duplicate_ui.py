@@ -1,12 +1,14 @@
 import streamlit as st
 import pandas as pd
+from typing import Optional
+from src.app.ui_components import paginated_table_component
 
 class DuplicateUI:
     """
     Streamlit UI for duplicate detection and review.
     """
     @staticmethod
-    def show_duplicates(duplicates: pd.DataFrame):
+    def show_duplicates(duplicates: pd.DataFrame, data_key: Optional[str] = None):
         if duplicates is None or duplicates.empty:
             st.success("No duplicates found.")
             return
@@ -14,6 +16,6 @@ class DuplicateUI:
         if st.button("Remove All Duplicates"):
             st.info("All duplicates removed (placeholder logic).")
         if st.checkbox("Review Duplicate List"):
-            st.dataframe(duplicates)
+            paginated_table_component(duplicates, key="duplicates", data_key=data_key)
         if st.button("Keep Duplicates"):
             st.info("Proceeding with original data (duplicates kept).") 
\ No newline at end of file
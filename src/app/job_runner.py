@@ -0,0 +1,164 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class JobCancelled(Exception):
+    """Raised from a job's progress updates once cancellation has been requested."""
+
+@dataclass
+class JobStatus:
+    state: str = 'pending'  # pending, running, done, failed, cancelled
+    progress: float = 0.0
+    message: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    partials: Dict[str, str] = field(default_factory=dict)  # intermediate text, e.g. streamed LLM output
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ('done', 'failed', 'cancelled')
+
+class Job:
+    """
+    Handle given to a job function for reporting progress. Every update
+    checks for cancellation, so long loops stop at their next progress callback.
+    """
+    def __init__(self, key: Hashable = None):
+        self.key = key
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._status = JobStatus()
+
+    def update(self, progress: float, message: Optional[str] = None) -> None:
+        self.raise_if_cancelled()
+        with self._lock:
+            self._status.progress = min(max(progress, 0.0), 1.0)
+            if message is not None:
+                self._status.message = message
+
+    def step(self, start: float, end: float, message: str) -> Callable[[int, int], None]:
+        """Return a ``(done, total)`` callback that maps item counts onto [start, end]."""
+        def callback(done: int, total: int) -> None:
+            fraction = done / total if total else 1.0
+            self.update(start + (end - start) * fraction, f"{message} ({done:,}/{total:,})")
+        return callback
+
+    def publish(self, name: str, text: str) -> None:
+        """Expose intermediate text (such as a response still streaming in) under ``name``."""
+        self.raise_if_cancelled()
+        with self._lock:
+            self._status.partials[name] = text
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled("Job cancelled")
+
+    def status(self) -> JobStatus:
+        """Snapshot of the job's current status (safe to read from another thread)."""
+        with self._lock:
+            return replace(self._status, partials=dict(self._status.partials))
+
+    def _set(self, **fields: Any) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self._status, name, value)
+
+class JobRunner:
+    """
+    Runs one job at a time on a background thread so the Streamlit script
+    thread can keep rendering and poll the job's status between reruns.
+    """
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-runner')
+        self.job: Optional[Job] = None
+        self._future: Optional[Future] = None
+        self._pending: Optional[tuple] = None  # (func, args, kwargs, key) queued by restart
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    @property
+    def busy(self) -> bool:
+        """A job is running or queued to start."""
+        return self.running or self._pending is not None
+
+    @property
+    def latest_key(self) -> Hashable:
+        """Key of the most recently requested job (queued or started)."""
+        if self._pending is not None:
+            return self._pending[3]
+        return self.job.key if self.job is not None else None
+
+    def start(self, func: Callable[..., Any], *args: Any, key: Hashable = None, **kwargs: Any) -> Job:
+        """
+        Run ``func(job, *args, **kwargs)`` in the background. ``key`` identifies
+        the inputs, so callers can tell whether the last job matches them.
+        """
+        if self.running:
+            raise RuntimeError("A job is already running")
+        job = Job(key)
+        self.job = job
+        self._future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def restart(self, func: Callable[..., Any], *args: Any, key: Hashable = None, **kwargs: Any) -> None:
+        """
+        Start ``func`` like start, or, while a job is running, cancel it and
+        queue ``func`` to start once it has stopped (see start_pending).
+        Never waits for the running job.
+        """
+        if self.running:
+            self.cancel()
+        self._pending = (func, args, kwargs, key)
+        self.start_pending()
+
+    def start_pending(self) -> Optional[Job]:
+        """Start the queued job if the previous one has stopped; call it when polling."""
+        if self._pending is None or self.running:
+            return None
+        func, args, kwargs, key = self._pending
+        self._pending = None
+        return self.start(func, *args, key=key, **kwargs)
+
+    @staticmethod
+    def _run(job: Job, func: Callable[..., Any], args, kwargs) -> None:
+        job._set(state='running', message='Starting...')
+        try:
+            result = func(job, *args, **kwargs)
+        except Exception as e:
+            if job.cancelled:
+                job._set(state='cancelled', message='Cancelled')
+            else:
+                job._set(state='failed', error=str(e), message='Failed')
+            return
+        if job.cancelled:
+            job._set(state='cancelled', message='Cancelled')
+        else:
+            job._set(state='done', progress=1.0, result=result, message='Done')
+
+    def status(self) -> Optional[JobStatus]:
+        return self.job.status() if self.job is not None else None
+
+    def cancel(self) -> None:
+        self._pending = None
+        if self.job is not None:
+            self.job.cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[JobStatus]:
+        """Block until the current job finishes (mainly for tests and scripts)."""
+        if self._future is not None:
+            self._future.result(timeout=timeout)
+        return self.status()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False)
@@ -1,67 +1,428 @@
-from typing import Optional, Dict, Any
+import os
+import hashlib
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import Optional, Dict, Any, List, Callable
+import pandas as pd
+from src.app.pipeline import Pipeline, Stage
+from src.processors.csv_processor import CSVProcessor
+from src.processors.duplicate_detector import DuplicateDetector
+from src.analyzers.batch_strategy_detector import BatchStrategyDetector
+from src.analyzers.trade_linker import TradeLinker
+from src.analytics.metrics_calculator import MetricsCalculator
+from src.analytics.position_index import PositionIndex
+from src.insights.insight_generator import InsightGenerator
+from src.insights.reflection_engine import ReflectionEngine
+from src.llm.openai_client import LLMStreamError, is_llm_error
+from src.llm.prompt_builder import PromptBuilder
+from src.llm.structured_output import partial_report_sections
+from src.models.position import Position
+from src.models.report_content import ReportContent
+from src.reports.export_handler import ExportHandler
+from src.reports.incremental_report import IncrementalReportBuilder
+from src.visualizations.chart_coordinator import ChartCoordinator
+
+REPORT_EXTENSIONS = {'markdown': 'md', 'html': 'html', 'pdf': 'pdf'}
+# Seconds the insights stage waits for the LLM before using the template summary and questions
+DEFAULT_LLM_DEADLINE = 60.0
+
+def chart_process_pool(max_workers: int = 1) -> ProcessPoolExecutor:
+    """Process pool for chart rendering."""
+    # Spawn fresh workers: forking a process that already runs server, job and
+    # LLM threads can deadlock the child on a lock held by another thread
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+# Stage functions live at module level so they can be shipped to worker processes.
+def load_csv_stage(csv_source) -> pd.DataFrame:
+    if hasattr(csv_source, 'seek'):
+        csv_source.seek(0)
+    return CSVProcessor(csv_source).load_csv()
+
+def duplicates_stage(load: pd.DataFrame) -> pd.DataFrame:
+    # DuplicateDetector adds a helper column, so work on a copy of the cached frame
+    return DuplicateDetector(load.copy()).find_duplicates()
+
+def deduplicated(load: pd.DataFrame, duplicates: pd.DataFrame) -> pd.DataFrame:
+    """The loaded rows without the repeats of a duplicated order number (its first row is kept)."""
+    if duplicates.empty:
+        return load
+    return load.drop(index=duplicates.index[duplicates.duplicated('Order # Clean')])
+
+def trades_stage(load: pd.DataFrame, duplicates: pd.DataFrame,
+                 progress: Optional[Callable[[int, int], None]] = None) -> list:
+    return CSVProcessor.from_dataframe(deduplicated(load, duplicates)).to_trades(progress=progress)
+
+def legs_stage(load: pd.DataFrame, duplicates: pd.DataFrame) -> pd.DataFrame:
+    return BatchStrategyDetector.legs_frame(deduplicated(load, duplicates))
+
+def strategies_stage(legs: pd.DataFrame) -> Dict[str, str]:
+    return BatchStrategyDetector.classify(legs).astype(str).to_dict()
+
+def positions_stage(trades: list, strategies: Dict[str, str],
+                    progress: Optional[Callable[[int, int], None]] = None) -> List[Position]:
+    positions = TradeLinker.link_trades(trades, progress=progress)
+    for position in positions:
+        # A position takes the strategy of the order that opened it
+        trades = position.entry_trades or position.exit_trades
+        position.strategy = strategies.get(trades[0].order_id) if trades else None
+    return positions
+
+def index_stage(positions: List[Position]) -> PositionIndex:
+    return PositionIndex(positions)
+
+def filtered_stage(index: PositionIndex, start_date, end_date) -> List[Position]:
+    # The index is cached with the positions, so a new date range is two binary searches
+    return index.entered_between(start_date, end_date)
+
+def metrics_stage(filtered: List[Position]) -> Dict[str, Any]:
+    return asdict(MetricsCalculator.calculate_all(filtered))
+
+def charts_stage(filtered: List[Position], include_charts: bool, chart_dir: str) -> Dict[str, str]:
+    if not include_charts:
+        return {}
+    os.makedirs(chart_dir, exist_ok=True)
+    return ChartCoordinator.generate_all_charts(MetricsCalculator.chart_series(filtered), save_dir=chart_dir)
 
 class MainController:
     """
     Orchestrates the complete trading journal workflow.
+
+    The workflow is a DAG of stages (CSV -> duplicates -> trades / legs ->
+    strategies -> positions -> index -> filtered -> metrics -> charts /
+    insights -> report -> export). Trades and legs are read from the rows
+    left after dropping repeated order numbers, and each position is tagged
+    with the detected strategy of its opening order.
+    Each stage's output is memoized by a fingerprint of its inputs, so
+    re-running after changing only report options re-executes only the
+    stages downstream of that option.
+
+    Insights (network-bound) and charts (CPU-bound) only depend on the
+    analytics, so generate_insights_and_charts runs them concurrently: the
+    LLM calls on a thread pool and chart rendering on a process pool.
+
+    ``progress_callbacks`` maps a stage name ('trades', 'positions') to a
+    ``(done, total)`` callback for reporting row-level progress.
+
+    The LLM calls of the insights stage get ``llm_settings.deadline_seconds``
+    (default DEFAULT_LLM_DEADLINE) in total. When the model misses the deadline
+    or returns an error, the stage falls back to the template summary and
+    reflection questions instead of holding up the report.
     """
-    def __init__(self):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, llm_client=None, output_dir: Optional[str] = None,
+                 llm_executor: Optional[Executor] = None, chart_executor: Optional[Executor] = None):
         self.state: Dict[str, Any] = {}
         self.error: Optional[str] = None
+        self.llm_client = llm_client
+        self.output_dir = output_dir
+        self._llm_executor = llm_executor
+        self._chart_executor = chart_executor
+        self._owned_executors: List[Executor] = []
+        self.progress_callbacks: Dict[str, Callable[[int, int], None]] = {}
+        # Receives (prompt name, text so far) while LLM responses stream in
+        self.stream_callback: Optional[Callable[[str, str], None]] = None
+        # Given a chart pool broken by a dead worker, returns the pool to use instead
+        # (unset: the controller starts its own on the next run)
+        self.replace_chart_executor: Optional[Callable[[Executor], Executor]] = None
+        self.report_builder = IncrementalReportBuilder()
+        export_settings = (config or {}).get('export_settings', {})
+        self.llm_deadline = (config or {}).get('llm_settings', {}).get('deadline_seconds', DEFAULT_LLM_DEADLINE)
+        self.pipeline = Pipeline([
+            Stage('load', load_csv_stage, params=('csv_source',)),
+            Stage('duplicates', duplicates_stage, deps=('load',)),
+            Stage('trades', self._trades_stage, deps=('load', 'duplicates')),
+            Stage('legs', legs_stage, deps=('load', 'duplicates')),
+            Stage('strategies', strategies_stage, deps=('legs',)),
+            Stage('positions', self._positions_stage, deps=('trades', 'strategies')),
+            Stage('index', index_stage, deps=('positions',)),
+            Stage('filtered', filtered_stage, deps=('index',), params=('start_date', 'end_date')),
+            Stage('metrics', metrics_stage, deps=('filtered',)),
+            Stage('charts', charts_stage, deps=('filtered',), params=('include_charts', 'chart_dir')),
+            Stage('insights', self._insights_stage, deps=('metrics',), params=('include_llm_insights',)),
+            Stage('report', self._report_stage, deps=('metrics', 'charts', 'insights'), params=('output_dir',)),
+            Stage('export', self._export_stage, deps=('report', 'metrics', 'charts', 'insights'), params=('export_format', 'output_dir')),
+        ])
+        self.set_report_options(
+            include_charts=export_settings.get('include_charts', True),
+            include_llm_insights=export_settings.get('include_llm_insights', True),
+            export_format=export_settings.get('default_format', 'markdown'),
+        )
+        self.set_date_range(None, None)
+
+    def set_report_options(self, **options) -> None:
+        """Update report options (include_charts, include_llm_insights, export_format)."""
+        self.pipeline.set_params(**options)
+
+    def set_date_range(self, start_date=None, end_date=None) -> None:
+        """Restrict analytics, charts and the report to positions entered in [start_date, end_date]."""
+        self.pipeline.set_params(start_date=start_date, end_date=end_date)
+
+    def seed_stages(self, file, outputs: Dict[str, Any], content_key: Optional[str] = None) -> None:
+        """
+        Register stage outputs computed elsewhere (e.g. Streamlit's cache) for
+        this CSV and the current parameters, so they are not recomputed.
+        """
+        self.pipeline.set_param('csv_source', file, key=content_key or self.content_key(file))
+        self._ensure_output_dir()
+        for name, output in outputs.items():
+            self.pipeline.seed(name, output)
+
+    def _ensure_output_dir(self) -> str:
+        if self.output_dir is None:
+            self.output_dir = tempfile.mkdtemp(prefix='trading_journal_')
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.pipeline.params.get('output_dir') != self.output_dir:
+            self.pipeline.set_params(output_dir=self.output_dir, chart_dir=os.path.join(self.output_dir, 'charts'))
+        return self.output_dir
+
+    @staticmethod
+    def content_key(file) -> str:
+        """Fingerprint a CSV source by content (path, uploaded file or file-like object)."""
+        digest = hashlib.sha256()
+        if hasattr(file, 'getvalue'):
+            digest.update(file.getvalue())
+        elif hasattr(file, 'read'):
+            position = file.tell()
+            data = file.read()
+            file.seek(position)
+            digest.update(data.encode('utf-8') if isinstance(data, str) else data)
+        else:
+            with open(file, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def _trades_stage(self, load: pd.DataFrame, duplicates: pd.DataFrame) -> list:
+        return trades_stage(load, duplicates, progress=self.progress_callbacks.get('trades'))
+
+    def _positions_stage(self, trades: list, strategies: Dict[str, str]) -> List[Position]:
+        return positions_stage(trades, strategies, progress=self.progress_callbacks.get('positions'))
 
-    def process_csv(self, file) -> bool:
-        # TODO: Integrate CSVProcessor and DuplicateDetector
+    def _llm_responses(self, prompts: Dict[str, str]) -> Dict[str, str]:
+        """Responses to independent prompts, streamed to stream_callback when one is set."""
+        client, on_delta = self.llm_client, self.stream_callback
+        if hasattr(client, 'complete_all'):
+            # Independent prompts run concurrently, so the stage costs about one model call
+            return client.complete_all(prompts, on_delta=on_delta) if on_delta else client.complete_all(prompts)
+        responses = {}
+        for name, prompt in prompts.items():
+            if not hasattr(client, 'stream_openai'):
+                responses[name] = client._call_openai(prompt)
+                continue
+            text = ''
+            try:
+                for chunk in client.stream_openai(prompt):
+                    text += chunk
+                    on_delta(name, text)
+            except LLMStreamError as e:
+                # Drop the partial text; the error text makes the stage fall back
+                text = str(e)
+            responses[name] = text.strip()
+        return responses
+
+    def _llm_sections(self, metrics: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """All LLM sections from one structured request, or None when the client can't provide them."""
+        client, on_delta = self.llm_client, self.stream_callback
+        if not hasattr(client, 'generate_report_sections'):
+            return None
+
+        def publish(text: str) -> None:
+            partial = partial_report_sections(text)
+            on_delta('insights', partial['insights'])
+            on_delta('questions', '\n'.join(partial['questions']))
+
+        return client.generate_report_sections(metrics, on_delta=publish if on_delta else None)
+
+    def _llm_insights(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Insights, questions, action items (when provided) and group summaries from the LLM client."""
+        results: Dict[str, Any] = {}
+        # One combined request replaces the separate analysis and question prompts when it parses
+        sections = self._llm_sections(metrics)
+        if sections is not None:
+            results.update(sections)
+        elif hasattr(self.llm_client, 'complete_all') or self.stream_callback:
+            responses = self._llm_responses({
+                'insights': PromptBuilder.build_performance_prompt(metrics),
+                'questions': ReflectionEngine.build_prompt(metrics),
+            })
+            results['insights'] = responses['insights']
+            results['questions'] = ReflectionEngine.parse_questions(responses['questions'])
+        else:
+            results['insights'] = self.llm_client.generate_performance_analysis(metrics)
+            results['questions'] = ReflectionEngine.generate_questions(metrics, self.llm_client)
+        groups = metrics.get('grouped_results') or {}
+        if groups and hasattr(self.llm_client, 'generate_group_summaries'):
+            # Every strategy group is summarized in a single batched request
+            results['group_summaries'] = self.llm_client.generate_group_summaries(groups)
+        return results
+
+    def _llm_insights_within_deadline(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """_llm_insights, or {} when it does not finish within llm_deadline seconds."""
+        if not self.llm_deadline:
+            return self._llm_insights(metrics)
+        # A dedicated thread, so the wait is bounded even when this stage itself runs on _llm_executor.
+        # A late result is discarded; per-request timeouts end the abandoned calls.
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='llm-deadline')
+        try:
+            return executor.submit(self._llm_insights, metrics).result(timeout=self.llm_deadline)
+        except FutureTimeoutError:
+            return {}
+        finally:
+            executor.shutdown(wait=False)
+
+    def _insights_stage(self, metrics: Dict[str, Any], include_llm_insights: bool) -> Dict[str, Any]:
+        results = {}
+        use_llm = include_llm_insights and self.llm_client is not None
+        if use_llm:
+            results = self._llm_insights_within_deadline(metrics)
+        insights = results.get('insights')
+        questions = results.get('questions')
+        llm_failed = not insights or is_llm_error(insights) or not questions or any(is_llm_error(q) for q in questions)
+        if not insights or is_llm_error(insights):
+            insights = InsightGenerator.generate_monthly_summary(metrics)
+        if not questions or any(is_llm_error(q) for q in questions):
+            questions = ReflectionEngine.question_templates()
+        return {
+            'insights': insights,
+            'questions': questions,
+            'action_items': results.get('action_items') or InsightGenerator.suggest_action_items(metrics),
+            'group_summaries': results.get('group_summaries') or {},
+            # Template fallback in place of a requested LLM answer; see _retry_degraded_insights
+            'degraded': use_llm and llm_failed,
+        }
+
+    def _retry_degraded_insights(self) -> None:
+        # Fallback insights serve the report and export of the run that produced
+        # them, but are not memoized past it: the next run asks the model again.
+        if (self.state.get('llm') or {}).get('degraded'):
+            self.pipeline.invalidate('insights')
+
+    def _report_stage(self, metrics, charts, insights, output_dir) -> str:
+        charts_md = ChartCoordinator.charts_markdown(charts, base_dir=output_dir) if charts else ''
+        return self.report_builder.build(metrics, charts_md, insights['insights'], insights['questions'], insights['action_items'],
+                                         insights['group_summaries'])
+
+    def _export_stage(self, report, metrics, charts, insights, export_format, output_dir) -> str:
+        extension = REPORT_EXTENSIONS.get(export_format)
+        if extension is None:
+            raise ValueError(f"Unsupported export format '{export_format}'")
+        path = os.path.join(output_dir, f'report.{extension}')
+        if export_format == 'markdown':
+            return ExportHandler.save_report(report, path)
+        content = ReportContent(metrics=metrics, charts=charts, insights=insights['insights'],
+                                questions=insights['questions'], action_items=insights['action_items'],
+                                group_summaries=insights['group_summaries'])
+        return ExportHandler.export_report(content, path, export_format)
+
+    def process_csv(self, file, content_key: Optional[str] = None) -> bool:
         try:
-            # Placeholder for CSV processing
-            self.state['csv'] = file
+            self.pipeline.set_param('csv_source', file, key=content_key or self.content_key(file))
+            self._ensure_output_dir()
+            self.state['csv'] = self.pipeline.run('load')
+            self.state['duplicates'] = self.pipeline.run('duplicates')
             return True
         except Exception as e:
             self.error = f"CSV processing failed: {e}"
             return False
 
     def analyze_trades(self) -> bool:
-        # TODO: Integrate trade parsing, linking, analytics
         try:
-            # Placeholder for analysis
-            self.state['analysis'] = 'analysis_results'
+            self.state['trades'] = self.pipeline.run('trades')
+            self.state['strategies'] = self.pipeline.run('strategies')
+            self.state['positions'] = self.pipeline.run('positions')
+            self.state['filtered_positions'] = self.pipeline.run('filtered')
+            self.state['analysis'] = self.pipeline.run('metrics')
             return True
         except Exception as e:
             self.error = f"Trade analysis failed: {e}"
             return False
 
     def generate_llm_insights(self) -> bool:
-        # TODO: Integrate LLM and insight generation
         try:
-            self.state['llm'] = 'llm_insights'
+            self._retry_degraded_insights()
+            self.state['llm'] = self.pipeline.run('insights')
             return True
         except Exception as e:
             self.error = f"LLM insight generation failed: {e}"
             return False
 
     def generate_charts(self) -> bool:
-        # TODO: Integrate chart generation
         try:
-            self.state['charts'] = 'charts_md'
+            self.state['charts'] = self.pipeline.run('charts')
             return True
         except Exception as e:
             self.error = f"Chart generation failed: {e}"
             return False
 
     def assemble_report(self) -> bool:
-        # TODO: Integrate report assembly
         try:
-            self.state['report'] = 'markdown_report'
+            self.state['report'] = self.pipeline.run('report')
             return True
         except Exception as e:
             self.error = f"Report assembly failed: {e}"
             return False
 
-    def export_report(self) -> Optional[str]:
-        # TODO: Integrate export handler
+    def export_report_file(self) -> Optional[Dict[str, Any]]:
+        """Export the report and describe the saved file (see ExportHandler.get_download_info)."""
         try:
-            return 'download_link'
+            path = self.pipeline.run('export')
+            self.state['report_path'] = path
+            return ExportHandler.get_download_info(path)
         except Exception as e:
             self.error = f"Export failed: {e}"
             return None
 
+    def export_report(self) -> Optional[str]:
+        """Export the report and return an HTML link with the file embedded as base64."""
+        info = self.export_report_file()
+        return ExportHandler.get_download_link(info['path']) if info else None
+
+    def _executors(self) -> Dict[str, Executor]:
+        # Created on first use and reused across reruns; close() shuts them down
+        if self._llm_executor is None:
+            self._llm_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='llm-stage')
+            self._owned_executors.append(self._llm_executor)
+        if self._chart_executor is None:
+            self._chart_executor = chart_process_pool()
+            self._owned_executors.append(self._chart_executor)
+        return {'insights': self._llm_executor, 'charts': self._chart_executor}
+
+    def _discard_chart_executor(self) -> None:
+        broken = self._chart_executor
+        if broken in self._owned_executors:
+            self._owned_executors.remove(broken)
+            broken.shutdown(wait=False)
+        self._chart_executor = self.replace_chart_executor(broken) if self.replace_chart_executor else None
+
+    def generate_insights_and_charts(self) -> bool:
+        """Run the LLM insight and chart stages concurrently and join both results."""
+        try:
+            self._retry_degraded_insights()
+            executors = self._executors()
+            try:
+                results = self.pipeline.run_concurrent(['insights', 'charts'], executors)
+            except BrokenProcessPool as e:
+                # A chart worker died and the pool refuses all further work. Swap the pool
+                # for the next run and render this run's charts here (insights are cached).
+                logging.warning(f"Chart process pool broken ({e}); rendering charts in-thread")
+                self._discard_chart_executor()
+                results = self.pipeline.run_concurrent(['insights', 'charts'], {'insights': executors['insights']})
+            self.state['llm'] = results['insights']
+            self.state['charts'] = results['charts']
+            return True
+        except Exception as e:
+            self.error = f"Insight and chart generation failed: {e}"
+            return False
+
+    def close(self) -> None:
+        for executor in self._owned_executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._owned_executors = []
+        self._llm_executor = None
+        self._chart_executor = None
+
     def get_error(self) -> Optional[str]:
-        return self.error 
\ No newline at end of file
+        return self.error
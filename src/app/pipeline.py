@@ -0,0 +1,139 @@
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.utils.fingerprint import fingerprint
+
+@dataclass
+class Stage:
+    """
+    A pipeline step. ``func`` is called with the outputs of ``deps`` and the
+    values of ``params`` as keyword arguments.
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+
+@dataclass
+class _CacheEntry:
+    key: str
+    output: Any
+
+class Pipeline:
+    """
+    Runs a DAG of stages, memoizing each stage's output by an input fingerprint.
+
+    A stage's fingerprint combines its name, the fingerprints of its
+    dependencies and the keys of the parameters it reads, so changing one
+    parameter only invalidates the stages downstream of it.
+    """
+    def __init__(self, stages: List[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            missing = [d for d in stage.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+            self.stages[stage.name] = stage
+        self.params: Dict[str, Any] = {}
+        self._param_keys: Dict[str, str] = {}
+        self._cache: Dict[str, _CacheEntry] = {}
+        self.executed: List[str] = []
+
+    def set_param(self, name: str, value: Any, key: Optional[str] = None) -> None:
+        """
+        Set a pipeline parameter. ``key`` overrides the value's fingerprint,
+        e.g. a content hash for an uploaded file object.
+        """
+        self.params[name] = value
+        self._param_keys[name] = key if key is not None else fingerprint(value)
+
+    def set_params(self, **params: Any) -> None:
+        for name, value in params.items():
+            self.set_param(name, value)
+
+    def fingerprint(self, name: str) -> str:
+        stage = self.stages[name]
+        missing = [p for p in stage.params if p not in self._param_keys]
+        if missing:
+            raise ValueError(f"Stage '{name}' is missing parameters: {missing}")
+        return fingerprint(
+            name,
+            [self.fingerprint(dep) for dep in stage.deps],
+            [self._param_keys[p] for p in stage.params],
+        )
+
+    def cached(self, name: str) -> bool:
+        entry = self._cache.get(name)
+        return entry is not None and entry.key == self.fingerprint(name)
+
+    def inputs(self, name: str) -> Dict[str, Any]:
+        """Resolve (running as needed) the keyword arguments for a stage."""
+        stage = self.stages[name]
+        kwargs = {dep: self.run(dep) for dep in stage.deps}
+        kwargs.update({p: self.params[p] for p in stage.params})
+        return kwargs
+
+    def store(self, name: str, output: Any) -> Any:
+        self._cache[name] = _CacheEntry(self.fingerprint(name), output)
+        self.executed.append(name)
+        return output
+
+    def seed(self, name: str, output: Any) -> None:
+        """Record an output computed elsewhere (e.g. an external cache) for the current inputs."""
+        self._cache[name] = _CacheEntry(self.fingerprint(name), output)
+
+    def run(self, name: str) -> Any:
+        key = self.fingerprint(name)
+        entry = self._cache.get(name)
+        if entry is not None and entry.key == key:
+            return entry.output
+        output = self.stages[name].func(**self.inputs(name))
+        return self.store(name, output)
+
+    def run_concurrent(self, names: List[str], executors: Optional[Dict[str, Executor]] = None) -> Dict[str, Any]:
+        """
+        Run independent stages at the same time and join their results.
+
+        Shared upstream stages are resolved first (once, through the cache);
+        each stage in ``names`` is then submitted to its executor from
+        ``executors`` (or run inline if it has none). Stages sent to a
+        process pool must have picklable functions and inputs.
+        """
+        executors = executors or {}
+        results: Dict[str, Any] = {}
+        pending = {}
+        inline = {}
+        first_error = None
+        for name in names:
+            entry = self._cache.get(name)
+            if entry is not None and entry.key == self.fingerprint(name):
+                results[name] = entry.output
+                continue
+            kwargs = self.inputs(name)
+            executor = executors.get(name)
+            if executor is None:
+                inline[name] = kwargs
+            else:
+                try:
+                    pending[name] = executor.submit(self.stages[name].func, **kwargs)
+                except Exception as e:
+                    # e.g. a broken process pool: still join the stages already submitted
+                    first_error = first_error or e
+        for name, kwargs in inline.items():
+            try:
+                results[name] = self.store(name, self.stages[name].func(**kwargs))
+            except Exception as e:
+                first_error = first_error or e
+        # Always join submitted work so no stage is left running after an error
+        for name, future in pending.items():
+            try:
+                results[name] = self.store(name, future.result())
+            except Exception as e:
+                first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+        return results
+
+    def invalidate(self, *names: str) -> None:
+        for name in names or list(self._cache):
+            self._cache.pop(name, None)
@@ -1,16 +1,78 @@
 import streamlit as st
 from src.app.ui_components import (
-    file_upload_component, progress_component, error_message_component, 
+    file_upload_component, job_progress_component, error_message_component, paginated_table_component,
+    llm_insights_component,
     section_header, strategy_input_component, time_period_selector_component,
     form_validation_component, info_message_component, success_message_component
 )
 import pandas as pd
 from datetime import datetime
-from src.app.main_controller import MainController
+from src.app.analysis_cache import session_controller, session_job_runner, report_job, cached_positions_table
+from src.app.duplicate_ui import DuplicateUI
 from src.config import Config
+from src.insights.reflection_engine import ReflectionEngine
 from src.config_loader import ConfigLoader
 import os
 
+# Seconds between progress polls while a report job is running
+JOB_POLL_SECONDS = 0.5
+
+def render_report_job(runner, restart):
+    """Poll the report job without blocking the script and show its outcome."""
+    polling = runner.busy
+
+    @st.fragment(run_every=JOB_POLL_SECONDS if polling else None)
+    def job_panel():
+        # A job queued by restart starts here once the cancelled one has stopped
+        runner.start_pending()
+        if runner.busy:
+            status = runner.status()
+            if runner.running and runner.job.key != runner.latest_key:
+                cancel = job_progress_component(status.progress, "Stopping the previous run...")
+            else:
+                cancel = job_progress_component(status.progress, status.message)
+            if cancel:
+                runner.cancel()
+            return
+        status = runner.status()
+        if polling:
+            # Finished since the last full run: rerun the app to stop polling
+            st.rerun()
+        if status.state == 'done':
+            success_message_component("Report generated successfully!")
+            section_header("💾 Download Report")
+            info = status.result
+            with open(info['path'], 'rb') as report_file:
+                st.download_button("Download Report", data=report_file, file_name=info['file_name'], mime=info['mime'])
+        elif status.state == 'cancelled':
+            info_message_component("Processing was cancelled.")
+            if st.button("Restart processing"):
+                restart()
+                st.rerun()
+        else:
+            error_message_component(status.error)
+
+    job_panel()
+
+def render_llm_section(runner, controller):
+    """Show LLM output as it streams in from the report job, then the final insights."""
+    status = runner.status()
+    polling = status is not None and not status.finished
+
+    @st.fragment(run_every=JOB_POLL_SECONDS if polling else None)
+    def llm_panel():
+        status = runner.status()
+        llm = controller.state.get('llm')
+        if status is not None and not status.finished and status.partials:
+            llm_insights_component(status.partials.get('insights', ''),
+                                   ReflectionEngine.parse_questions(status.partials.get('questions', '')), streaming=True)
+        elif status is not None and status.state == 'done' and llm:
+            llm_insights_component(llm['insights'], llm['questions'])
+        else:
+            st.info("LLM-generated insights will appear here after analysis.")
+
+    llm_panel()
+
 def main():
     st.set_page_config(page_title="Trading Journal Analytics", layout="wide")
     
@@ -56,7 +118,8 @@ def main():
         strategy_name = strategy_input_component("Strategy Name (Optional)")
         
         st.subheader("Time Period")
-        start_date, end_date = time_period_selector_component()
+        start_date, end_date = time_period_selector_component(
+            lookback_days=app_config.get("analysis_settings", {}).get("lookback_period_days"))
         
         # Validate form data
         form_data = {
@@ -78,39 +141,19 @@ def main():
         if 'stored_end_date' not in st.session_state:
             st.session_state.stored_end_date = end_date
         
-        controller = MainController()
+        # Parsed data, positions and metrics are cached across reruns; only the
+        # date-range filter re-runs when the time period changes. The workflow
+        # itself runs on a background job so the page stays responsive.
+        controller = session_controller(app_config)
+        runner = session_job_runner()
         if uploaded_file and not form_errors:
-            try:
-                progress_component(0.1, "Processing CSV...")
-                if not controller.process_csv(uploaded_file):
-                    error_message_component(controller.get_error())
-                    return
-                progress_component(0.3, "Analyzing trades...")
-                if not controller.analyze_trades():
-                    error_message_component(controller.get_error())
-                    return
-                progress_component(0.5, "Generating LLM insights...")
-                if not controller.generate_llm_insights():
-                    error_message_component(controller.get_error())
-                    return
-                progress_component(0.7, "Generating charts...")
-                if not controller.generate_charts():
-                    error_message_component(controller.get_error())
-                    return
-                progress_component(0.85, "Assembling report...")
-                if not controller.assemble_report():
-                    error_message_component(controller.get_error())
-                    return
-                progress_component(1.0, "Exporting report...")
-                download_link = controller.export_report()
-                if not download_link:
-                    error_message_component(controller.get_error())
-                    return
-                success_message_component("Report generated successfully!")
-                section_header("💾 Download Markdown Report")
-                st.markdown(download_link, unsafe_allow_html=True)
-            except Exception as e:
-                error_message_component(f"Error: {e}")
+            job_key = (controller.content_key(uploaded_file), start_date, end_date)
+            def start_job():
+                # Cancels a running job without waiting for it; the polling fragment starts this one
+                runner.restart(report_job, controller, uploaded_file, start_date, end_date, key=job_key)
+            if runner.latest_key != job_key:
+                start_job()
+            render_report_job(runner, start_job)
         elif uploaded_file and form_errors:
             error_message_component("Please fix the form errors before processing.")
         else:
@@ -118,11 +161,20 @@ def main():
     
     with tab2:
         section_header("📊 Performance Metrics Dashboard")
-        st.info("Performance metrics and charts will appear here after upload.")
+        status = runner.status()
+        if status is not None and status.state == 'done':
+            content_key, start_key, end_key = runner.job.key
+            st.subheader("Positions")
+            positions = cached_positions_table(content_key, start_key, end_key, controller.state['filtered_positions'])
+            paginated_table_component(positions, key="positions", data_key=f"{content_key}:{start_key}:{end_key}")
+            st.subheader("Duplicate Orders")
+            DuplicateUI.show_duplicates(controller.state['duplicates'], data_key=content_key)
+        else:
+            st.info("Performance metrics and charts will appear here after upload.")
         section_header("📈 Static Charts Display")
         st.info("Charts will appear here after analysis.")
         section_header("📝 LLM Analysis & Reflection Questions")
-        st.info("LLM-generated insights will appear here after analysis.")
+        render_llm_section(runner, controller)
     
     with tab3:
         section_header("⚙️ Application Settings")
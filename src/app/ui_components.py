@@ -1,7 +1,10 @@
 import streamlit as st
+import pandas as pd
 from typing import Optional, List
 from datetime import datetime, date
 import re
+from src.utils.pagination import TablePage, paginate_frame, row_order
+from src.utils.time_utils import lookback_range
 
 def file_upload_component(label: str = "Upload CSV") -> Optional[str]:
     uploaded_file = st.file_uploader(label, type=["csv"])
@@ -14,11 +17,12 @@ def strategy_input_component(label: str = "Strategy Name") -> str:
     strategy_name = st.text_input(label, help="Enter a valid strategy name (letters, numbers, spaces, hyphens, and underscores only)")
     return strategy_name
 
-def time_period_selector_component(label: str = "Select Time Period") -> tuple[date, date]:
-    """Component for selecting a time period with validation."""
+def time_period_selector_component(label: str = "Select Time Period", lookback_days: Optional[int] = None) -> tuple[date, date]:
+    """Component for selecting a time period with validation. Defaults to the last ``lookback_days`` days, or this month."""
+    default_start = lookback_range(lookback_days)[0] if lookback_days else date.today().replace(day=1)
     col1, col2 = st.columns(2)
     with col1:
-        start_date = st.date_input("Start Date", value=date.today().replace(day=1), key="start_date")
+        start_date = st.date_input("Start Date", value=default_start, key="start_date")
     with col2:
         end_date = st.date_input("End Date", value=date.today(), key="end_date")
     
@@ -55,6 +59,58 @@ def progress_component(progress: float, text: str = "Processing..."):
     st.progress(progress)
     st.write(text)
 
+def job_progress_component(progress: float, text: str = "Processing...", key: str = "cancel_job") -> bool:
+    """Show a background job's progress bar with a cancel button. Returns True when cancel is clicked."""
+    st.progress(progress, text=text)
+    return st.button("Cancel", key=key)
+
+def llm_insights_component(insights: str, questions: List[str], streaming: bool = False) -> None:
+    """Show LLM insights and reflection questions; while ``streaming`` a cursor marks the text as incomplete."""
+    cursor = " ▌" if streaming else ""
+    if insights:
+        st.markdown(insights + cursor)
+    if questions:
+        st.markdown("**Reflection Questions**")
+        st.markdown("\n".join(f"- {q}" for q in questions) + cursor)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_row_order(data_key: str, sort_by: Optional[str], ascending: bool, query: str, _df: pd.DataFrame):
+    # Keyed by the caller's data key, so paging through a table never re-filters or re-sorts it
+    return row_order(_df, sort_by, ascending, query)
+
+def paginated_table_component(df: pd.DataFrame, key: str, page_size: int = 50, data_key: Optional[str] = None) -> Optional[TablePage]:
+    """
+    Filterable, sortable table that sends only the current page of rows to the
+    browser. Pass ``data_key`` (e.g. the upload's content hash) to cache the
+    filtered/sorted row order across reruns.
+    """
+    if df is None or df.empty:
+        st.info("No rows to display.")
+        return None
+    col_filter, col_sort, col_order = st.columns([2, 2, 1])
+    with col_filter:
+        query = st.text_input("Filter", key=f"{key}_filter")
+    with col_sort:
+        sort_by = st.selectbox("Sort by", [None] + list(df.columns), format_func=lambda c: "(none)" if c is None else str(c), key=f"{key}_sort")
+    with col_order:
+        ascending = st.radio("Order", ["Ascending", "Descending"], key=f"{key}_order", horizontal=True) == "Ascending"
+    if data_key is not None:
+        order = _cached_row_order(f"{data_key}:{key}", sort_by, ascending, query, df)
+    else:
+        order = row_order(df, sort_by, ascending, query)
+    page_count = max(1, -(-len(order) // page_size))
+    page_key = f"{key}_page"
+    # Clamp the stored page when a new filter leaves fewer pages
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), page_count)
+    page_number = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, step=1, key=page_key)
+    page = paginate_frame(df, page=page_number, page_size=page_size, order=order)
+    st.dataframe(page.rows, width='stretch', hide_index=True)
+    if page.total_rows:
+        st.caption(f"Rows {page.start + 1:,}-{page.end:,} of {page.total_rows:,}")
+    else:
+        st.caption("No rows match the filter.")
+    return page
+
 def error_message_component(message: str):
     st.error(message)
 
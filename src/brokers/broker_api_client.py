@@ -5,8 +5,30 @@ that can be properly tested with requests-mock.
 """
 
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
 from requests.exceptions import Timeout, ConnectionError
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import pandas as pd
+from src.models.trade import Trade
+from src.processors.csv_processor import REQUIRED_COLUMNS, CSVProcessor
+from src.utils.http_session import build_session
+from src.utils.rate_limiter import TokenBucket, shared_bucket
+
+# Broker order fields and the TastyTrade CSV columns they map to
+ORDER_COLUMNS = {
+    "symbol": "Symbol",
+    "price": "Price",
+    "timestamp": "Time",
+    "order_id": "Order #",
+    "description": "Description",
+    "expiry": "Expiry",
+    "strike": "Strike",
+    "option_type": "OptionType",
+    "side": "Side",
+    "quantity": "Quantity",
+}
 
 
 class BrokerAPIClient:
@@ -20,24 +42,43 @@ class BrokerAPIClient:
     - Timeout configuration
     """
     
-    def __init__(self, api_key: str, base_url: str = "https://api.broker.com/v1"):
+    def __init__(self, api_key: str, base_url: str = "https://api.broker.com/v1", rate_limit: int = 120,
+                 burst: int = 10, limiter: Optional[TokenBucket] = None, session: Optional[requests.Session] = None,
+                 pool_size: int = 10, max_retries: int = 3):
         """
         Initialize the broker API client.
         
         Args:
             api_key: API key for authentication
             base_url: Base URL for the broker API
+            rate_limit: Requests per minute allowed by the broker
+            burst: Requests that may be sent back to back before pacing starts
+            limiter: Token bucket to draw from (default: one shared per base URL and rate)
+            session: HTTP session to send requests with (default: a pooled keep-alive session)
+            pool_size: Connections kept alive by the default session
+            max_retries: Retries of idempotent requests on connection errors, 429 and 5xx responses
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')  # Remove trailing slash if present
+        self.limiter = limiter or shared_bucket(('broker', self.base_url), rate_limit / 60.0, capacity=burst)
+        # Orders are POSTed, so only idempotent methods are retried
+        self.session = session or build_session(pool_size=pool_size, max_retries=max_retries)
+        # Endpoint -> (ETag, Last-Modified, body) of the last full response to a conditional GET
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], Any]] = {}
+        
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
         
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    def _make_request(self, method: str, endpoint: str, conditional: bool = False, **kwargs) -> Dict[str, Any]:
         """
         Make an HTTP request to the broker API.
         
         Args:
             method: HTTP method (GET, POST, PUT, DELETE, etc.)
             endpoint: API endpoint (e.g., "/account", "/positions")
+            conditional: Send If-None-Match / If-Modified-Since from the previous
+                response and reuse its body when the server answers 304 Not Modified
             **kwargs: Additional arguments to pass to requests.request()
             
         Returns:
@@ -50,15 +91,28 @@ class BrokerAPIClient:
         headers = kwargs.pop('headers', {})
         headers['Authorization'] = f"Bearer {self.api_key}"
         headers['Content-Type'] = 'application/json'
+        cached = self._validators.get(endpoint) if conditional else None
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
         
         # Set default timeout if not provided
         if 'timeout' not in kwargs:
             kwargs['timeout'] = 10
             
+        self.limiter.acquire()
         try:
-            response = requests.request(method, url, headers=headers, **kwargs)
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            if response.status_code == 304 and cached is not None:
+                return cached[2]
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if conditional and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+                self._validators[endpoint] = (response.headers.get('ETag'), response.headers.get('Last-Modified'), result)
+            return result
         except Timeout:
             raise Exception("Request to broker API timed out")
         except ConnectionError:
@@ -75,7 +129,8 @@ class BrokerAPIClient:
             
     def get_account_info(self) -> Dict[str, Any]:
         """
-        Get account information from broker API.
+        Get account information from broker API. Repeated calls are
+        conditional requests, so an unchanged account costs a bodiless 304.
         
         Returns:
             Account information
@@ -83,11 +138,12 @@ class BrokerAPIClient:
         Raises:
             Exception: If the request fails
         """
-        return self._make_request("GET", "/account")
+        return self._make_request("GET", "/account", conditional=True)
         
     def get_positions(self) -> List[Dict[str, Any]]:
         """
-        Get current positions from broker API.
+        Get current positions from broker API. Repeated calls are
+        conditional requests, so unchanged positions cost a bodiless 304.
         
         Returns:
             List of positions
@@ -95,7 +151,7 @@ class BrokerAPIClient:
         Raises:
             Exception: If the request fails
         """
-        return self._make_request("GET", "/positions")
+        return self._make_request("GET", "/positions", conditional=True)
         
     def place_order(self, symbol: str, quantity: int, order_type: str = "market") -> Dict[str, Any]:
         """
@@ -136,7 +192,8 @@ class BrokerAPIClient:
         
     def get_order_history(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Get order history from broker API.
+        Get order history from broker API in a single response.
+        For long histories use iter_order_history, which pages through it.
         
         Args:
             start_date: Start date in YYYY-MM-DD format (optional)
@@ -148,10 +205,163 @@ class BrokerAPIClient:
         Raises:
             Exception: If the request fails
         """
+        return self._make_request("GET", "/orders", params=self._date_params(start_date, end_date))
+
+    @staticmethod
+    def _date_params(start_date: Optional[str], end_date: Optional[str]) -> Dict[str, str]:
         params = {}
         if start_date:
             params['start_date'] = start_date
         if end_date:
             params['end_date'] = end_date
-            
-        return self._make_request("GET", "/orders", params=params)
\ No newline at end of file
+        return params
+
+    def _order_page(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """One page of /orders as (orders, pagination metadata)."""
+        data = self._make_request("GET", "/orders", params=params)
+        if isinstance(data, list):
+            return data, {}
+        return data.get('orders') or [], data
+
+    def iter_order_history(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                           page_size: int = 500, max_parallel: int = 4,
+                           since: Optional[Dict[str, str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through order history, yielding one list of orders per page in order.
+
+        Follows ``next_cursor`` when the API returns one, fetching each next
+        page while the caller processes the current one. Otherwise requests
+        numbered pages (``page``/``page_size``), up to ``max_parallel`` at a
+        time, until ``total_pages`` is reached or a page comes back short.
+        At most ``max_parallel`` pages are held in memory.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format (optional)
+            end_date: End date in YYYY-MM-DD format (optional)
+            page_size: Orders requested per page
+            max_parallel: Page requests in flight at once
+            since: Sync cursor (``last_order_id``, ``last_timestamp``) of a previous
+                sync; only orders after it are requested (``after_id``/``since``)
+
+        Yields:
+            Lists of orders, one per non-empty page
+
+        Raises:
+            Exception: If a page request fails
+        """
+        params = self._date_params(start_date, end_date)
+        params['page_size'] = page_size
+        if since:
+            if since.get('last_timestamp'):
+                params['since'] = since['last_timestamp']
+            if since.get('last_order_id'):
+                params['after_id'] = since['last_order_id']
+        orders, meta = self._order_page({**params, 'page': 1})
+        if orders:
+            yield orders
+        pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix='broker-pages')
+        try:
+            if meta.get('next_cursor'):
+                yield from self._iter_cursor_pages(pool, params, meta['next_cursor'])
+            elif meta.get('total_pages') is not None or len(orders) >= page_size:
+                yield from self._iter_numbered_pages(pool, params, meta.get('total_pages'), page_size, max_parallel)
+        finally:
+            # A caller that stops early abandons pages still in flight
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_cursor_pages(self, pool: ThreadPoolExecutor, params: Dict[str, Any],
+                           cursor: str) -> Iterator[List[Dict[str, Any]]]:
+        pending = pool.submit(self._order_page, {**params, 'cursor': cursor})
+        while pending is not None:
+            orders, meta = pending.result()
+            cursor = meta.get('next_cursor')
+            pending = pool.submit(self._order_page, {**params, 'cursor': cursor}) if cursor and orders else None
+            if orders:
+                yield orders
+
+    def _iter_numbered_pages(self, pool: ThreadPoolExecutor, params: Dict[str, Any], total_pages: Optional[int],
+                             page_size: int, max_parallel: int) -> Iterator[List[Dict[str, Any]]]:
+        # Without a page count, pages past the end are requested speculatively and come back empty
+        pages = iter(range(2, total_pages + 1)) if total_pages is not None else count(2)
+        pending = deque()
+
+        def refill():
+            while len(pending) < max_parallel:
+                page = next(pages, None)
+                if page is None:
+                    return
+                pending.append(pool.submit(self._order_page, {**params, 'page': page}))
+
+        refill()
+        while pending:
+            orders, _ = pending.popleft().result()
+            if orders:
+                yield orders
+            if total_pages is None and len(orders) < page_size:
+                return
+            refill()
+
+    @staticmethod
+    def orders_frame(orders: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Orders as a DataFrame with the TastyTrade CSV columns CSVProcessor reads."""
+        frame = pd.DataFrame.from_records(orders).rename(columns=ORDER_COLUMNS).reindex(columns=REQUIRED_COLUMNS)
+        times = pd.to_datetime(frame['Time'], utc=True, errors='coerce')
+        frame['Time'] = times.dt.tz_convert(None).dt.strftime('%Y-%m-%d %H:%M:%S')
+        frame['Description'] = frame['Description'].fillna('')
+        return frame
+
+    @staticmethod
+    def orders_to_trades(orders: List[Dict[str, Any]]) -> List[Trade]:
+        """Parse orders with CSVProcessor exactly like an uploaded CSV (orders it would reject are skipped)."""
+        return CSVProcessor.from_dataframe(BrokerAPIClient.orders_frame(orders)).to_trades()
+
+    def iter_trades(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    page_size: int = 500, max_parallel: int = 4) -> Iterator[List[Trade]]:
+        """Order history as batches of trades, one per page (see orders_to_trades)."""
+        for orders in self.iter_order_history(start_date, end_date, page_size, max_parallel):
+            yield self.orders_to_trades(orders)
+
+    @staticmethod
+    def _latest(orders: List[Dict[str, Any]], cursor: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """The sync cursor moved past the newest of ``orders``."""
+        newest = cursor
+        newest_time = pd.to_datetime(cursor['last_timestamp'], utc=True) if cursor and cursor.get('last_timestamp') else None
+        for order in orders:
+            when = pd.to_datetime(order.get('timestamp'), utc=True, errors='coerce')
+            if pd.isna(when) or (newest_time is not None and when < newest_time):
+                continue
+            newest, newest_time = {'last_order_id': str(order.get('order_id')), 'last_timestamp': order['timestamp']}, when
+        return newest
+
+    def sync_orders(self, store, account: str = '', page_size: int = 500, max_parallel: int = 4) -> int:
+        """
+        Merge orders placed since the last sync into a trade store.
+
+        Reads the account's sync cursor from ``store``, pages through only the
+        newer orders, imports each page with
+        ``store.import_trades`` and saves the new cursor once every page is
+        merged. An interrupted sync resumes from the previous cursor; fills
+        are upserted by order number, so re-sent orders are not duplicated.
+
+        Args:
+            store: TradeStore or ParquetTradeStore to merge into
+            account: Journal account the orders belong to
+            page_size: Orders requested per page
+            max_parallel: Page requests in flight at once
+
+        Returns:
+            Number of fills merged
+        """
+        cursor = store.load_sync_cursor(account)
+        latest = cursor
+        merged = 0
+        for orders in self.iter_order_history(page_size=page_size, max_parallel=max_parallel, since=cursor):
+            trades = self.orders_to_trades(orders)
+            store.import_trades(trades, account=account)
+            merged += len(trades)
+            latest = self._latest(orders, latest)
+        # Saved only after the last page: pages are not guaranteed to arrive
+        # oldest-first, so a cursor saved mid-sync could skip older orders
+        if latest and latest != cursor:
+            store.save_sync_cursor(latest, account)
+        return merged
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class InsightGenerator:
     """
@@ -24,4 +24,20 @@ class InsightGenerator:
     @staticmethod
     def highlight_performance_trends(trend_analysis: Dict[str, Any]) -> str:
         trend = trend_analysis.get('trend', 'UNKNOWN')
-        return f"Performance trend: {trend}" 
\ No newline at end of file
+        return f"Performance trend: {trend}"
+
+    @staticmethod
+    def suggest_action_items(analytics: Dict[str, Any]) -> List[str]:
+        items = []
+        win_rate = analytics.get('win_rate')
+        risk_adjusted = analytics.get('risk_adjusted_return')
+        total_pnl = analytics.get('total_pnl')
+        if win_rate is not None and win_rate < 0.5:
+            items.append("Review entry criteria on losing trades; win rate is below 50%.")
+        if risk_adjusted is not None and risk_adjusted < 1:
+            items.append("Reduce position size until risk-adjusted return is above 1.0.")
+        if total_pnl is not None and total_pnl < 0:
+            items.append("Re-evaluate strategies that lost money this period.")
+        if not items:
+            items.append("Keep current sizing and document what is working.")
+        return items
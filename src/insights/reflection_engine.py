@@ -1,5 +1,5 @@
 from typing import Dict, Any, List
-from src.llm.openai_client import OpenAIClient
+from src.llm.openai_client import OpenAIClient, is_llm_error
 
 class ReflectionEngine:
     """
@@ -7,14 +7,24 @@ class ReflectionEngine:
     """
     @staticmethod
     def generate_questions(analytics: Dict[str, Any], llm_client: OpenAIClient) -> List[str]:
-        prompt = (
+        response = llm_client._call_openai(ReflectionEngine.build_prompt(analytics))
+        return ReflectionEngine.parse_questions(response)
+
+    @staticmethod
+    def build_prompt(analytics: Dict[str, Any]) -> str:
+        return (
             f"Based on these metrics, generate 3-5 personalized reflection questions to help the trader improve:\n"
             f"Win Rate: {analytics.get('win_rate', 'N/A')}\n"
             f"Total PnL: {analytics.get('total_pnl', 'N/A')}\n"
             f"Time-Weighted Return: {analytics.get('time_weighted_return', 'N/A')}\n"
             f"Risk-Adjusted Return: {analytics.get('risk_adjusted_return', 'N/A')}\n"
         )
-        response = llm_client._call_openai(prompt)
+
+    @staticmethod
+    def parse_questions(response: str) -> List[str]:
+        # A failed request's error text is not a list of questions
+        if is_llm_error(response):
+            return ReflectionEngine.question_templates()
         return [q.strip() for q in response.split('\n') if q.strip()]
 
     @staticmethod
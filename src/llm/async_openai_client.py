@@ -0,0 +1,128 @@
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.openai_client import MAX_TOKENS, OpenAIClient
+from src.llm.response_cache import ResponseCache
+from src.utils.rate_limiter import TokenBucket
+
+class AsyncOpenAIClient(OpenAIClient):
+    """
+    OpenAI/LM Studio client that runs independent prompts concurrently.
+
+    Requests go through openai.AsyncOpenAI, at most ``max_concurrency`` at a
+    time, paced by an async token bucket of ``rate_limit`` requests per minute
+    (bursting up to ``burst``). Results are yielded as they complete, so a set
+    of prompts takes about as long as the slowest one rather than their sum.
+    The blocking methods inherited from OpenAIClient keep working.
+    """
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, rate_limit: int = 60, api_base: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None, max_concurrency: int = 4, burst: Optional[int] = None,
+                 limiter: Optional[TokenBucket] = None, request_timeout: float = 30.0, breaker: Optional[CircuitBreaker] = None):
+        # Room for a concurrent burst when this client is the first to claim the endpoint's shared budget
+        super().__init__(api_key=api_key, model=model, rate_limit=rate_limit, api_base=api_base, cache=cache, limiter=limiter,
+                         request_timeout=request_timeout, breaker=breaker, burst=burst or max_concurrency)
+        self.max_concurrency = max_concurrency
+
+    def _get_async_client(self):
+        import openai
+        # One client per event loop: its connection pool is bound to the loop that created it
+        return openai.AsyncOpenAI(api_key=self.api_key or "sk-local", base_url=self.api_base)
+
+    async def _complete(self, client, semaphore: asyncio.Semaphore, prompt: str,
+                        on_delta: Optional[Callable[[str], None]] = None) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            if on_delta is not None:
+                on_delta(cached)
+            return cached
+        async with semaphore:
+            if not self.breaker.allow():
+                return self._circuit_open_error()
+            await self.limiter.acquire_async()
+            try:
+                if on_delta is None:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=MAX_TOKENS,
+                        timeout=self.request_timeout
+                    )
+                    content = response.choices[0].message.content.strip()
+                else:
+                    stream = await client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=MAX_TOKENS,
+                        timeout=self.request_timeout,
+                        stream=True
+                    )
+                    parts = []
+                    async for chunk in stream:
+                        text = self._delta_text(chunk)
+                        if text:
+                            parts.append(text)
+                            on_delta(''.join(parts))
+                    content = ''.join(parts).strip()
+            except Exception as e:
+                self.breaker.record_failure()
+                return self._error(e)
+            self.breaker.record_success()
+        if key is not None:
+            self.cache.set(key, content)
+        return content
+
+    async def iter_completions(self, prompts: Dict[str, str],
+                               on_delta: Optional[Callable[[str, str], None]] = None) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Send every prompt concurrently and yield (name, response) pairs in completion order.
+
+        Args:
+            prompts: Prompt text keyed by a caller-chosen name
+            on_delta: Called with (name, text so far) as tokens stream in; enables streaming requests
+
+        Yields:
+            (name, response text) as each request finishes; failed requests
+            yield an error message like OpenAIClient._call_openai
+        """
+        client = self._get_async_client()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(name: str, prompt: str) -> Tuple[str, str]:
+            partial = (lambda text: on_delta(name, text)) if on_delta is not None else None
+            return name, await self._complete(client, semaphore, prompt, partial)
+
+        tasks = [asyncio.ensure_future(run(name, prompt)) for name, prompt in prompts.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await client.close()
+
+    async def complete_all_async(self, prompts: Dict[str, str],
+                                 on_result: Optional[Callable[[str, str], None]] = None,
+                                 on_delta: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """
+        Responses for every prompt, keyed like ``prompts``. ``on_result`` is
+        called as each completes and ``on_delta`` as each one streams in.
+        """
+        results = {}
+        async for name, text in self.iter_completions(prompts, on_delta):
+            results[name] = text
+            if on_result is not None:
+                on_result(name, text)
+        return {name: results[name] for name in prompts}
+
+    def complete_all(self, prompts: Dict[str, str],
+                     on_result: Optional[Callable[[str, str], None]] = None,
+                     on_delta: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """
+        Blocking entry point for synchronous callers such as pipeline stages.
+
+        Must not be called from a thread that is already running an event
+        loop; use complete_all_async there.
+        """
+        return asyncio.run(self.complete_all_async(prompts, on_result, on_delta))
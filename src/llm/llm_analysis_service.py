@@ -7,6 +7,10 @@ that can be properly tested with requests-mock.
 import requests
 from requests.exceptions import Timeout, ConnectionError
 from typing import Dict, Any, List, Optional
+from src.llm.prompt_compactor import PromptCompactor
+from src.llm.response_cache import ResponseCache
+from src.utils.http_session import build_session
+from src.utils.rate_limiter import TokenBucket, shared_bucket
 
 
 class LLMAnalysisService:
@@ -20,7 +24,10 @@ class LLMAnalysisService:
     - Timeout configuration
     """
     
-    def __init__(self, api_endpoint: str, api_key: Optional[str] = None, model: str = "gpt-analysis-model"):
+    def __init__(self, api_endpoint: str, api_key: Optional[str] = None, model: str = "gpt-analysis-model",
+                 cache: Optional[ResponseCache] = None, rate_limit: int = 60,
+                 burst: int = 5, limiter: Optional[TokenBucket] = None, session: Optional[requests.Session] = None,
+                 pool_size: int = 10, max_retries: int = 3, prompt_token_budget: int = 1000):
         """
         Initialize the LLM analysis service.
         
@@ -28,10 +35,27 @@ class LLMAnalysisService:
             api_endpoint: Endpoint for the LLM API
             api_key: API key for authentication (optional)
             model: Model to use for analysis
+            cache: Response cache for successful replies (default: ResponseCache.from_env())
+            rate_limit: Requests per minute allowed against this endpoint
+            burst: Requests that may be sent back to back before pacing starts
+            limiter: Token bucket to draw from (default: one shared per endpoint and rate)
+            session: HTTP session to send requests with (default: a pooled keep-alive session)
+            pool_size: Connections kept alive by the default session
+            max_retries: Retries on connection errors, 429 and 5xx responses with exponential backoff
+            prompt_token_budget: Estimated token budget for the trade data in each prompt
         """
         self.api_endpoint = api_endpoint.rstrip('/')  # Remove trailing slash if present
         self.api_key = api_key
         self.model = model
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self.limiter = limiter or shared_bucket(('llm-analysis', self.api_endpoint), rate_limit / 60.0, capacity=burst)
+        # Analysis prompts are side-effect free, so POST is safe to retry
+        self.session = session or build_session(pool_size=pool_size, max_retries=max_retries, allowed_methods=['POST'])
+        self.compactor = PromptCompactor(max_tokens=prompt_token_budget)
+        
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
         
     def _make_request(self, prompt: str) -> Dict[str, Any]:
         """
@@ -64,15 +88,26 @@ class LLMAnalysisService:
             ]
         }
         
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.model, payload["messages"], endpoint=self.api_endpoint)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        self.limiter.acquire()
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_endpoint,
                 headers=headers,
                 json=payload,
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if key is not None:
+                self.cache.set(key, result)
+            return result
         except Timeout:
             raise Exception("LLM analysis request timed out")
         except ConnectionError:
@@ -100,7 +135,7 @@ class LLMAnalysisService:
         Raises:
             Exception: If API request fails
         """
-        prompt = f"Analyze these trades: {trades_data}"
+        prompt = f"Analyze these trades:\n{self.compactor.format(trades_data)}"
         try:
             response = self._make_request(prompt)
             return response["analysis"]
@@ -122,7 +157,7 @@ class LLMAnalysisService:
         Raises:
             Exception: If API request fails
         """
-        prompt = f"Generate 3-5 reflection questions based on these trades: {trades_data}"
+        prompt = f"Generate 3-5 reflection questions based on these trades:\n{self.compactor.format(trades_data)}"
         try:
             response = self._make_request(prompt)
             return response["questions"]
@@ -144,7 +179,7 @@ class LLMAnalysisService:
         Raises:
             Exception: If API request fails
         """
-        prompt = f"Provide market sentiment analysis for these symbols: {', '.join(symbols)}"
+        prompt = f"Provide market sentiment analysis for these symbols: {self.compactor.fit(', '.join(symbols))}"
         try:
             response = self._make_request(prompt)
             return response["sentiment"]
@@ -1,31 +1,66 @@
-import openai
 import os
-import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
+from src.llm.circuit_breaker import CircuitBreaker
 from src.llm.prompt_builder import PromptBuilder
-from src.config import config
+from src.llm.response_cache import ResponseCache
+from src.llm.structured_output import (
+    GROUP_SUMMARIES_SCHEMA, REPORT_SECTIONS_SCHEMA, parse_group_summaries, parse_report_sections, response_format
+)
+from src.config import Config
+from src.utils.rate_limiter import TokenBucket, shared_bucket
+
+# Completion length for analysis and reflection prompts
+MAX_TOKENS = 300
+# Combined analysis + questions + action items response
+SECTIONS_MAX_TOKENS = 700
+# Per strategy group in a batched summaries response
+GROUP_MAX_TOKENS = 80
+# Prefix of the text returned in place of a completion when a request fails
+ERROR_PREFIX = "OpenAI/LM Studio API error"
+
+class LLMStreamError(Exception):
+    """A streamed completion failed or was refused; text already yielded is incomplete."""
+
+def is_llm_error(text: Optional[str]) -> bool:
+    """Whether a response is the error text returned for a failed or refused request."""
+    return text is None or text.startswith(ERROR_PREFIX)
 
 class OpenAIClient:
     """
     Handles OpenAI/LM Studio API interaction for performance analysis and reflection questions.
     Supports local LM Studio endpoint via config (set OPENAI_API_BASE and model as needed).
+    The openai package is imported and the HTTP client created on the first request.
+    Successful responses are stored in ``cache`` (default: ResponseCache.from_env()),
+    so identical prompts for the same model and parameters are answered locally.
+    Requests draw from ``limiter``, by default a token bucket of ``rate_limit``
+    requests per minute (bursting up to ``burst``) shared by every client of
+    the same endpoint.
+    Each request is abandoned after ``request_timeout`` seconds, and ``breaker``
+    stops sending requests for a while after repeated failures, so a slow or
+    stopped server costs an immediate error instead of a timeout per prompt.
     """
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, rate_limit: int = 60, api_base: Optional[str] = None):
-        self.api_key = api_key or config.OPENAI_API_KEY
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, rate_limit: int = 60, api_base: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None, limiter: Optional[TokenBucket] = None,
+                 request_timeout: float = 30.0, breaker: Optional[CircuitBreaker] = None, burst: int = 1):
+        self.api_key = api_key or Config.get_openai_api_key()
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
         self.api_base = api_base or os.getenv("OPENAI_API_BASE", "http://192.168.2.3:1234/v1")
         self.rate_limit = rate_limit  # requests per minute
-        self.last_request_time = 0
-        openai.api_key = self.api_key or "sk-local"  # LM Studio ignores key but openai-python requires a value
-        openai.api_base = self.api_base
+        self.limiter = limiter or shared_bucket(('openai', self.api_base), rate_limit / 60.0, capacity=burst)
+        self._client = None
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self.request_timeout = request_timeout
+        self.breaker = breaker or CircuitBreaker()
+
+    def _get_client(self):
+        if self._client is None:
+            import openai
+            # LM Studio ignores the key but openai-python requires a value
+            self._client = openai.OpenAI(api_key=self.api_key or "sk-local", base_url=self.api_base)
+        return self._client
 
     def _rate_limit(self):
-        now = time.time()
-        elapsed = now - self.last_request_time
-        min_interval = 60 / self.rate_limit
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self.last_request_time = time.time()
+        self.limiter.acquire()
 
     def generate_performance_analysis(self, metrics: Dict[str, Any]) -> str:
         prompt = PromptBuilder.build_performance_prompt(metrics)
@@ -35,14 +70,128 @@ class OpenAIClient:
         prompt = PromptBuilder.build_reflection_prompt(metrics)
         return self._call_openai(prompt)
 
-    def _call_openai(self, prompt: str) -> str:
+    def generate_report_sections(self, metrics: Dict[str, Any],
+                                 on_delta: Optional[Callable[[str], None]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Analysis, reflection questions and action items from a single JSON-schema
+        request, as ``{'insights', 'questions', 'action_items'}``. Returns None
+        when the model's reply cannot be parsed, so callers can fall back to
+        separate prompts. ``on_delta`` receives the raw text so far while streaming.
+        """
+        prompt = PromptBuilder.build_combined_prompt(metrics)
+        request = {'max_tokens': SECTIONS_MAX_TOKENS, 'response_format': response_format('report_sections', REPORT_SECTIONS_SCHEMA)}
+        if on_delta is None:
+            text = self._call_openai(prompt, **request)
+        else:
+            text = ''
+            try:
+                for chunk in self.stream_openai(prompt, **request):
+                    text += chunk
+                    on_delta(text)
+            except LLMStreamError:
+                return None
+        return parse_report_sections(text)
+
+    def generate_group_summaries(self, groups: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """Summary per strategy group from one batched request (groups missing from the reply are omitted)."""
+        if not groups:
+            return {}
+        text = self._call_openai(
+            PromptBuilder.build_group_summaries_prompt(groups),
+            max_tokens=GROUP_MAX_TOKENS * len(groups) + 50,
+            response_format=response_format('group_summaries', GROUP_SUMMARIES_SCHEMA),
+        )
+        return parse_group_summaries(text, list(groups))
+
+    def _cache_lookup(self, messages, max_tokens: int = MAX_TOKENS,
+                      response_format: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Return (cache key, cached response); the key is None when caching is off."""
+        if self.cache is None:
+            return None, None
+        params = {'max_tokens': max_tokens, 'temperature': None}
+        if response_format is not None:
+            params['response_format'] = response_format
+        key = ResponseCache.make_key(self.model, messages, **params)
+        return key, self.cache.get(key)
+
+    def _request_options(self, max_tokens: int, response_format: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        options = {'max_tokens': max_tokens, 'timeout': self.request_timeout}
+        if response_format is not None:
+            options['response_format'] = response_format
+        return options
+
+    @staticmethod
+    def _error(reason: Any) -> str:
+        return f"{ERROR_PREFIX}: {reason}"
+
+    def _circuit_open_error(self) -> str:
+        return self._error(f"circuit open after repeated failures; retrying in up to {self.breaker.reset_seconds:g}s")
+
+    def _call_openai(self, prompt: str, max_tokens: int = MAX_TOKENS, response_format: Optional[Dict[str, Any]] = None) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        key, cached = self._cache_lookup(messages, max_tokens, response_format)
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            return self._circuit_open_error()
+        self._rate_limit()
+        try:
+            response = self._get_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **self._request_options(max_tokens, response_format)
+            )
+            content = response.choices[0].message.content.strip()
+        except Exception as e:
+            self.breaker.record_failure()
+            return self._error(e)
+        self.breaker.record_success()
+        # Errors are returned as text but never cached
+        if key is not None:
+            self.cache.set(key, content)
+        return content
+
+    @staticmethod
+    def _delta_text(chunk) -> str:
+        """Text carried by one streamed completion chunk (empty for role/finish chunks)."""
+        return (chunk.choices[0].delta.content or '') if chunk.choices else ''
+
+    def stream_openai(self, prompt: str, max_tokens: int = MAX_TOKENS,
+                      response_format: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Yield the completion in chunks as the endpoint produces them.
+
+        The joined chunks are the same text _call_openai returns (a cached
+        response arrives as one chunk); the full text is cached once the
+        stream ends. A failed or refused request raises LLMStreamError (with
+        the error text _call_openai would return), even after some chunks
+        were yielded, so callers can discard the partial text.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        key, cached = self._cache_lookup(messages, max_tokens, response_format)
+        if cached is not None:
+            yield cached
+            return
+        if not self.breaker.allow():
+            raise LLMStreamError(self._circuit_open_error())
         self._rate_limit()
+        parts = []
         try:
-            response = openai.ChatCompletion.create(
+            stream = self._get_client().chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300
+                messages=messages,
+                stream=True,
+                **self._request_options(max_tokens, response_format)
             )
-            return response.choices[0].message["content"].strip()
+            for chunk in stream:
+                text = self._delta_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
         except Exception as e:
-            return f"OpenAI/LM Studio API error: {e}" 
\ No newline at end of file
+            self.breaker.record_failure()
+            raise LLMStreamError(self._error(e)) from e
+        self.breaker.record_success()
+        content = ''.join(parts).strip()
+        if key is not None and content:
+            self.cache.set(key, content)
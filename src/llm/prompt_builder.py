@@ -1,9 +1,14 @@
 from typing import Dict, Any
+from src.llm.prompt_compactor import PromptCompactor
 
 class PromptBuilder:
     """
     Builds prompts for OpenAI API: performance analysis and reflection questions.
+    List-valued metrics are summarized by ``compactor`` so prompt size stays
+    constant however many positions the journal holds.
     """
+    compactor = PromptCompactor()
+
     @staticmethod
     def build_performance_prompt(metrics: Dict[str, Any]) -> str:
         return (
@@ -12,7 +17,7 @@ class PromptBuilder:
             f"Total PnL: {metrics.get('total_pnl', 'N/A')}\n"
             f"Time-Weighted Return: {metrics.get('time_weighted_return', 'N/A')}\n"
             f"Risk-Adjusted Return: {metrics.get('risk_adjusted_return', 'N/A')}\n"
-            f"Holding Periods: {metrics.get('holding_periods', [])}\n"
+            f"Holding Periods: {PromptBuilder.compactor.compact_value(metrics.get('holding_periods', []))}\n"
             f"Please provide a concise analysis of this trading performance."
         )
 
@@ -27,6 +32,39 @@ class PromptBuilder:
             f"Please generate 3-5 reflection questions to help the trader improve."
         )
 
+    @staticmethod
+    def metrics_block(metrics: Dict[str, Any]) -> str:
+        return (
+            f"Win Rate: {metrics.get('win_rate', 'N/A')}\n"
+            f"Total PnL: {metrics.get('total_pnl', 'N/A')}\n"
+            f"Time-Weighted Return: {metrics.get('time_weighted_return', 'N/A')}\n"
+            f"Risk-Adjusted Return: {metrics.get('risk_adjusted_return', 'N/A')}\n"
+            f"Holding Periods: {PromptBuilder.compactor.compact_value(metrics.get('holding_periods', []))}\n"
+        )
+
+    @staticmethod
+    def build_combined_prompt(metrics: Dict[str, Any]) -> str:
+        """One prompt for the analysis, reflection questions and action items, answered as JSON."""
+        return (
+            f"Performance Summary:\n"
+            f"{PromptBuilder.metrics_block(metrics)}"
+            f"Respond with a JSON object with these keys:\n"
+            f'"analysis": a concise analysis of this trading performance,\n'
+            f'"questions": 3-5 reflection questions to help the trader improve,\n'
+            f'"action_items": 2-4 specific action items for next month.\n'
+            f"Return only the JSON object."
+        )
+
+    @staticmethod
+    def build_group_summaries_prompt(groups: Dict[str, Dict[str, Any]]) -> str:
+        """One prompt summarizing every strategy group, answered as JSON."""
+        lines = [f"- {name}: {PromptBuilder.compactor.compact_value(stats)}" for name, stats in groups.items()]
+        return (
+            f"Strategy group metrics:\n" + PromptBuilder.compactor.fit("\n".join(lines)) + "\n"
+            f'Respond with a JSON object {{"groups": [{{"group": <name>, "summary": <one or two sentences>}}]}} '
+            f"with one entry per group listed above. Return only the JSON object."
+        )
+
     @staticmethod
     def format_context(trading_data: Dict[str, Any]) -> str:
-        return f"Trading Data Context:\n{trading_data}" 
\ No newline at end of file
+        return f"Trading Data Context:\n{PromptBuilder.compactor.format(trading_data)}" 
\ No newline at end of file
@@ -0,0 +1,131 @@
+import math
+import re
+from numbers import Real
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+# Words, numbers and individual punctuation marks, roughly how BPE tokenizers split English text
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Numeric fields used to rank records when picking outliers, in order of preference
+RANK_FIELDS = ('pnl', 'total_pnl', 'return', 'value')
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local token estimate for budget checks: one token per punctuation
+    mark, one per ~4 characters of each word or number. Tends to overestimate
+    slightly, which is the safe direction for a budget.
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PIECES.findall(text))
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+def _fmt(value: float) -> str:
+    return f"{value:.4g}"
+
+class PromptCompactor:
+    """
+    Shrinks trading data for LLM prompts so their size does not grow with the journal.
+
+    Numeric lists become a count, quantiles, a coarse histogram and the
+    top-k outliers. Lists of records are summarized per numeric field, with the
+    top-k records by magnitude of their PnL (or first ranking field). The
+    formatted text is then cut to ``max_tokens`` as estimated by estimate_tokens.
+    """
+    def __init__(self, max_tokens: int = 1000, top_k: int = 3, bins: int = 5, max_items: int = 10):
+        """
+        Args:
+            max_tokens: Budget for the compacted data block
+            top_k: Outliers (largest absolute deviations, or largest records) to keep
+            bins: Histogram buckets for numeric lists
+            max_items: Lists up to this length are kept verbatim
+        """
+        self.max_tokens = max_tokens
+        self.top_k = top_k
+        self.bins = bins
+        self.max_items = max_items
+
+    def summarize_numbers(self, values: Sequence[Any]) -> str:
+        numbers = np.asarray([v for v in values if _is_number(v) and not math.isnan(v)], dtype=float)
+        if numbers.size == 0:
+            return "n=0"
+        if numbers.size <= self.max_items:
+            return "[" + ", ".join(_fmt(v) for v in numbers) + "]"
+        p10, p25, p50, p75, p90 = np.percentile(numbers, [10, 25, 50, 75, 90])
+        counts, edges = np.histogram(numbers, bins=self.bins)
+        histogram = ", ".join(f"{_fmt(edges[i])}..{_fmt(edges[i + 1])}: {count}" for i, count in enumerate(counts))
+        deviation = np.abs(numbers - p50)
+        outliers = numbers[np.argsort(-deviation, kind='stable')[:self.top_k]]
+        return (
+            f"n={numbers.size}, mean={_fmt(numbers.mean())}, min={_fmt(numbers.min())}, p10={_fmt(p10)}, "
+            f"p25={_fmt(p25)}, median={_fmt(p50)}, p75={_fmt(p75)}, p90={_fmt(p90)}, max={_fmt(numbers.max())}; "
+            f"histogram: {histogram}; outliers: {', '.join(_fmt(v) for v in outliers)}"
+        )
+
+    def summarize_records(self, records: List[Dict[str, Any]]) -> str:
+        fields = [k for k in records[0] if all(_is_number(r.get(k)) for r in records)]
+        lines = [f"{len(records)} records"]
+        for name in fields:
+            lines.append(f"  {name}: {self.summarize_numbers([r[name] for r in records])}")
+        rank = next((f for f in RANK_FIELDS if f in fields), fields[0] if fields else None)
+        if rank is not None:
+            top = sorted(records, key=lambda r: -abs(r[rank]))[:self.top_k]
+            lines.append(f"  top {len(top)} by |{rank}|: " + "; ".join(self._inline(r) for r in top))
+        return "\n".join(lines)
+
+    def _inline(self, record: Dict[str, Any]) -> str:
+        return ", ".join(f"{k}={_fmt(v) if _is_number(v) else v}" for k, v in record.items())
+
+    def compact_value(self, value: Any) -> str:
+        if isinstance(value, dict):
+            return "{" + ", ".join(f"{k}: {self.compact_value(v)}" for k, v in value.items()) + "}"
+        if isinstance(value, (list, tuple, np.ndarray)):
+            items = list(value)
+            if items and all(isinstance(item, dict) for item in items):
+                return self.summarize_records(items) if len(items) > self.max_items else \
+                    "[" + "; ".join(self._inline(item) for item in items) + "]"
+            if items and all(_is_number(item) for item in items):
+                return self.summarize_numbers(items)
+            if len(items) > self.max_items:
+                return f"{len(items)} items, first {self.max_items}: {items[:self.max_items]}"
+            return str(items)
+        if _is_number(value):
+            return _fmt(value)
+        return str(value)
+
+    def fit(self, text: str, max_tokens: Optional[int] = None) -> str:
+        """Keep whole lines (then words) while they fit the budget; mark the cut."""
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        if estimate_tokens(text) <= budget:
+            return text
+        marker = "... (truncated)"
+        used = estimate_tokens(marker)
+        kept = []
+        for line in text.split("\n"):
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                # Keep the words of the first overflowing line that still fit
+                words = []
+                for word in line.split(" "):
+                    cost = estimate_tokens(word)
+                    if used + cost > budget:
+                        break
+                    words.append(word)
+                    used += cost
+                if words:
+                    kept.append(" ".join(words))
+                break
+            kept.append(line)
+            used += cost
+        return "\n".join(kept + [marker])
+
+    def format(self, data: Dict[str, Any], max_tokens: Optional[int] = None) -> str:
+        """
+        ``key: compacted value`` lines for a dict of trading data, within the
+        token budget. Scalars come first so a cut only ever drops detail.
+        """
+        def is_scalar(value: Any) -> bool:
+            return not isinstance(value, (dict, list, tuple, np.ndarray))
+        ordered = sorted(data.items(), key=lambda item: not is_scalar(item[1]))
+        return self.fit("\n".join(f"{key}: {self.compact_value(value)}" for key, value in ordered), max_tokens)
@@ -0,0 +1,112 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from src.utils.fingerprint import fingerprint
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+class ResponseCache:
+    """
+    Persistent LLM response cache in a local SQLite file.
+
+    Entries are keyed by a fingerprint of the model, messages and request
+    parameters, expire after ``ttl_seconds`` and are evicted least recently
+    used first once more than ``max_entries`` are stored.
+    """
+    DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+    DEFAULT_MAX_ENTRIES = 10_000
+
+    def __init__(self, path: str = ':memory:', ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, clock=time.time):
+        """
+        Args:
+            path: SQLite file for the cache (":memory:" for a per-process cache)
+            ttl_seconds: Seconds before an entry expires; None keeps entries until evicted
+            max_entries: Maximum number of stored responses
+            clock: Time source, overridable for tests
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Insight stages call the LLM from worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional['ResponseCache']:
+        """Cache configured by LLM_CACHE_PATH (and optional LLM_CACHE_TTL_SECONDS), or None when unset."""
+        path = os.getenv("LLM_CACHE_PATH")
+        if not path:
+            return None
+        ttl = os.getenv("LLM_CACHE_TTL_SECONDS")
+        return cls(path, ttl_seconds=float(ttl) if ttl else cls.DEFAULT_TTL_SECONDS)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+        """Fingerprint of everything that determines a completion."""
+        return fingerprint(model, messages, sorted(params.items()))
+
+    def get(self, key: str) -> Optional[Any]:
+        now = self._clock()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, created_at = excluded.created_at, "
+                "accessed_at = excluded.accessed_at",
+                (key, json.dumps(value), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM responses WHERE created_at < ?", (self._clock() - self.ttl_seconds,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,114 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# JSON schema for the combined analysis / questions / action items response
+REPORT_SECTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {"type": "string"},
+        "questions": {"type": "array", "items": {"type": "string"}},
+        "action_items": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["analysis", "questions", "action_items"],
+    "additionalProperties": False,
+}
+
+# JSON schema for one summary per strategy group
+GROUP_SUMMARIES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "groups": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"group": {"type": "string"}, "summary": {"type": "string"}},
+                "required": ["group", "summary"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["groups"],
+    "additionalProperties": False,
+}
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_PARTIAL_ANALYSIS = re.compile(r'"analysis"\s*:\s*"((?:[^"\\]|\\.)*)', re.DOTALL)
+_PARTIAL_QUESTIONS = re.compile(r'"questions"\s*:\s*\[(.*?)(?:\]|$)', re.DOTALL)
+_JSON_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+def response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """``response_format`` request parameter asking an OpenAI-compatible server for schema-conforming JSON."""
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Parse the JSON object in a model response, tolerating Markdown code
+    fences and prose around it. Returns None when there is no valid object.
+    """
+    if not text:
+        return None
+    fenced = _FENCE.search(text)
+    candidate = fenced.group(1) if fenced else text
+    start, end = candidate.find('{'), candidate.rfind('}')
+    if start == -1 or end < start:
+        return None
+    try:
+        return json.loads(candidate[start:end + 1])
+    except ValueError:
+        return None
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split('\n')
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()]
+
+def parse_report_sections(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Sections of a combined response as ``{'insights', 'questions', 'action_items'}``,
+    or None when the response is not usable JSON with a non-empty analysis.
+    """
+    data = extract_json(text)
+    if not isinstance(data, dict) or not isinstance(data.get('analysis'), str) or not data['analysis'].strip():
+        return None
+    return {
+        'insights': data['analysis'].strip(),
+        'questions': _strings(data.get('questions')),
+        'action_items': _strings(data.get('action_items')),
+    }
+
+def _unescape(fragment: str) -> str:
+    # Drop a trailing lone backslash from a string cut mid-escape
+    if fragment.endswith('\\') and not fragment.endswith('\\\\'):
+        fragment = fragment[:-1]
+    try:
+        return json.loads(f'"{fragment}"')
+    except ValueError:
+        return fragment.replace('\\n', '\n').replace('\\"', '"')
+
+def partial_report_sections(text: str) -> Dict[str, Any]:
+    """
+    Best-effort sections of a combined response that is still streaming:
+    the analysis text received so far and every question completed so far.
+    """
+    analysis = _PARTIAL_ANALYSIS.search(text)
+    questions = _PARTIAL_QUESTIONS.search(text)
+    return {
+        'insights': _unescape(analysis.group(1)) if analysis else '',
+        'questions': [_unescape(q) for q in _JSON_STRING.findall(questions.group(1))] if questions else [],
+    }
+
+def parse_group_summaries(text: str, groups: List[str]) -> Dict[str, str]:
+    """Summary per requested group; groups the model skipped or invented are dropped."""
+    data = extract_json(text)
+    entries = data.get('groups') if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return {}
+    wanted = set(groups)
+    summaries = {}
+    for entry in entries:
+        if isinstance(entry, dict) and entry.get('group') in wanted and isinstance(entry.get('summary'), str):
+            summaries[entry['group']] = entry['summary'].strip()
+    return summaries
@@ -11,6 +11,7 @@ class Position:
     holding_period: Optional[float] = None  # in days
     pnl: Optional[float] = None
     time_weighted_return: Optional[float] = None
+    strategy: Optional[str] = None  # pattern name of the opening order, e.g. 'VERTICAL_SPREAD'
 
     def calculate_pnl(self):
         entries = sum(t.price * (t.quantity or 1) for t in self.entry_trades)
@@ -21,6 +22,14 @@ class Position:
     def is_open(self):
         return self.status == 'open'
 
+    def entry_time(self):
+        # Falls back to the first exit for positions whose entry is outside the data
+        trades = self.entry_trades or self.exit_trades
+        return min(t.time for t in trades) if trades else None
+
+    def exit_time(self):
+        return max(t.time for t in self.exit_trades) if self.exit_trades else None
+
     def calculate_holding_period(self):
         if not self.entry_trades or not self.exit_trades:
             return None
@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Any
+
+@dataclass
+class ReportContent:
+    """
+    Inputs for a rendered report. ``charts`` maps chart name to an image file
+    path (or an embedded markdown image, which exporters write out to a file).
+    """
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    charts: Dict[str, str] = field(default_factory=dict)
+    insights: str = ""
+    questions: List[str] = field(default_factory=list)
+    action_items: List[str] = field(default_factory=list)
+    group_summaries: Dict[str, str] = field(default_factory=dict)  # strategy -> LLM summary
+    title: str = "Trading Journal Report"
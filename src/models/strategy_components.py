@@ -7,6 +7,10 @@ class StrategyPattern(Enum):
     VERTICAL_SPREAD = auto()
     STRADDLE = auto()
     STRANGLE = auto()
+    IRON_CONDOR = auto()
+    BUTTERFLY = auto()
+    CALENDAR_SPREAD = auto()
+    RATIO_SPREAD = auto()
     COMPLEX = auto()
 
 @dataclass(frozen=True)
@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import List
+from typing import Callable, List, Optional
 from src.models.trade import Trade
 from datetime import datetime
 import logging
@@ -9,6 +9,9 @@ REQUIRED_COLUMNS = [
     "Symbol", "Price", "Time", "Order #", "Description", "Expiry", "Strike", "OptionType", "Side", "Quantity"
 ]
 
+# Rows parsed between progress callbacks
+PROGRESS_INTERVAL = 1000
+
 class CSVProcessor:
     """
     Handles loading, validating, and processing TastyTrade CSV files.
@@ -17,6 +20,13 @@ class CSVProcessor:
         self.csv_path = csv_path
         self.df = None
 
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, csv_path: str = None) -> 'CSVProcessor':
+        """Create a processor around an already-loaded DataFrame."""
+        processor = cls(csv_path)
+        processor.df = df
+        return processor
+
     def load_csv(self) -> pd.DataFrame:
         try:
             df = pd.read_csv(self.csv_path)
@@ -45,16 +55,24 @@ class CSVProcessor:
             return False
         return True
 
-    def to_trades(self) -> List[Trade]:
+    def to_trades(self, progress: Optional[Callable[[int, int], None]] = None) -> List[Trade]:
+        """
+        Parse the loaded rows into trades, skipping malformed rows.
+        ``progress(rows_parsed, total_rows)`` is called every PROGRESS_INTERVAL
+        rows and once at the end; an exception it raises aborts parsing.
+        """
         if self.df is None:
             self.load_csv()
+        total = len(self.df)
         trades = []
         order_ids = set()
         symbol_pattern = re.compile(r"^[A-Z]{1,5}$")
         # Accept timestamps with or without seconds
         time_formats = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"]
         
-        for idx, row in self.df.iterrows():
+        for parsed, (idx, row) in enumerate(self.df.iterrows()):
+            if progress is not None and parsed % PROGRESS_INTERVAL == 0 and parsed:
+                progress(parsed, total)
             try:
                 # Check for required fields in row
                 for col in REQUIRED_COLUMNS:
@@ -113,6 +131,8 @@ class CSVProcessor:
                 trades.append(trade)
             except Exception as e:
                 logging.warning(f"Skipping malformed row {idx}: {e}")
+        if progress is not None:
+            progress(total, total)
         return trades
 
     @staticmethod
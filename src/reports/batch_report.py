@@ -0,0 +1,89 @@
+import os
+import logging
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Any
+from src.models.position import Position
+from src.analytics.metrics_calculator import MetricsCalculator
+from src.insights.insight_generator import InsightGenerator
+from src.insights.reflection_engine import ReflectionEngine
+from src.reports.report_assembler import ReportAssembler
+from src.reports import report_templates as templates
+from src.utils.time_utils import to_timestamps
+
+REPORT_FILENAME = 'report.md'
+INDEX_FILENAME = 'index.md'
+
+def _render_month(month: str, positions: List[Position], output_dir: str, include_charts: bool) -> Dict[str, Any]:
+    """
+    Compute metrics and charts for one month and stream its report to disk.
+    Runs in a worker process; the Jinja templates are module-level, so each
+    worker compiles them once on import and reuses them for every month.
+    """
+    month_dir = os.path.join(output_dir, month)
+    os.makedirs(month_dir, exist_ok=True)
+    metrics = asdict(MetricsCalculator.calculate_all(positions))
+    charts_md = ''
+    if include_charts:
+        from src.visualizations.chart_coordinator import ChartCoordinator
+        charts = ChartCoordinator.generate_all_charts(MetricsCalculator.chart_series(positions), save_dir=month_dir)
+        charts_md = ChartCoordinator.charts_markdown(charts, base_dir=month_dir)
+    insights = InsightGenerator.generate_monthly_summary(metrics)
+    questions = ReflectionEngine.question_templates()
+    path = ReportAssembler.write_report(os.path.join(month_dir, REPORT_FILENAME), metrics, charts_md, insights, questions, [])
+    return {
+        'month': month,
+        'path': path,
+        'num_trades': metrics['num_trades'],
+        'total_pnl': round(metrics['total_pnl'] or 0.0, 2),
+        'win_rate': round(metrics['win_rate'] or 0.0, 2),
+    }
+
+class BatchReportGenerator:
+    """
+    Generates one report per calendar month, in parallel, plus an index page.
+    """
+    def __init__(self, output_dir: str, max_workers: Optional[int] = None, include_charts: bool = True, executor_cls=ProcessPoolExecutor):
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.include_charts = include_charts
+        self.executor_cls = executor_cls
+
+    @staticmethod
+    def partition_by_month(positions: List[Position]) -> Dict[str, List[Position]]:
+        """Group positions by the month of their entry using a single groupby."""
+        if not positions:
+            return {}
+        months = to_timestamps(p.entry_time() for p in positions).dt.strftime('%Y-%m')
+        undated = int(months.isna().sum())
+        if undated:
+            logging.warning(f"Skipping {undated} positions without a parseable entry time.")
+        groups = pd.DataFrame({'month': months}).groupby('month', sort=True).indices
+        return {month: [positions[i] for i in idx] for month, idx in groups.items()}
+
+    def generate(self, positions: List[Position]) -> Dict[str, str]:
+        """
+        Write a report for every month covered by ``positions`` and an index page.
+
+        Returns:
+            Mapping of month ("YYYY-MM") to report path, plus "index" for the index page.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        partitions = self.partition_by_month(positions)
+        rows = []
+        if partitions:
+            with self.executor_cls(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(_render_month, month, month_positions, self.output_dir, self.include_charts)
+                    for month, month_positions in partitions.items()
+                ]
+                rows = [f.result() for f in futures]
+        rows.sort(key=lambda r: r['month'])
+        for row in rows:
+            row['link'] = os.path.relpath(row['path'], self.output_dir)
+        index_path = os.path.join(self.output_dir, INDEX_FILENAME)
+        templates.INDEX_TEMPLATE.stream(months=rows).dump(index_path, encoding='utf-8')
+        paths = {row['month']: row['path'] for row in rows}
+        paths['index'] = index_path
+        return paths
@@ -0,0 +1,141 @@
+import os
+import re
+import base64
+import textwrap
+from typing import Dict, List
+from src.models.report_content import ReportContent
+from src.reports import report_templates as templates
+from src.reports.markdown_generator import MarkdownGenerator
+from src.reports.export_handler import ExportHandler
+
+EMBEDDED_IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\(data:image/(?P<ext>\w+);base64,(?P<data>[A-Za-z0-9+/=]+)\)')
+
+def externalize_charts(charts: Dict[str, str], assets_dir: str) -> Dict[str, str]:
+    """
+    Return chart name -> image file path, writing any embedded base64 images
+    out to ``assets_dir`` so reports can reference them as external files.
+    """
+    paths = {}
+    for name, chart in charts.items():
+        match = EMBEDDED_IMAGE_PATTERN.match(chart)
+        if match:
+            os.makedirs(assets_dir, exist_ok=True)
+            path = os.path.join(assets_dir, f"{name}.{match.group('ext')}")
+            with open(path, 'wb') as f:
+                f.write(base64.b64decode(match.group('data')))
+            paths[name] = path
+        else:
+            paths[name] = chart
+    return paths
+
+class MarkdownExporter:
+    """
+    Writes the markdown report, referencing chart files by relative path.
+    """
+    extension = 'md'
+
+    @staticmethod
+    def export(content: ReportContent, path: str) -> str:
+        from src.visualizations.chart_coordinator import ChartCoordinator
+        base_dir = os.path.dirname(os.path.abspath(path))
+        charts = externalize_charts(content.charts, os.path.join(base_dir, 'charts'))
+        charts_md = ChartCoordinator.charts_markdown({k: os.path.abspath(v) for k, v in charts.items()}, base_dir=base_dir)
+        chunks = MarkdownGenerator.stream_report(content.metrics, charts_md, content.insights, content.questions, content.action_items,
+                                                 content.group_summaries)
+        return ExportHandler.save_report_stream(chunks, path)
+
+class HTMLExporter:
+    """
+    Renders the report as a standalone HTML page with charts as external <img> files.
+    """
+    extension = 'html'
+
+    @staticmethod
+    def export(content: ReportContent, path: str) -> str:
+        from src.visualizations.chart_optimizer import ChartOptimizer
+        base_dir = os.path.dirname(os.path.abspath(path))
+        charts = externalize_charts(content.charts, os.path.join(base_dir, 'charts'))
+        chart_refs = [
+            {
+                'name': name,
+                'src': os.path.relpath(os.path.abspath(chart_path), base_dir).replace(os.sep, '/'),
+                'caption': ChartOptimizer.generate_caption(name, content.metrics),
+            }
+            for name, chart_path in charts.items()
+        ]
+        templates.HTML_REPORT_TEMPLATE.stream(
+            title=content.title,
+            metrics=content.metrics,
+            charts=chart_refs,
+            insights=content.insights or '',
+            group_summaries=content.group_summaries,
+            questions=content.questions,
+            action_items=content.action_items,
+        ).dump(path, encoding='utf-8')
+        return path
+
+class PDFExporter:
+    """
+    Renders the report as a PDF using matplotlib's PDF backend (no extra dependency).
+    Text sections go on the first pages, followed by one page per chart image.
+    """
+    extension = 'pdf'
+    PAGE_SIZE = (8.5, 11)
+    LINES_PER_PAGE = 60
+    WRAP_WIDTH = 95
+
+    @staticmethod
+    def text_lines(content: ReportContent) -> List[str]:
+        m = content.metrics
+        lines = [
+            content.title, '',
+            'Key Metrics Overview',
+            f"  Win Rate: {m.get('win_rate')}",
+            f"  Total PnL: {m.get('total_pnl')}",
+            f"  Time-Weighted Return: {m.get('time_weighted_return')}",
+            f"  Risk-Adjusted Return: {m.get('risk_adjusted_return')}",
+            '', 'Detailed Analysis Section',
+        ]
+        for paragraph in (content.insights or '').splitlines():
+            lines.extend(textwrap.wrap(paragraph, PDFExporter.WRAP_WIDTH) or [''])
+        if content.group_summaries:
+            lines.extend(['', 'Strategy Summaries'])
+            for name, summary in content.group_summaries.items():
+                lines.extend(textwrap.wrap(f"- {name}: {summary}", PDFExporter.WRAP_WIDTH, subsequent_indent='  '))
+        lines.extend(['', 'Monthly Reflection Questions'])
+        for q in content.questions:
+            lines.extend(textwrap.wrap(f"- {q}", PDFExporter.WRAP_WIDTH, subsequent_indent='  '))
+        lines.extend(['', 'Action Items and Improvement Areas'])
+        for item in content.action_items:
+            lines.extend(textwrap.wrap(f"- {item}", PDFExporter.WRAP_WIDTH, subsequent_indent='  '))
+        return lines
+
+    @staticmethod
+    def export(content: ReportContent, path: str) -> str:
+        # Object-oriented matplotlib API only: no pyplot global state, safe off the main thread
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_pdf import PdfPages
+        import matplotlib.image as mpimg
+        base_dir = os.path.dirname(os.path.abspath(path))
+        charts = externalize_charts(content.charts, os.path.join(base_dir, 'charts'))
+        lines = PDFExporter.text_lines(content)
+        step = PDFExporter.LINES_PER_PAGE
+        with PdfPages(path) as pdf:
+            for start in range(0, len(lines), step):
+                fig = Figure(figsize=PDFExporter.PAGE_SIZE)
+                fig.text(0.06, 0.96, '\n'.join(lines[start:start + step]), va='top', ha='left', family='monospace', fontsize=8)
+                pdf.savefig(fig)
+            for name, chart_path in charts.items():
+                fig = Figure(figsize=PDFExporter.PAGE_SIZE)
+                ax = fig.add_axes([0.05, 0.1, 0.9, 0.8])
+                ax.imshow(mpimg.imread(chart_path))
+                ax.set_axis_off()
+                ax.set_title(name)
+                pdf.savefig(fig)
+        return path
+
+EXPORTERS = {
+    'markdown': MarkdownExporter,
+    'html': HTMLExporter,
+    'pdf': PDFExporter,
+}
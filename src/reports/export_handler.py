@@ -1,5 +1,28 @@
 import os
-from typing import Optional
+import base64
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Iterable, Dict
+
+# Read size for streamed downloads; a multiple of 3 so base64 chunks concatenate cleanly
+DOWNLOAD_CHUNK_SIZE = 3 * 64 * 1024
+
+MIME_TYPES = {
+    '.md': 'text/markdown',
+    '.html': 'text/html',
+    '.pdf': 'application/pdf',
+}
+
+EXPORT_WORKERS = 2
+_export_executor: Optional[ThreadPoolExecutor] = None
+_export_executor_lock = threading.Lock()
+
+def _get_export_executor() -> ThreadPoolExecutor:
+    global _export_executor
+    with _export_executor_lock:
+        if _export_executor is None:
+            _export_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix='report-export')
+        return _export_executor
 
 class ExportHandler:
     """
@@ -11,12 +34,58 @@ class ExportHandler:
             f.write(markdown)
         return path
 
+    @staticmethod
+    def save_report_stream(chunks: Iterable[str], path: str) -> str:
+        """Write report chunks to ``path`` as they are produced."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return path
+
+    @staticmethod
+    def export_report(content, path: str, fmt: str = 'markdown') -> str:
+        """
+        Render ``content`` (a ReportContent) to ``path`` in the given format.
+
+        Raises:
+            ValueError: If the format is not one of markdown, html, pdf.
+        """
+        from src.reports.export_engines import EXPORTERS
+        if fmt not in EXPORTERS:
+            raise ValueError(f"Unsupported export format '{fmt}'. Supported formats: {list(EXPORTERS)}")
+        return EXPORTERS[fmt].export(content, path)
+
+    @staticmethod
+    def export_report_async(content, path: str, fmt: str = 'markdown') -> Future:
+        """Render a report on the background export worker; the Future resolves to the path."""
+        return _get_export_executor().submit(ExportHandler.export_report, content, path, fmt)
+
+    @staticmethod
+    def get_download_info(path: str, mime: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Describe a saved report so the UI can serve it straight from disk
+        (e.g. ``st.download_button(data=open(info['path'], 'rb'), ...)``).
+        """
+        if not os.path.exists(path):
+            return None
+        if mime is None:
+            mime = MIME_TYPES.get(os.path.splitext(path)[1].lower(), 'application/octet-stream')
+        return {
+            'path': path,
+            'file_name': os.path.basename(path),
+            'mime': mime,
+            'size': os.path.getsize(path),
+        }
+
     @staticmethod
     def get_download_link(path: str) -> Optional[str]:
         if not os.path.exists(path):
             return None
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        import base64
-        b64 = base64.b64encode(content.encode()).decode()
-        return f'<a href="data:text/markdown;base64,{b64}" download="report.md">Download Report</a>' 
\ No newline at end of file
+        parts = []
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                parts.append(base64.b64encode(chunk).decode('ascii'))
+        b64 = ''.join(parts)
+        mime = MIME_TYPES.get(os.path.splitext(path)[1].lower(), 'text/markdown')
+        file_name = os.path.basename(path)
+        return f'<a href="data:{mime};base64,{b64}" download="{file_name}">Download Report</a>'
@@ -0,0 +1,39 @@
+from typing import Dict, List, Tuple, Optional
+from src.reports.markdown_generator import MarkdownGenerator, SECTION_SEPARATOR
+from src.utils.fingerprint import fingerprint
+
+class IncrementalReportBuilder:
+    """
+    Rebuilds a markdown report, re-rendering only sections whose inputs changed.
+
+    Each section (metrics, charts, insights, strategies, reflection, actions) records a
+    fingerprint of its template context; unchanged sections are spliced in
+    from the cache. Keep one builder per report (e.g. in Streamlit session
+    state) so edit-and-preview loops only pay for what changed.
+    """
+    def __init__(self):
+        self._cache: Dict[str, Tuple[str, str]] = {}  # section -> (fingerprint, rendered text)
+        self.last_rendered: List[str] = []
+
+    def build(self, metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str],
+              group_summaries: Optional[Dict[str, str]] = None) -> str:
+        rendered = []
+        self.last_rendered = []
+        for name, template, context in MarkdownGenerator.sections(metrics, charts_md, insights, questions, action_items, group_summaries):
+            key = fingerprint(name, context)
+            cached = self._cache.get(name)
+            if cached is None or cached[0] != key:
+                cached = (key, template.render(**context))
+                self._cache[name] = cached
+                self.last_rendered.append(name)
+            rendered.append(cached[1])
+        return SECTION_SEPARATOR.join(rendered)
+
+    def section_fingerprint(self, name: str) -> Optional[str]:
+        cached = self._cache.get(name)
+        return cached[0] if cached else None
+
+    def invalidate(self, *names: str) -> None:
+        """Force the named sections (or all sections if none given) to re-render on the next build."""
+        for name in names or list(self._cache):
+            self._cache.pop(name, None)
@@ -1,16 +1,48 @@
-from typing import Dict, List
+from typing import Dict, List, Iterator, Optional, TextIO, Tuple, Any
+from jinja2 import Template
 from src.reports import report_templates as templates
 
+SECTION_SEPARATOR = '\n\n'
+
 class MarkdownGenerator:
     """
     Generates markdown reports for monthly trading summaries.
     """
     @staticmethod
-    def generate_report(metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str]) -> str:
-        md = []
-        md.append(templates.METRICS_TEMPLATE.render(**metrics))
-        md.append(templates.CHARTS_TEMPLATE.render(charts_md=charts_md))
-        md.append(templates.INSIGHTS_TEMPLATE.render(insights=insights))
-        md.append(templates.REFLECTION_TEMPLATE.render(questions=questions))
-        md.append(templates.ACTIONS_TEMPLATE.render(action_items=action_items))
-        return '\n\n'.join(md) 
\ No newline at end of file
+    def generate_report(metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str],
+                        group_summaries: Optional[Dict[str, str]] = None) -> str:
+        return ''.join(MarkdownGenerator.stream_report(metrics, charts_md, insights, questions, action_items, group_summaries))
+
+    @staticmethod
+    def sections(metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str],
+                 group_summaries: Optional[Dict[str, str]] = None) -> List[Tuple[str, Template, Dict[str, Any]]]:
+        """Return (name, template, context) for each report section, in report order."""
+        sections = [
+            ('metrics', templates.METRICS_TEMPLATE, metrics),
+            ('charts', templates.CHARTS_TEMPLATE, {'charts_md': charts_md}),
+            ('insights', templates.INSIGHTS_TEMPLATE, {'insights': insights}),
+        ]
+        if group_summaries:
+            sections.append(('strategies', templates.STRATEGY_SUMMARIES_TEMPLATE, {'group_summaries': group_summaries}))
+        sections += [
+            ('reflection', templates.REFLECTION_TEMPLATE, {'questions': questions}),
+            ('actions', templates.ACTIONS_TEMPLATE, {'action_items': action_items}),
+        ]
+        return sections
+
+    @staticmethod
+    def stream_report(metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str],
+                      group_summaries: Optional[Dict[str, str]] = None) -> Iterator[str]:
+        """Yield the report in chunks as each section template renders."""
+        sections = MarkdownGenerator.sections(metrics, charts_md, insights, questions, action_items, group_summaries)
+        for i, (_, template, context) in enumerate(sections):
+            if i:
+                yield SECTION_SEPARATOR
+            yield from template.generate(**context)
+
+    @staticmethod
+    def write_report(fh: TextIO, metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str],
+                     group_summaries: Optional[Dict[str, str]] = None) -> None:
+        """Write the report to an open text file handle without building it in memory."""
+        for chunk in MarkdownGenerator.stream_report(metrics, charts_md, insights, questions, action_items, group_summaries):
+            fh.write(chunk)
@@ -1,5 +1,6 @@
 from typing import Dict, List
 from src.reports.markdown_generator import MarkdownGenerator
+from src.reports.export_handler import ExportHandler
 
 class ReportAssembler:
     """
@@ -7,4 +8,10 @@ class ReportAssembler:
     """
     @staticmethod
     def assemble_report(metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str]) -> str:
-        return MarkdownGenerator.generate_report(metrics, charts_md, insights, questions, action_items) 
\ No newline at end of file
+        return MarkdownGenerator.generate_report(metrics, charts_md, insights, questions, action_items)
+
+    @staticmethod
+    def write_report(path: str, metrics: Dict, charts_md: str, insights: str, questions: List[str], action_items: List[str]) -> str:
+        """Stream the assembled report straight to ``path`` and return the path."""
+        chunks = MarkdownGenerator.stream_report(metrics, charts_md, insights, questions, action_items)
+        return ExportHandler.save_report_stream(chunks, path)
@@ -18,6 +18,12 @@ INSIGHTS_TEMPLATE = Template('''
 {{ insights }}
 ''')
 
+STRATEGY_SUMMARIES_TEMPLATE = Template('''
+## Strategy Summaries
+{% for name, summary in group_summaries.items() %}- **{{ name }}:** {{ summary }}
+{% endfor %}
+''')
+
 REFLECTION_TEMPLATE = Template('''
 ## Monthly Reflection Questions
 {% for q in questions %}- {{ q }}
@@ -28,4 +34,56 @@ ACTIONS_TEMPLATE = Template('''
 ## Action Items and Improvement Areas
 {% for item in action_items %}- {{ item }}
 {% endfor %}
-''') 
\ No newline at end of file
+''')
+
+INDEX_TEMPLATE = Template('''
+# Trading Journal Reports
+
+| Month | Trades | Total PnL | Win Rate | Report |
+|-------|--------|-----------|----------|--------|
+{% for row in months %}| {{ row.month }} | {{ row.num_trades }} | {{ row.total_pnl }} | {{ row.win_rate }} | [{{ row.month }}]({{ row.link }}) |
+{% endfor %}
+''')
+
+HTML_REPORT_TEMPLATE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ title }}</title>
+<style>
+body { font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; max-width: 960px; margin: 2em auto; padding: 0 1em; }
+figure { margin: 1em 0; }
+img { max-width: 100%; height: auto; }
+figcaption { color: #555; font-style: italic; }
+</style>
+</head>
+<body>
+<h1>{{ title }}</h1>
+<h2>Key Metrics Overview</h2>
+<ul>
+<li><strong>Win Rate:</strong> {{ metrics.win_rate }}</li>
+<li><strong>Total PnL:</strong> {{ metrics.total_pnl }}</li>
+<li><strong>Time-Weighted Return:</strong> {{ metrics.time_weighted_return }}</li>
+<li><strong>Risk-Adjusted Return:</strong> {{ metrics.risk_adjusted_return }}</li>
+</ul>
+<h2>Visual Section</h2>
+{% for chart in charts %}<figure><img src="{{ chart.src }}" alt="{{ chart.name }}" loading="lazy"><figcaption>{{ chart.caption }}</figcaption></figure>
+{% endfor %}
+<h2>Detailed Analysis Section</h2>
+{% for paragraph in insights.splitlines() if paragraph.strip() %}<p>{{ paragraph }}</p>
+{% endfor %}
+{% if group_summaries %}<h2>Strategy Summaries</h2>
+<ul>
+{% for name, summary in group_summaries.items() %}<li><strong>{{ name }}:</strong> {{ summary }}</li>
+{% endfor %}</ul>
+{% endif %}<h2>Monthly Reflection Questions</h2>
+<ul>
+{% for q in questions %}<li>{{ q }}</li>
+{% endfor %}</ul>
+<h2>Action Items and Improvement Areas</h2>
+<ul>
+{% for item in action_items %}<li>{{ item }}</li>
+{% endfor %}</ul>
+</body>
+</html>
+''', autoescape=True)
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional
+from src.storage.sqlite_store import TradeStore
+
+DEFAULT_PATHS = {'sqlite': 'data/journal.db', 'parquet': 'data/journal'}
+
+def open_store(settings: Optional[Dict[str, Any]] = None):
+    """
+    Open the trade journal configured by ``storage_settings``:
+    ``{"backend": "sqlite" | "parquet", "path": ...}`` (default: SQLite).
+    """
+    settings = settings or {}
+    backend = settings.get('backend', 'sqlite')
+    if backend not in DEFAULT_PATHS:
+        raise ValueError(f"Unsupported storage backend '{backend}'")
+    path = settings.get('path', DEFAULT_PATHS[backend])
+    if backend == 'parquet':
+        # pyarrow is only needed for the Parquet backend
+        from src.storage.parquet_store import ParquetTradeStore
+        return ParquetTradeStore(path)
+    return TradeStore(path)
+
+__all__ = ['TradeStore', 'open_store']
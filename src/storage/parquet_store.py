@@ -0,0 +1,285 @@
+import json
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from src.analyzers.trade_linker import TradeLinker
+from src.models.position import Position
+from src.models.trade import Trade
+from src.storage.sqlite_store import _time_bounds
+
+# Hive partition values cannot be empty, so the default account gets a name on disk
+DEFAULT_ACCOUNT = 'default'
+
+PARTITION_SCHEMA = pa.schema([('account', pa.string()), ('year', pa.int32()), ('month', pa.int32())])
+FILL_SCHEMA = pa.schema([
+    ('order_id', pa.string()), ('symbol', pa.string()), ('expiry', pa.string()), ('strike', pa.float64()),
+    ('option_type', pa.string()), ('side', pa.string()), ('quantity', pa.int64()), ('price', pa.float64()),
+    ('time', pa.string()),
+]).append(PARTITION_SCHEMA.field('account')).append(PARTITION_SCHEMA.field('year')).append(PARTITION_SCHEMA.field('month'))
+POSITION_SCHEMA = pa.schema([
+    ('symbol', pa.string()), ('expiry', pa.string()), ('strike', pa.float64()), ('option_type', pa.string()),
+    ('status', pa.string()), ('entry_time', pa.string()), ('exit_time', pa.string()), ('quantity', pa.int64()),
+    ('pnl', pa.float64()), ('holding_period', pa.float64()), ('time_weighted_return', pa.float64()),
+]).append(PARTITION_SCHEMA.field('account')).append(PARTITION_SCHEMA.field('year')).append(PARTITION_SCHEMA.field('month'))
+STRATEGY_SCHEMA = pa.schema([('order_id', pa.string()), ('strategy', pa.string()), ('account', pa.string())])
+
+TRADE_FIELDS = ['order_id', 'symbol', 'expiry', 'strike', 'option_type', 'side', 'quantity', 'price', 'time']
+CONTRACT_FIELDS = ['symbol', 'expiry', 'strike', 'option_type']
+
+def _account_dir(account: str) -> str:
+    return account or DEFAULT_ACCOUNT
+
+def _months_expr(start_month: Optional[Tuple[int, int]], end_month: Optional[Tuple[int, int]]) -> Optional[ds.Expression]:
+    """Partition filter for (year, month) in [start_month, end_month]."""
+    year, month = ds.field('year'), ds.field('month')
+    expr = None
+    if start_month:
+        y, m = start_month
+        expr = (year > y) | ((year == y) & (month >= m))
+    if end_month:
+        y, m = end_month
+        upper = (year < y) | ((year == y) & (month <= m))
+        expr = upper if expr is None else expr & upper
+    return expr
+
+def _and(*exprs: Optional[ds.Expression]) -> Optional[ds.Expression]:
+    result = None
+    for expr in exprs:
+        if expr is not None:
+            result = expr if result is None else result & expr
+    return result
+
+class ParquetTradeStore:
+    """
+    Trade journal stored as Hive-partitioned Parquet datasets
+    (``<root>/{fills,positions}/account=<a>/year=<y>/month=<m>/``).
+
+    Fills are partitioned by fill month and positions by entry month, so a
+    date-range read only opens the partitions it needs; symbol and time
+    filters are pushed down to row groups and only requested columns are
+    read. Same query API as TradeStore.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self.fills_dir = os.path.join(root, 'fills')
+        self.positions_dir = os.path.join(root, 'positions')
+        self.strategies_dir = os.path.join(root, 'strategies')
+        self.sync_cursors_path = os.path.join(root, 'sync_cursors.json')
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'ParquetTradeStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- reading -----------------------------------------------------------
+
+    def _dataset(self, path: str, schema: pa.Schema) -> Optional[ds.Dataset]:
+        if not os.path.isdir(path):
+            return None
+        partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+        return ds.dataset(path, schema=schema, format='parquet', partitioning=partitioning)
+
+    def _read(self, path: str, schema: pa.Schema, filter_expr: Optional[ds.Expression], columns: Optional[Sequence[str]]) -> pd.DataFrame:
+        dataset = self._dataset(path, schema)
+        if dataset is None:
+            return schema.empty_table().select(list(columns or schema.names)).to_pandas()
+        return dataset.to_table(columns=list(columns) if columns else None, filter=filter_expr).to_pandas()
+
+    @staticmethod
+    def _filter(start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None,
+                time_column: str = 'time') -> Optional[ds.Expression]:
+        lower, upper = _time_bounds(start, end)
+        start_month = (int(lower[:4]), int(lower[5:7])) if lower else None
+        # ``upper`` is exclusive (the day after ``end``), so take the month of ``end`` itself
+        end_month = None
+        if upper:
+            last = (pd.Timestamp(upper) - pd.Timedelta(days=1))
+            end_month = (last.year, last.month)
+        time = ds.field(time_column)
+        return _and(
+            ds.field('account') == _account_dir(account) if account is not None else None,
+            _months_expr(start_month, end_month),
+            time >= lower if lower else None,
+            time < upper if upper else None,
+            ds.field('symbol').isin(list(symbols)) if symbols else None,
+        )
+
+    def fills_frame(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None,
+                    columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Fills with a time in [start, end] (dates, inclusive), reading only ``columns``."""
+        frame = self._read(self.fills_dir, FILL_SCHEMA, self._filter(start, end, symbols, account), columns)
+        return frame.sort_values('time', kind='stable', ignore_index=True) if 'time' in frame else frame
+
+    def load_fills(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None) -> List[Trade]:
+        frame = self.fills_frame(start, end, symbols, account, columns=TRADE_FIELDS)
+        return [Trade(*row) for row in frame.itertuples(index=False, name=None)]
+
+    def positions_frame(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None,
+                        columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Stored position rows entered in [start, end], without their fills."""
+        frame = self._read(self.positions_dir, POSITION_SCHEMA, self._filter(start, end, symbols, account, 'entry_time'), columns)
+        return frame.sort_values('entry_time', kind='stable', ignore_index=True) if 'entry_time' in frame else frame
+
+    def load_positions(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None) -> List[Position]:
+        """Positions entered in [start, end] with their fills attached (fills may predate ``start``)."""
+        rows = self.positions_frame(start, end, symbols, account)
+        if rows.empty:
+            return []
+        # Fetch fills for just these contracts: symbol pushdown, then an exact contract join
+        fills = self._read(self.fills_dir, FILL_SCHEMA, self._filter(symbols=rows['symbol'].unique().tolist(), account=account), None)
+        fills = fills.merge(rows[['account'] + CONTRACT_FIELDS], on=['account'] + CONTRACT_FIELDS).sort_values('time', kind='stable')
+        trades_by_contract: Dict[tuple, List[Trade]] = {}
+        for record in fills[['account'] + TRADE_FIELDS].itertuples(index=False, name=None):
+            trade = Trade(*record[1:])
+            trades_by_contract.setdefault((record[0], trade.symbol, trade.expiry, trade.strike, trade.option_type), []).append(trade)
+        positions = []
+        for row in rows.itertuples(index=False):
+            trades = trades_by_contract.get((row.account, row.symbol, row.expiry, row.strike, row.option_type), [])
+            positions.append(Position(
+                entry_trades=[t for t in trades if t.side.upper() in ('BTO', 'STO')],
+                exit_trades=[t for t in trades if t.side.upper() in ('BTC', 'STC')],
+                status=row.status,
+                pnl=None if pd.isna(row.pnl) else row.pnl,
+                holding_period=None if pd.isna(row.holding_period) else row.holding_period,
+                time_weighted_return=None if pd.isna(row.time_weighted_return) else row.time_weighted_return,
+            ))
+        return positions
+
+    def load_strategies(self, account: Optional[str] = None) -> Dict[str, str]:
+        frame = self._read(self.strategies_dir, STRATEGY_SCHEMA, self._filter(account=account), ['order_id', 'strategy'])
+        return dict(zip(frame['order_id'], frame['strategy']))
+
+    def date_range(self, account: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        times = self.fills_frame(account=account, columns=['time'])['time']
+        return (times.min(), times.max()) if not times.empty else (None, None)
+
+    def _sync_cursors(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.sync_cursors_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def load_sync_cursor(self, account: str = '') -> Optional[Dict[str, str]]:
+        return self._sync_cursors().get(_account_dir(account))
+
+    # -- writing -----------------------------------------------------------
+
+    def _write_partitions(self, path: str, schema: pa.Schema, frame: pd.DataFrame, months: Set[Tuple[int, int]], account: str) -> None:
+        """Replace the given (year, month) partitions of ``account`` with the matching rows of ``frame``."""
+        table = pa.Table.from_pandas(frame[schema.names], schema=schema, preserve_index=False)
+        if table.num_rows:
+            ds.write_dataset(
+                table, path, format='parquet',
+                partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+                existing_data_behavior='delete_matching',
+                basename_template='part-{i}.parquet',
+            )
+        written = set(zip(frame['year'], frame['month']))
+        for year, month in months - written:
+            shutil.rmtree(os.path.join(path, f'account={account}', f'year={year}', f'month={month}'), ignore_errors=True)
+
+    @staticmethod
+    def _with_month(frame: pd.DataFrame, time_column: str, account: str) -> pd.DataFrame:
+        frame['account'] = account
+        frame['year'] = frame[time_column].str.slice(0, 4).astype('int32')
+        frame['month'] = frame[time_column].str.slice(5, 7).astype('int32')
+        return frame
+
+    def _month_filter(self, months: Iterable[Tuple[int, int]]) -> Optional[ds.Expression]:
+        expr = None
+        for year, month in months:
+            term = (ds.field('year') == year) & (ds.field('month') == month)
+            expr = term if expr is None else expr | term
+        return expr
+
+    def upsert_fills(self, trades: Iterable[Trade], account: str = '') -> int:
+        """Merge fills into their month partitions, replacing existing fills with the same order number."""
+        account = _account_dir(account)
+        new = self._with_month(pd.DataFrame(
+            [(t.order_id, t.symbol, str(t.expiry), float(t.strike), t.option_type, t.side, int(t.quantity), float(t.price), str(t.time))
+             for t in trades],
+            columns=TRADE_FIELDS,
+        ), 'time', account)
+        if new.empty:
+            return 0
+        # A re-imported fill may have moved month; rewrite every partition holding one of its order numbers
+        index = self._read(self.fills_dir, FILL_SCHEMA, ds.field('account') == account, ['order_id', 'year', 'month'])
+        moved = index[index['order_id'].isin(new['order_id'])]
+        months = set(zip(new['year'], new['month'])) | set(zip(moved['year'], moved['month']))
+        existing = self._read(self.fills_dir, FILL_SCHEMA, _and(ds.field('account') == account, self._month_filter(months)), None)
+        merged = pd.concat([existing, new], ignore_index=True).drop_duplicates('order_id', keep='last')
+        self._write_partitions(self.fills_dir, FILL_SCHEMA, merged, months, account)
+        return len(new)
+
+    def save_sync_cursor(self, cursor: Dict[str, str], account: str = '') -> None:
+        cursors = self._sync_cursors()
+        cursors[_account_dir(account)] = {'last_order_id': cursor.get('last_order_id'),
+                                          'last_timestamp': cursor.get('last_timestamp')}
+        os.makedirs(self.root, exist_ok=True)
+        # Write then rename, so a crash mid-write never leaves a truncated cursor file
+        tmp_path = self.sync_cursors_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(cursors, f)
+        os.replace(tmp_path, self.sync_cursors_path)
+
+    def upsert_strategies(self, strategies: Dict[str, str], account: str = '') -> int:
+        account = _account_dir(account)
+        existing = self._read(self.strategies_dir, STRATEGY_SCHEMA, ds.field('account') == account, ['order_id', 'strategy'])
+        new = pd.DataFrame(list(strategies.items()), columns=['order_id', 'strategy'])
+        merged = pd.concat([existing, new], ignore_index=True).drop_duplicates('order_id', keep='last')
+        merged['account'] = account
+        ds.write_dataset(
+            pa.Table.from_pandas(merged[STRATEGY_SCHEMA.names], schema=STRATEGY_SCHEMA, preserve_index=False),
+            self.strategies_dir, format='parquet',
+            partitioning=ds.partitioning(pa.schema([STRATEGY_SCHEMA.field('account')]), flavor='hive'),
+            existing_data_behavior='delete_matching', basename_template='part-{i}.parquet',
+        )
+        return len(strategies)
+
+    def import_trades(self, trades: List[Trade], strategies: Optional[Dict[str, str]] = None, account: str = '') -> int:
+        """
+        Upsert fills and re-link the positions of every contract they touch.
+        Returns the number of positions rebuilt.
+        """
+        self.upsert_fills(trades, account)
+        if strategies:
+            self.upsert_strategies(strategies, account)
+        contracts = {(t.symbol, str(t.expiry), float(t.strike), t.option_type) for t in trades}
+        return self.rebuild_positions(contracts, account)
+
+    def rebuild_positions(self, contracts: Iterable[Tuple[str, str, float, str]], account: str = '') -> int:
+        account = _account_dir(account)
+        touched = pd.DataFrame(list(contracts), columns=CONTRACT_FIELDS)
+        if touched.empty:
+            return 0
+        symbols = touched['symbol'].unique().tolist()
+        fills = self._read(self.fills_dir, FILL_SCHEMA, self._filter(symbols=symbols, account=account), TRADE_FIELDS)
+        fills = fills.merge(touched, on=CONTRACT_FIELDS).sort_values('time', kind='stable')
+        linked = TradeLinker.link_trades([Trade(*row) for row in fills[TRADE_FIELDS].itertuples(index=False, name=None)])
+        new = self._with_month(pd.DataFrame([self._position_row(p) for p in linked], columns=POSITION_SCHEMA.names[:-3]), 'entry_time', account)
+        # Positions are small: read the account's rows, swap the touched contracts and rewrite affected months
+        existing = self._read(self.positions_dir, POSITION_SCHEMA, ds.field('account') == account, None)
+        is_touched = existing[CONTRACT_FIELDS].merge(touched.drop_duplicates(), how='left', indicator=True)['_merge'].eq('both').to_numpy()
+        months = set(zip(existing.loc[is_touched, 'year'], existing.loc[is_touched, 'month'])) | set(zip(new['year'], new['month']))
+        in_months = pd.Series(list(zip(existing['year'], existing['month'])), dtype=object).isin(months).to_numpy() if len(existing) else is_touched
+        kept = existing[~is_touched & in_months]
+        self._write_partitions(self.positions_dir, POSITION_SCHEMA, pd.concat([kept, new], ignore_index=True), months, account)
+        return len(linked)
+
+    @staticmethod
+    def _position_row(position: Position) -> tuple:
+        first = (position.entry_trades or position.exit_trades)[0]
+        return (
+            first.symbol, str(first.expiry), float(first.strike), first.option_type, position.status,
+            position.entry_time(), position.exit_time(),
+            sum(abs(t.quantity or 0) for t in position.entry_trades),
+            position.pnl, position.holding_period, position.time_weighted_return,
+        )
@@ -0,0 +1,269 @@
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+from src.analyzers.trade_linker import TradeLinker
+from src.models.position import Position
+from src.models.trade import Trade
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fills (
+    account     TEXT NOT NULL DEFAULT '',
+    order_id    TEXT NOT NULL,
+    symbol      TEXT NOT NULL,
+    expiry      TEXT NOT NULL,
+    strike      REAL NOT NULL,
+    option_type TEXT NOT NULL,
+    side        TEXT NOT NULL,
+    quantity    INTEGER NOT NULL,
+    price       REAL NOT NULL,
+    time        TEXT NOT NULL,
+    PRIMARY KEY (account, order_id)
+);
+CREATE INDEX IF NOT EXISTS idx_fills_contract ON fills (symbol, expiry, strike, option_type);
+CREATE INDEX IF NOT EXISTS idx_fills_order ON fills (order_id);
+CREATE INDEX IF NOT EXISTS idx_fills_time ON fills (time);
+
+CREATE TABLE IF NOT EXISTS positions (
+    account              TEXT NOT NULL DEFAULT '',
+    symbol               TEXT NOT NULL,
+    expiry               TEXT NOT NULL,
+    strike               REAL NOT NULL,
+    option_type          TEXT NOT NULL,
+    status               TEXT NOT NULL,
+    entry_time           TEXT,
+    exit_time            TEXT,
+    quantity             INTEGER NOT NULL,
+    pnl                  REAL,
+    holding_period       REAL,
+    time_weighted_return REAL,
+    PRIMARY KEY (account, symbol, expiry, strike, option_type)
+);
+CREATE INDEX IF NOT EXISTS idx_positions_entry_time ON positions (entry_time);
+
+CREATE TABLE IF NOT EXISTS strategies (
+    account  TEXT NOT NULL DEFAULT '',
+    order_id TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    PRIMARY KEY (account, order_id)
+);
+
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    account        TEXT PRIMARY KEY,
+    last_order_id  TEXT,
+    last_timestamp TEXT
+);
+"""
+
+FILL_COLUMNS = ('account', 'order_id', 'symbol', 'expiry', 'strike', 'option_type', 'side', 'quantity', 'price', 'time')
+
+def _time_bounds(start, end) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Convert inclusive date bounds into string bounds for the ISO time columns:
+    ``time >= lower`` and ``time < upper`` (the day after ``end``).
+    """
+    def as_date(value):
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.fromisoformat(str(value)).date()
+    start, end = as_date(start), as_date(end)
+    lower = start.isoformat() if start else None
+    upper = (end + timedelta(days=1)).isoformat() if end else None
+    return lower, upper
+
+class TradeStore:
+    """
+    Persistent trade journal backed by SQLite.
+
+    Fills are upserted by (account, order number). Positions are derived
+    data: after each import the contracts touched by the new fills are
+    re-linked from every stored fill, so history spread over several CSVs
+    links the same way as a single upload.
+    """
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        # One connection shared by the Streamlit script thread and background jobs
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'TradeStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def upsert_fills(self, trades: Iterable[Trade], account: str = '') -> int:
+        """Insert or update fills in one transaction. Returns the number of rows written."""
+        rows = [
+            (account, t.order_id, t.symbol, str(t.expiry), float(t.strike), t.option_type, t.side,
+             int(t.quantity), float(t.price), str(t.time))
+            for t in trades
+        ]
+        updates = ', '.join(f'{c} = excluded.{c}' for c in FILL_COLUMNS[2:])
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO fills ({', '.join(FILL_COLUMNS)}) VALUES ({', '.join('?' * len(FILL_COLUMNS))}) "
+                f"ON CONFLICT (account, order_id) DO UPDATE SET {updates}",
+                rows,
+            )
+        return len(rows)
+
+    def upsert_strategies(self, strategies: Dict[str, str], account: str = '') -> int:
+        """Store detected strategy names keyed by order number."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO strategies (account, order_id, strategy) VALUES (?, ?, ?) "
+                "ON CONFLICT (account, order_id) DO UPDATE SET strategy = excluded.strategy",
+                [(account, order_id, name) for order_id, name in strategies.items()],
+            )
+        return len(strategies)
+
+    def import_trades(self, trades: List[Trade], strategies: Optional[Dict[str, str]] = None, account: str = '') -> int:
+        """
+        Upsert fills (e.g. from CSVProcessor.to_trades) and re-link the
+        positions of every contract they touch. Returns the number of positions rebuilt.
+        """
+        self.upsert_fills(trades, account)
+        if strategies:
+            self.upsert_strategies(strategies, account)
+        contracts = {(t.symbol, str(t.expiry), float(t.strike), t.option_type) for t in trades}
+        return self.rebuild_positions(contracts, account)
+
+    def rebuild_positions(self, contracts: Iterable[Tuple[str, str, float, str]], account: str = '') -> int:
+        contracts = list(contracts)
+        if not contracts:
+            return 0
+        with self._lock, self._conn:
+            self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS touched (symbol TEXT, expiry TEXT, strike REAL, option_type TEXT)')
+            self._conn.execute('DELETE FROM touched')
+            self._conn.executemany('INSERT INTO touched VALUES (?, ?, ?, ?)', contracts)
+            fills = self._conn.execute(
+                f"SELECT {', '.join(FILL_COLUMNS[1:])} FROM fills JOIN touched USING (symbol, expiry, strike, option_type) "
+                "WHERE fills.account = ? ORDER BY time", (account,)
+            ).fetchall()
+            positions = TradeLinker.link_trades([Trade(*row) for row in fills])
+            self._conn.execute(
+                "DELETE FROM positions WHERE account = ? AND (symbol, expiry, strike, option_type) IN (SELECT * FROM touched)",
+                (account,),
+            )
+            self._conn.executemany(
+                "INSERT INTO positions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._position_row(p, account) for p in positions],
+            )
+        return len(positions)
+
+    @staticmethod
+    def _position_row(position: Position, account: str) -> tuple:
+        first = (position.entry_trades or position.exit_trades)[0]
+        return (
+            account, first.symbol, str(first.expiry), float(first.strike), first.option_type, position.status,
+            position.entry_time(), position.exit_time(),
+            sum(abs(t.quantity or 0) for t in position.entry_trades),
+            position.pnl, position.holding_period, position.time_weighted_return,
+        )
+
+    @staticmethod
+    def _where(start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None,
+               time_column: str = 'time', table: str = '') -> Tuple[str, list]:
+        prefix = f'{table}.' if table else ''
+        time_column = prefix + time_column
+        clauses, params = [], []
+        lower, upper = _time_bounds(start, end)
+        if lower:
+            clauses.append(f'{time_column} >= ?')
+            params.append(lower)
+        if upper:
+            clauses.append(f'{time_column} < ?')
+            params.append(upper)
+        if symbols:
+            clauses.append(f"{prefix}symbol IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if account is not None:
+            clauses.append(f'{prefix}account = ?')
+            params.append(account)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def load_fills(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None) -> List[Trade]:
+        """Fills with a time in [start, end] (dates, inclusive), oldest first."""
+        where, params = self._where(start, end, symbols, account)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(FILL_COLUMNS[1:])} FROM fills{where} ORDER BY time", params).fetchall()
+        return [Trade(*row) for row in rows]
+
+    def fills_frame(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None) -> pd.DataFrame:
+        where, params = self._where(start, end, symbols, account)
+        with self._lock:
+            return pd.read_sql_query(f"SELECT * FROM fills{where} ORDER BY time", self._conn, params=params)
+
+    def positions_frame(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None) -> pd.DataFrame:
+        """Stored position rows entered in [start, end], without their fills."""
+        where, params = self._where(start, end, symbols, account, time_column='entry_time')
+        with self._lock:
+            return pd.read_sql_query(f"SELECT * FROM positions{where} ORDER BY entry_time", self._conn, params=params)
+
+    def load_positions(self, start=None, end=None, symbols: Optional[Sequence[str]] = None, account: Optional[str] = None) -> List[Position]:
+        """
+        Positions entered in [start, end], with their fills attached, ready for
+        MetricsCalculator.calculate_all / chart_series.
+        """
+        where, params = self._where(start, end, symbols, account, time_column='entry_time', table='p')
+        query = (
+            f"SELECT p.account, p.symbol, p.expiry, p.strike, p.option_type, p.status, p.pnl, p.holding_period, "
+            f"p.time_weighted_return, {', '.join('f.' + c for c in FILL_COLUMNS[1:])} "
+            "FROM positions p JOIN fills f ON f.account = p.account AND f.symbol = p.symbol AND f.expiry = p.expiry "
+            f"AND f.strike = p.strike AND f.option_type = p.option_type{where} "
+            "ORDER BY p.entry_time, f.time"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        positions: Dict[tuple, Position] = {}
+        for row in rows:
+            key = row[:5]
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = Position(entry_trades=[], exit_trades=[], status=row[5], pnl=row[6],
+                                                     holding_period=row[7], time_weighted_return=row[8])
+            trade = Trade(*row[9:])
+            (position.entry_trades if trade.side.upper() in ('BTO', 'STO') else position.exit_trades).append(trade)
+        return list(positions.values())
+
+    def load_strategies(self, account: Optional[str] = None) -> Dict[str, str]:
+        where, params = self._where(account=account)
+        with self._lock:
+            return dict(self._conn.execute(f"SELECT order_id, strategy FROM strategies{where}", params).fetchall())
+
+    def date_range(self, account: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Earliest and latest fill times in the store."""
+        where, params = self._where(account=account)
+        with self._lock:
+            return tuple(self._conn.execute(f"SELECT MIN(time), MAX(time) FROM fills{where}", params).fetchone())
+
+    def load_sync_cursor(self, account: str = '') -> Optional[Dict[str, str]]:
+        """Where the last broker sync of ``account`` stopped (``last_order_id``, ``last_timestamp``), if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_order_id, last_timestamp FROM sync_cursors WHERE account = ?", (account,)
+            ).fetchone()
+        return {'last_order_id': row[0], 'last_timestamp': row[1]} if row else None
+
+    def save_sync_cursor(self, cursor: Dict[str, str], account: str = '') -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_cursors (account, last_order_id, last_timestamp) VALUES (?, ?, ?) "
+                "ON CONFLICT (account) DO UPDATE SET last_order_id = excluded.last_order_id, "
+                "last_timestamp = excluded.last_timestamp",
+                (account, cursor.get('last_order_id'), cursor.get('last_timestamp')),
+            )
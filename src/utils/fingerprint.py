@@ -0,0 +1,32 @@
+import hashlib
+import json
+from dataclasses import is_dataclass, asdict
+from datetime import date, datetime
+from enum import Enum
+
+def _encode(obj):
+    """JSON fallback for the value types that flow through the pipeline."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {'__type__': type(obj).__name__, **asdict(obj)}
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if isinstance(obj, bytes):
+        return hashlib.sha256(obj).hexdigest()
+    module = type(obj).__module__
+    if module.startswith('pandas'):
+        import pandas as pd
+        if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+            hashed = pd.util.hash_pandas_object(obj, index=not isinstance(obj, pd.Index)).values
+            return {'__pandas__': list(map(str, getattr(obj, 'columns', []))), 'hash': hashlib.sha256(hashed.tobytes()).hexdigest()}
+    if module.startswith('numpy'):
+        return obj.tolist()
+    return repr(obj)
+
+def fingerprint(*parts) -> str:
+    """Return a stable SHA-256 hex digest of the given values."""
+    payload = json.dumps(parts, sort_keys=True, default=_encode, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
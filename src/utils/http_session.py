@@ -0,0 +1,43 @@
+from typing import Collection, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Throttling and transient server errors worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def build_session(pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                  backoff_jitter: float = 0.25, allowed_methods: Optional[Collection[str]] = None,
+                  headers: Optional[dict] = None) -> requests.Session:
+    """
+    Pooled keep-alive session with retries.
+
+    Connections to each host are reused (up to ``pool_size`` kept open), and
+    connection errors and RETRY_STATUSES responses are retried up to
+    ``max_retries`` times with exponential backoff plus random jitter,
+    honouring Retry-After. After the last attempt the final response is
+    returned as-is, so callers still see it through raise_for_status().
+
+    Args:
+        pool_size: Connections kept alive per host
+        max_retries: Retries after the first attempt (0 disables retrying)
+        backoff_factor: Base delay; attempt n waits backoff_factor * 2 ** (n - 1) seconds
+        backoff_jitter: Maximum random seconds added to each backoff
+        allowed_methods: Methods that may be retried (default: urllib3's idempotent set, which excludes POST)
+        headers: Default headers for every request
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(m.upper() for m in allowed_methods) if allowed_methods else Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+
+@dataclass
+class TablePage:
+    """One page of a filtered and sorted table."""
+    rows: pd.DataFrame
+    page: int
+    page_size: int
+    total_rows: int
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.total_rows // self.page_size))
+
+    @property
+    def start(self) -> int:
+        return min((self.page - 1) * self.page_size, self.total_rows)
+
+    @property
+    def end(self) -> int:
+        return min(self.start + self.page_size, self.total_rows)
+
+def row_order(df: pd.DataFrame, sort_by: Optional[str] = None, ascending: bool = True,
+              query: Optional[str] = None, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Positions of the rows matching ``query`` (case-insensitive substring over
+    ``columns``, default all), in ``sort_by`` order. Works on row positions so
+    the frame itself is never copied or reordered.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if query:
+        matches = np.zeros(len(df), dtype=bool)
+        for col in columns or df.columns:
+            matches |= df[col].astype(str).str.contains(query, case=False, regex=False).to_numpy(dtype=bool)
+        mask &= matches
+    positions = np.flatnonzero(mask)
+    if sort_by is not None:
+        keys = df[sort_by].iloc[positions].reset_index(drop=True)
+        # Stable sort keeps ties in their original order; missing values go last
+        try:
+            order = keys.sort_values(ascending=ascending, kind='stable', na_position='last').index
+        except TypeError:
+            # Mixed-type object columns: fall back to comparing their text
+            order = keys.astype(str).sort_values(ascending=ascending, kind='stable').index
+        positions = positions[order.to_numpy()]
+    return positions
+
+def paginate_frame(df: pd.DataFrame, page: int = 1, page_size: int = 50, sort_by: Optional[str] = None,
+                   ascending: bool = True, query: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+                   order: Optional[np.ndarray] = None) -> TablePage:
+    """
+    Filter, sort and slice ``df`` down to one page. Only the page's rows are
+    materialised. ``order`` may be a precomputed result of ``row_order``;
+    out-of-range pages are clamped to the last page.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if order is None:
+        order = row_order(df, sort_by, ascending, query, columns)
+    total = len(order)
+    page_count = max(1, -(-total // page_size))
+    page = min(max(int(page), 1), page_count)
+    start = (page - 1) * page_size
+    return TablePage(rows=df.iloc[order[start:start + page_size]], page=page, page_size=page_size, total_rows=total)
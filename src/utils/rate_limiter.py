@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter with burst capacity.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each acquire reserves its tokens immediately (the balance may go
+    negative) and then waits out the deficit, so concurrent callers are
+    served in arrival order without re-checking in a loop. The same bucket
+    can be used from threads (``acquire``) and coroutines (``acquire_async``).
+    """
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = clock()
+
+    @classmethod
+    def per_minute(cls, requests: float, capacity: float = 1.0, **kwargs) -> 'TokenBucket':
+        return cls(requests / 60.0, capacity, **kwargs)
+
+    @contextmanager
+    def _state(self):
+        """Hold exclusive access to the balance, refilled up to now."""
+        with self._lock:
+            self._refill(self._clock())
+            yield
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = max(self._updated, now)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` now and return how many seconds the caller must wait before using them."""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        with self._state():
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` only if they are available right now."""
+        with self._state():
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0, sleep: Callable[[float], None] = time.sleep) -> float:
+        """Block until ``tokens`` are available. Returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait:
+            sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Await until ``tokens`` are available without blocking the event loop."""
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def available(self) -> float:
+        with self._state():
+            return self._tokens
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose balance lives in a small file guarded by an exclusive
+    ``flock``, so every process pointing at the same path shares one budget
+    (e.g. several Streamlit sessions or batch workers on one machine).
+    Uses wall-clock time, which unlike the monotonic clock is comparable
+    across processes. POSIX only.
+    """
+    def __init__(self, path: str, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.time):
+        import fcntl  # Not available on Windows; only needed for cross-process limits
+        self._fcntl = fcntl
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        super().__init__(rate, capacity, clock)
+
+    @contextmanager
+    def _state(self):
+        with self._lock, open(self.path, 'a+') as f:
+            self._fcntl.flock(f, self._fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    saved = json.loads(raw) if raw else None
+                except ValueError:
+                    saved = None
+                now = self._clock()
+                self._tokens, self._updated = (saved['tokens'], saved['updated']) if saved else (self.capacity, now)
+                self._refill(now)
+                yield
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({'tokens': self._tokens, 'updated': self._updated}))
+                f.flush()
+            finally:
+                self._fcntl.flock(f, self._fcntl.LOCK_UN)
+
+_shared: Dict[Tuple, TokenBucket] = {}
+_shared_lock = threading.Lock()
+
+def shared_bucket(key: Hashable, rate: float, capacity: float = 1.0, lock_dir: Optional[str] = None) -> TokenBucket:
+    """
+    Process-wide bucket for one provider quota, so every client instance
+    (and thread) calling that provider draws from the same budget.
+
+    ``key`` identifies the quota (provider and endpoint). The first caller
+    for a key fixes its rate and capacity; later callers asking for other
+    values share that bucket anyway, with a warning, so the quota is never
+    split into several independent budgets.
+
+    With ``lock_dir`` (default: the RATE_LIMIT_DIR environment variable) the
+    budget is also shared with other processes through a FileTokenBucket.
+    """
+    lock_dir = lock_dir or os.getenv("RATE_LIMIT_DIR")
+    registry_key = (key, lock_dir)
+    with _shared_lock:
+        bucket = _shared.get(registry_key)
+        if bucket is None:
+            if lock_dir:
+                name = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:16]
+                bucket = FileTokenBucket(os.path.join(lock_dir, f'{name}.bucket'), rate, capacity)
+            else:
+                bucket = TokenBucket(rate, capacity)
+            _shared[registry_key] = bucket
+        elif (bucket.rate, bucket.capacity) != (rate, capacity):
+            logging.warning(
+                f"Rate limit for {key!r} already set to {bucket.rate:g}/s (burst {bucket.capacity:g}); "
+                f"ignoring {rate:g}/s (burst {capacity:g})"
+            )
+        return bucket
+
+def reset_shared() -> None:
+    """Forget every shared bucket (each client then starts with a full budget)."""
+    with _shared_lock:
+        _shared.clear()
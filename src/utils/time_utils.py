@@ -0,0 +1,20 @@
+from datetime import date, timedelta
+from typing import Iterable, Optional, Tuple
+import pandas as pd
+
+def to_timestamps(values: Iterable) -> pd.Series:
+    """
+    Vectorised parse of trade timestamps.
+
+    Accepts datetime objects and the ISO-like strings produced by CSVProcessor
+    ("YYYY-MM-DD HH:MM" or "YYYY-MM-DD HH:MM:SS"). Unparseable values become NaT.
+    """
+    series = pd.Series(list(values), dtype=object)
+    if series.empty:
+        return pd.Series([], dtype='datetime64[ns]')
+    return pd.to_datetime(series, errors='coerce', format='ISO8601')
+
+def lookback_range(days: int, today: Optional[date] = None) -> Tuple[date, date]:
+    """Inclusive (start, end) dates covering the last ``days`` days up to ``today``."""
+    end = today or date.today()
+    return end - timedelta(days=days), end
@@ -1,22 +1,39 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Standardized chart style
-sns.set_theme(style="whitegrid")
-
 CHART_SIZE = (10, 6)
 CHART_DPI = 120
-CHART_COLORS = sns.color_palette("Set2")
+CHART_PALETTE = "Set2"
+
+# matplotlib/seaborn are imported on first use so that importing the
+# visualizations package does not pay for the plotting stack.
+_style_applied = False
+
+def get_chart_colors():
+    import seaborn as sns
+    return sns.color_palette(CHART_PALETTE)
+
+def __getattr__(name):
+    # Backward compatibility for the former module-level constant
+    if name == "CHART_COLORS":
+        return get_chart_colors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Apply global matplotlib settings (once per process)
+def apply_chart_style(force: bool = False):
+    global _style_applied
+    if _style_applied and not force:
+        return
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-# Apply global matplotlib settings
-def apply_chart_style():
+    # Standardized chart style
+    sns.set_theme(style="whitegrid")
     plt.rcParams["figure.figsize"] = CHART_SIZE
     plt.rcParams["figure.dpi"] = CHART_DPI
-    plt.rcParams["axes.prop_cycle"] = plt.cycler(color=CHART_COLORS)
+    plt.rcParams["axes.prop_cycle"] = plt.cycler(color=get_chart_colors())
     plt.rcParams["axes.titlesize"] = 16
     plt.rcParams["axes.labelsize"] = 14
     plt.rcParams["xtick.labelsize"] = 12
     plt.rcParams["ytick.labelsize"] = 12
     plt.rcParams["legend.fontsize"] = 12
     plt.rcParams["legend.frameon"] = True
-    plt.rcParams["axes.grid"] = True 
\ No newline at end of file
+    plt.rcParams["axes.grid"] = True
+    _style_applied = True
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from src.visualizations.chart_generator import ChartGenerator
+from src.visualizations.chart_optimizer import ChartOptimizer
 
 class ChartCoordinator:
     """
@@ -14,4 +15,20 @@ class ChartCoordinator:
         charts['dte'] = ChartGenerator.dte_chart(analytics.get('dte_buckets', {}), save_path=(f"{save_dir}/dte.png" if save_dir else None))
         charts['position_sizing'] = ChartGenerator.position_sizing_chart(analytics.get('position_sizes', []), save_path=(f"{save_dir}/position_sizing.png" if save_dir else None))
         charts['comparison'] = ChartGenerator.comparison_chart(analytics.get('comparison_data', {}), save_path=(f"{save_dir}/comparison.png" if save_dir else None))
-        return charts 
\ No newline at end of file
+        return charts
+
+    @staticmethod
+    def charts_markdown(charts: Dict[str, str], base_dir: str = None) -> str:
+        """Render chart references (file paths or embedded images) as captioned markdown."""
+        import os
+        lines = []
+        for name, chart in charts.items():
+            caption = ChartOptimizer.generate_caption(name, {})
+            if chart.startswith('!['):
+                lines.append(chart)
+            else:
+                ref = os.path.relpath(chart, base_dir) if base_dir else chart
+                lines.append(f'![{name}]({ref})')
+            lines.append(f'*{caption}*')
+            lines.append('')
+        return '\n'.join(lines)
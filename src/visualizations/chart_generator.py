@@ -1,17 +1,25 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import List, Dict, Any
 from src.visualizations.chart_config import apply_chart_style
 import io
 import base64
 
+def _pyplot():
+    # Deferred import: matplotlib is only loaded once a chart is drawn
+    import matplotlib.pyplot as plt
+    apply_chart_style()
+    return plt
+
+def _seaborn():
+    import seaborn as sns
+    return sns
+
 class ChartGenerator:
     """
     Generates charts for trading analytics and reporting.
     """
     @staticmethod
     def cumulative_pnl_chart(pnls: List[float], save_path: str = None) -> str:
-        apply_chart_style()
+        plt = _pyplot()
         cum_pnl = [sum(pnls[:i+1]) for i in range(len(pnls))]
         plt.figure()
         plt.plot(cum_pnl, marker='o')
@@ -23,7 +31,7 @@ class ChartGenerator:
 
     @staticmethod
     def win_loss_ratio_chart(win_loss: List[bool], save_path: str = None) -> str:
-        apply_chart_style()
+        plt = _pyplot()
         win_count = sum(win_loss)
         loss_count = len(win_loss) - win_count
         plt.figure()
@@ -35,11 +43,11 @@ class ChartGenerator:
 
     @staticmethod
     def strategy_performance_chart(strategy_pnls: Dict[str, float], save_path: str = None) -> str:
-        apply_chart_style()
+        plt = _pyplot()
         plt.figure()
         strategies = list(strategy_pnls.keys())
         pnls = list(strategy_pnls.values())
-        sns.barplot(x=strategies, y=pnls)
+        _seaborn().barplot(x=strategies, y=pnls)
         plt.title("Strategy Performance")
         plt.xlabel("Strategy")
         plt.ylabel("Total PnL")
@@ -48,11 +56,11 @@ class ChartGenerator:
 
     @staticmethod
     def dte_chart(dte_buckets: Dict[str, float], save_path: str = None) -> str:
-        apply_chart_style()
+        plt = _pyplot()
         plt.figure()
         buckets = list(dte_buckets.keys())
         returns = list(dte_buckets.values())
-        sns.barplot(x=buckets, y=returns)
+        _seaborn().barplot(x=buckets, y=returns)
         plt.title("Time-Weighted Return by DTE Bucket")
         plt.xlabel("DTE Range (days)")
         plt.ylabel("Return")
@@ -61,9 +69,9 @@ class ChartGenerator:
 
     @staticmethod
     def position_sizing_chart(sizes: List[float], save_path: str = None) -> str:
-        apply_chart_style()
+        plt = _pyplot()
         plt.figure()
-        sns.histplot(sizes, bins=10, kde=True)
+        _seaborn().histplot(sizes, bins=10, kde=True)
         plt.title("Position Sizing Distribution")
         plt.xlabel("Position Size")
         plt.ylabel("Frequency")
@@ -72,7 +80,7 @@ class ChartGenerator:
 
     @staticmethod
     def comparison_chart(data: Dict[str, List[float]], save_path: str = None) -> str:
-        apply_chart_style()
+        plt = _pyplot()
         plt.figure()
         for label, values in data.items():
             plt.plot(values, label=label)
@@ -85,6 +93,7 @@ class ChartGenerator:
 
     @staticmethod
     def _save_or_embed(save_path: str = None) -> str:
+        plt = _pyplot()
         buf = io.BytesIO()
         plt.savefig(buf, format='png', bbox_inches='tight')
         plt.close()
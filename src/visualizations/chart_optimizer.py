@@ -1,5 +1,4 @@
 from typing import List, Dict
-import matplotlib.pyplot as plt
 import io
 import base64
 
@@ -1,8 +1,28 @@
 import pytest
 import requests_mock
+from src.utils.rate_limiter import reset_shared
 
 @pytest.fixture
 def mock_requests():
     """Provides a requests-mock fixture for testing HTTP requests."""
     with requests_mock.Mocker() as m:
-        yield m
\ No newline at end of file
+        yield m
+
+class FakeClock:
+    """Monotonic clock stand-in; tests move time by setting ``now``."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    """Give every test its own per-endpoint request budget."""
+    reset_shared()
+    yield
+    reset_shared()
@@ -0,0 +1,69 @@
+"""
+Import-time benchmark for the Trading Journal application.
+
+Runs each module import in a fresh interpreter with ``python -X importtime`` and
+reports the cumulative import time, plus which heavy dependencies were loaded.
+Ingestion-only paths should not pull in matplotlib, seaborn, scipy or openai.
+
+Usage:
+    python tests/performance/benchmark_import_time.py [module ...]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_MODULES = [
+    "src.processors.csv_processor",
+    "src.processors.duplicate_detector",
+    "src.analyzers.trade_linker",
+    "src.analytics.metrics_calculator",
+    "src.analytics.advanced_analyzer",
+    "src.llm.openai_client",
+    "src.insights.reflection_engine",
+    "src.visualizations.chart_config",
+    "src.visualizations.chart_coordinator",
+    "src.reports.report_assembler",
+]
+
+HEAVY_DEPENDENCIES = ["matplotlib", "seaborn", "scipy", "openai"]
+
+def measure_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and return timing and loaded heavy packages."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or parts[2].strip() != module:
+            continue
+        cumulative_us = int(parts[1].strip())
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return {"module": module, "cumulative_ms": cumulative_us / 1000, "heavy_loaded": loaded}
+
+def main(modules=None):
+    results = [measure_import(m) for m in (modules or DEFAULT_MODULES)]
+    width = max(len(r["module"]) for r in results)
+    print(f"{'module'.ljust(width)}  {'import (ms)':>12}  heavy dependencies loaded")
+    for r in results:
+        heavy = ", ".join(r["heavy_loaded"]) or "-"
+        print(f"{r['module'].ljust(width)}  {r['cumulative_ms']:>12.1f}  {heavy}")
+    return results
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or None)
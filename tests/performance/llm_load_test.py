@@ -0,0 +1,177 @@
+"""
+Load test for the LLM clients against the local stub server.
+
+Sends ``--requests`` calls at ``--concurrency`` through OpenAIClient (plain and
+streaming), AsyncOpenAIClient, LLMAnalysisService and ReflectionEngine, and
+reports throughput and latency percentiles for each. Use it to tune pooling,
+caching and rate limits offline.
+
+Usage:
+    python -m tests.performance.llm_load_test --requests 200 --concurrency 16 \\
+        --latency lognormal:0.2:0.5 --throttle-rate 0.05 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from src.insights.reflection_engine import ReflectionEngine
+from src.llm.async_openai_client import AsyncOpenAIClient
+from src.llm.llm_analysis_service import LLMAnalysisService
+from src.llm.openai_client import OpenAIClient, is_llm_error
+from src.llm.response_cache import ResponseCache
+from src.utils.rate_limiter import reset_shared
+from tests.performance.stub_llm_server import StubLLMServer, parse_latency
+
+# High enough that the client-side limiter does not throttle unless asked to
+UNLIMITED_RPM = 1_000_000
+
+@dataclass
+class LoadResult:
+    """Latencies (seconds) of successful calls and the error count for one scenario."""
+    name: str
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return float('nan')
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    def row(self) -> str:
+        return (f"{self.name:<22} {self.requests:>8} {self.errors:>7} {self.throughput:>9.1f} "
+                f"{self.percentile(50) * 1000:>9.1f} {self.percentile(95) * 1000:>9.1f} {self.percentile(99) * 1000:>9.1f}")
+
+HEADER = f"{'scenario':<22} {'requests':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+
+def run_load(name: str, call: Callable[[int], Any], requests: int, concurrency: int) -> LoadResult:
+    """
+    Run ``call(i)`` for i in range(requests) on ``concurrency`` threads. A call
+    fails when it raises or returns the LLM error text. One untimed call first
+    pays for lazy imports and client creation.
+    """
+    def timed(i: int):
+        start = time.perf_counter()
+        try:
+            result = call(i)
+        except Exception:
+            return None
+        if isinstance(result, str) and is_llm_error(result):
+            return None
+        return time.perf_counter() - start
+
+    timed(requests)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed, range(requests)))
+    result = LoadResult(name, time.perf_counter() - start)
+    for latency in outcomes:
+        if latency is None:
+            result.errors += 1
+        else:
+            result.latencies.append(latency)
+    return result
+
+def run_async_load(name: str, client: AsyncOpenAIClient, prompts: Dict[str, str]) -> LoadResult:
+    """Send every prompt through AsyncOpenAIClient, timing each from the start of the batch."""
+    result = LoadResult(name, 0.0)
+
+    async def collect():
+        start = time.perf_counter()
+        async for _, text in client.iter_completions(prompts):
+            if is_llm_error(text):
+                result.errors += 1
+            else:
+                result.latencies.append(time.perf_counter() - start)
+        result.elapsed = time.perf_counter() - start
+
+    asyncio.run(collect())
+    return result
+
+def metrics_for(i: int, unique: bool) -> Dict[str, Any]:
+    # Distinct metrics per request defeat the response cache unless reuse is being measured
+    seed = i if unique else 0
+    return {'win_rate': 0.5 + (seed % 50) / 100, 'total_pnl': 1000 + seed,
+            'time_weighted_return': 0.1, 'risk_adjusted_return': 1.2}
+
+def run_scenarios(server: StubLLMServer, requests: int, concurrency: int, cache: bool = False,
+                  rate_limit: int = UNLIMITED_RPM, scenarios: Optional[List[str]] = None) -> List[LoadResult]:
+    """Run each named scenario (default: all) against ``server`` and return their results."""
+    reset_shared()
+    unique = not cache
+
+    def with_cache(client):
+        # Set explicitly so LLM_CACHE_PATH in the environment does not skew the run
+        client.cache = ResponseCache() if cache else None
+        return client
+
+    def openai_client() -> OpenAIClient:
+        return with_cache(OpenAIClient(api_key="stub", api_base=server.base_url, rate_limit=rate_limit))
+
+    def streamed(client: OpenAIClient, i: int) -> str:
+        return ''.join(client.stream_openai(f"Analyze run {i if unique else 0}"))
+
+    builders: Dict[str, Callable[[], LoadResult]] = {
+        'openai_client': lambda: run_load(
+            'openai_client', lambda i, c=openai_client(): c.generate_performance_analysis(metrics_for(i, unique)),
+            requests, concurrency),
+        'openai_stream': lambda: run_load(
+            'openai_stream', lambda i, c=openai_client(): streamed(c, i), requests, concurrency),
+        'async_openai_client': lambda: run_async_load(
+            'async_openai_client',
+            with_cache(AsyncOpenAIClient(api_key="stub", api_base=server.base_url, rate_limit=rate_limit,
+                                         max_concurrency=concurrency)),
+            {str(i): f"Analyze run {i if unique else 0}" for i in range(requests)}),
+        'llm_analysis_service': lambda: run_load(
+            'llm_analysis_service',
+            lambda i, s=with_cache(LLMAnalysisService(server.base_url + '/analysis', rate_limit=rate_limit,
+                                                      burst=concurrency, pool_size=concurrency)):
+                s.analyze_trades({'run': i if unique else 0, 'pnl': [10, -5, 20]}),
+            requests, concurrency),
+        'reflection_engine': lambda: run_load(
+            'reflection_engine',
+            lambda i, c=openai_client(): ReflectionEngine.generate_questions(metrics_for(i, unique), c),
+            requests, concurrency),
+    }
+    return [builders[name]() for name in (scenarios or list(builders))]
+
+def main(argv=None) -> List[LoadResult]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', default='lognormal:0.1:0.5',
+                        help='seconds, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='seconds between streamed chunks')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--max-in-flight', type=int, default=None)
+    parser.add_argument('--rate-limit', type=int, default=UNLIMITED_RPM, help='client requests per minute')
+    parser.add_argument('--cache', action='store_true', help='repeat prompts through an in-memory response cache')
+    parser.add_argument('--scenario', action='append', dest='scenarios')
+    args = parser.parse_args(argv)
+
+    with StubLLMServer(latency=parse_latency(args.latency), error_rate=args.error_rate,
+                       throttle_rate=args.throttle_rate, max_in_flight=args.max_in_flight,
+                       token_delay=args.token_delay) as server:
+        results = run_scenarios(server, args.requests, args.concurrency, cache=args.cache,
+                                rate_limit=args.rate_limit, scenarios=args.scenarios)
+        print(HEADER)
+        for result in results:
+            print(result.row())
+        print(f"server: {dict(server.stats)}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Local stand-in for an OpenAI-compatible LLM server (LM Studio, OpenAI).
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream=True`` server-sent
+events) plus ``POST /v1/analysis`` in the flat JSON format LLMAnalysisService
+expects, with configurable latency, error rate and 429 throttling, so the LLM
+path can be load tested without a GPU or network.
+
+Usage:
+    with StubLLMServer(latency=lognormal(0.2, 0.5), throttle_rate=0.05) as server:
+        client = OpenAIClient(api_key="stub", api_base=server.base_url)
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator, Optional
+
+# A latency distribution draws seconds to wait from the server's random generator
+Latency = Callable[[random.Random], float]
+
+def constant(seconds: float) -> Latency:
+    return lambda rng: seconds
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+def lognormal(median: float, sigma: float) -> Latency:
+    """Long-tailed latency: half the requests take less than ``median`` seconds."""
+    return lambda rng: rng.lognormvariate(0.0, sigma) * median
+
+def parse_latency(spec: str) -> Latency:
+    """``"0.2"``, ``"uniform:0.1:0.5"`` or ``"lognormal:0.2:0.5"`` (median, sigma)."""
+    kind, _, args = spec.partition(':')
+    if not args:
+        return constant(float(kind))
+    values = [float(v) for v in args.split(':')]
+    return {'constant': constant, 'uniform': uniform, 'lognormal': lognormal}[kind](*values)
+
+REPORT_SECTIONS = {
+    "analysis": "Win rate held steady while average losses shrank.",
+    "questions": ["Which setups produced the largest winners?", "Where did you size up after a loss?"],
+    "action_items": ["Keep position size fixed for the next 20 trades"],
+}
+
+def completion_text(prompt: str, response_format: Optional[dict]) -> str:
+    """Plausible reply for the prompts this app sends."""
+    if response_format and response_format.get('type') == 'json_schema':
+        name = response_format.get('json_schema', {}).get('name')
+        return json.dumps(REPORT_SECTIONS if name == 'report_sections' else {"groups": []})
+    if 'reflection questions' in prompt:
+        return "\n".join(REPORT_SECTIONS["questions"])
+    return f"Stub analysis of a {len(prompt)} character prompt. " + REPORT_SECTIONS["analysis"]
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.stub.count('connections')
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        stub = self.server.stub
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        with stub.in_flight():
+            status = stub.draw_status()
+            if status == 429:
+                return self._send_json(429, {"error": {"message": "Rate limit reached"}},
+                                       {'Retry-After': f"{stub.retry_after:g}"})
+            time.sleep(stub.draw_latency())
+            if status != 200:
+                return self._send_json(status, {"error": {"message": "Injected server error"}})
+            prompt = (request.get('messages') or [{}])[-1].get('content', '')
+            text = completion_text(prompt, request.get('response_format'))
+            if self.path.rstrip('/').endswith('/analysis'):
+                return self._send_json(200, {"analysis": text, "questions": REPORT_SECTIONS["questions"],
+                                             "sentiment": {}})
+            if request.get('stream'):
+                return self._stream(request, text)
+            self._send_json(200, {
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+                "model": request.get('model', 'stub'),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4,
+                          "total_tokens": (len(prompt) + len(text)) // 4},
+            })
+
+    def _stream(self, request: dict, text: str):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def event(delta: dict, finish_reason=None):
+            chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": request.get('model', 'stub'),
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+
+        event({"role": "assistant"})
+        for word in text.split(' '):
+            time.sleep(self.server.stub.token_delay)
+            event({"content": word + ' '})
+        event({}, finish_reason="stop")
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: str):
+        payload = data.encode()
+        self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+        self.wfile.flush()
+
+class StubLLMServer:
+    """
+    OpenAI-compatible server on a background thread.
+
+    Args:
+        latency: Delay before each reply (see constant, uniform, lognormal)
+        error_rate: Fraction of requests answered with a 500
+        throttle_rate: Fraction of requests answered with a 429
+        max_in_flight: Requests beyond this many concurrent ones get a 429 (None: unlimited)
+        retry_after: Retry-After seconds sent with 429 responses
+        token_delay: Delay between streamed chunks
+        seed: Seed for latency and error draws
+    """
+    def __init__(self, latency: Latency = constant(0.0), error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 max_in_flight: Optional[int] = None, retry_after: float = 0.0, token_delay: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.token_delay = token_delay
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """``/v1`` base URL for OpenAI clients."""
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        with self._lock:
+            self._in_flight += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def draw_status(self) -> int:
+        with self._lock:
+            self.stats['requests'] += 1
+            draw = self._rng.random()
+            if (self.max_in_flight is not None and self._in_flight > self.max_in_flight) or draw < self.throttle_rate:
+                status = 429
+            elif draw < self.throttle_rate + self.error_rate:
+                status = 500
+            else:
+                status = 200
+            self.stats[status] += 1
+            return status
+
+    def draw_latency(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency(self._rng))
+
+    def start(self) -> 'StubLLMServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'StubLLMServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,38 @@
+"""Offline load tests of the LLM clients against the stub OpenAI-compatible server."""
+
+import pytest
+from src.llm.openai_client import OpenAIClient
+from src.utils.rate_limiter import reset_shared
+from tests.performance.llm_load_test import run_scenarios
+from tests.performance.stub_llm_server import StubLLMServer, constant
+
+@pytest.fixture
+def server():
+    reset_shared()
+    with StubLLMServer(latency=constant(0.05)) as server:
+        yield server
+
+@pytest.mark.performance
+def test_stub_serves_plain_and_streamed_completions(server):
+    client = OpenAIClient(api_key="stub", api_base=server.base_url)
+    plain = client._call_openai("Analyze run 1")
+    streamed = ''.join(client.stream_openai("Analyze run 1"))
+    assert plain.startswith("Stub analysis")
+    assert streamed.strip() == plain
+
+@pytest.mark.performance
+def test_concurrent_clients_overlap_requests(server):
+    results = run_scenarios(server, requests=16, concurrency=8)
+    for result in results:
+        assert result.errors == 0, result.name
+        # Eight at a time should take about two server latencies, far less than 16 in sequence
+        assert result.elapsed < 16 * 0.05, result.name
+    assert server.stats['peak_in_flight'] > 1
+
+@pytest.mark.performance
+def test_throttled_requests_are_retried():
+    reset_shared()
+    with StubLLMServer(throttle_rate=0.15, seed=1) as server:
+        [result] = run_scenarios(server, requests=30, concurrency=4, scenarios=['llm_analysis_service'])
+    assert server.stats[429] > 0
+    assert result.errors == 0
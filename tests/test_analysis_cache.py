@@ -0,0 +1,87 @@
+import io
+from datetime import date
+from unittest.mock import patch
+import pytest
+from src.app import analysis_cache, main_controller
+from src.app.main_controller import MainController
+
+CSV = b"""Symbol,Price,Time,Order #,Description,Expiry,Strike,OptionType,Side,Quantity
+AAPL,2.5,2024-07-01 09:30,1,-1 Jul 19 18d 150 Call STO,2024-07-19,150.0,Call,STO,1
+AAPL,1.0,2024-07-10 10:00,2,1 Jul 19 9d 150 Call BTC,2024-07-19,150.0,Call,BTC,1
+MSFT,1.8,2024-08-01 10:00,3,1 Aug 19 18d 300 Put BTO,2024-08-19,300.0,Put,BTO,2
+"""
+
+class FakeUpload(io.BytesIO):
+    pass
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    analysis_cache.cached_ingest.clear()
+    analysis_cache.cached_metrics.clear()
+    yield
+
+def counting(monkeypatch, name):
+    calls = []
+    original = getattr(main_controller, name)
+    def wrapper(*args, **kwargs):
+        calls.append(name)
+        return original(*args, **kwargs)
+    monkeypatch.setattr(main_controller, name, wrapper)
+    return calls
+
+def test_ingest_cached_by_content_hash(monkeypatch):
+    calls = counting(monkeypatch, 'trades_stage')
+    key = MainController.content_key(FakeUpload(CSV))
+    first = analysis_cache.cached_ingest(key, CSV)
+    second = analysis_cache.cached_ingest(key, CSV)
+    assert calls == ['trades_stage']
+    assert len(first['positions']) == len(second['positions']) == 2
+    assert set(first) == set(analysis_cache.INGEST_STAGES)
+
+def test_date_range_change_only_refilters(tmp_path, monkeypatch):
+    trades_calls = counting(monkeypatch, 'trades_stage')
+    controller = MainController(output_dir=str(tmp_path), config={'export_settings': {'include_charts': False, 'include_llm_insights': False}})
+    upload = FakeUpload(CSV)
+    key = analysis_cache.prepare_controller(controller, upload, date(2024, 7, 1), date(2024, 7, 31))
+    assert controller.process_csv(upload, content_key=key)
+    assert controller.analyze_trades()
+    assert controller.state['analysis']['num_trades'] == 1
+    controller.pipeline.executed.clear()
+
+    analysis_cache.prepare_controller(controller, upload, date(2024, 7, 1), date(2024, 8, 31))
+    assert controller.process_csv(upload, content_key=key)
+    assert controller.analyze_trades()
+    assert controller.state['analysis']['num_trades'] == 2
+    assert controller.pipeline.executed == []
+    assert trades_calls == ['trades_stage']
+
+class SessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+def test_session_controller_reused():
+    with patch.object(analysis_cache.st, 'session_state', SessionState()):
+        config = {'export_settings': {'include_llm_insights': False}}
+        first = analysis_cache.session_controller(config)
+        assert analysis_cache.session_controller(config) is first
+        assert first.llm_client is None
+
+def test_session_controllers_share_stage_pools():
+    config = {'export_settings': {'include_llm_insights': False}}
+    controllers = []
+    for _ in range(2):
+        with patch.object(analysis_cache.st, 'session_state', SessionState()):
+            controllers.append(analysis_cache.session_controller(config))
+    first, second = (c._executors() for c in controllers)
+    assert first == second == {'insights': analysis_cache.shared_llm_executor(),
+                               'charts': analysis_cache.shared_chart_executor()}
+    controllers[0].close()
+    assert not analysis_cache.shared_llm_executor()._shutdown
+
+def test_broken_shared_chart_pool_replaced_once():
+    broken = analysis_cache.shared_chart_executor()
+    assert broken._mp_context.get_start_method() == 'spawn'
+    replacement = analysis_cache.replace_shared_chart_executor(broken)
+    assert replacement is not broken
+    assert analysis_cache.replace_shared_chart_executor(broken) is replacement
+    assert analysis_cache.shared_chart_executor() is replacement
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from src.app.main_controller import MainController
+from src.llm.async_openai_client import AsyncOpenAIClient
+from src.llm.response_cache import ResponseCache
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv")
+
+def fake_create(delays, in_flight):
+    """Async chat.completions.create whose latency depends on the prompt."""
+    async def create(model, messages, max_tokens, **kwargs):
+        prompt = messages[0]['content']
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(delays.get(prompt, 0.05))
+        in_flight['now'] -= 1
+        if prompt == 'fail':
+            raise RuntimeError('boom')
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=f' answer to {prompt} '))])
+    return create
+
+def make_client(mock_async, delays=None, **kwargs):
+    in_flight = {'now': 0, 'max': 0}
+    mock_async.return_value.chat.completions.create = fake_create(delays or {}, in_flight)
+    mock_async.return_value.close = MagicMock(side_effect=lambda: asyncio.sleep(0))
+    kwargs.setdefault('rate_limit', 60000)
+    return AsyncOpenAIClient(api_key='test-key', **kwargs), in_flight
+
+@patch('openai.AsyncOpenAI')
+def test_prompts_run_concurrently(mock_async):
+    client, _ = make_client(mock_async, {p: 0.2 for p in 'abc'})
+    start = time.perf_counter()
+    results = client.complete_all({'x': 'a', 'y': 'b', 'z': 'c'})
+    assert time.perf_counter() - start < 0.5
+    assert results == {'x': 'answer to a', 'y': 'answer to b', 'z': 'answer to c'}
+
+@patch('openai.AsyncOpenAI')
+def test_results_arrive_in_completion_order(mock_async):
+    client, _ = make_client(mock_async, {'slow': 0.2, 'fast': 0.01})
+    order = []
+    results = client.complete_all({'first': 'slow', 'second': 'fast'}, on_result=lambda name, text: order.append(name))
+    assert order == ['second', 'first']
+    assert list(results) == ['first', 'second']
+
+@patch('openai.AsyncOpenAI')
+def test_concurrency_is_bounded(mock_async):
+    client, in_flight = make_client(mock_async, max_concurrency=2)
+    client.complete_all({str(i): f'p{i}' for i in range(6)})
+    assert in_flight['max'] == 2
+
+@patch('openai.AsyncOpenAI')
+def test_rate_limit_paces_requests(mock_async):
+    # 600/min = one every 0.1s after a burst of 1
+    client, _ = make_client(mock_async, {p: 0 for p in 'abc'}, rate_limit=600, burst=1)
+    start = time.perf_counter()
+    client.complete_all({'x': 'a', 'y': 'b', 'z': 'c'})
+    assert time.perf_counter() - start >= 0.18
+
+@patch('openai.AsyncOpenAI')
+def test_errors_are_returned_as_text(mock_async):
+    client, _ = make_client(mock_async)
+    results = client.complete_all({'bad': 'fail', 'good': 'ok'})
+    assert 'boom' in results['bad']
+    assert results['good'] == 'answer to ok'
+
+@patch('openai.AsyncOpenAI')
+def test_cached_prompts_skip_the_model(mock_async):
+    cache = ResponseCache()
+    client, _ = make_client(mock_async, cache=cache)
+    client.complete_all({'x': 'a'})
+    mock_async.return_value.chat.completions.create = MagicMock(side_effect=AssertionError('model called'))
+    assert client.complete_all({'x': 'a'}) == {'x': 'answer to a'}
+
+def test_controller_uses_concurrent_path(tmp_path):
+    class DummyAsyncLLM:
+        def __init__(self):
+            self.batches = []
+        def complete_all(self, prompts):
+            self.batches.append(sorted(prompts))
+            return {'insights': 'LLM analysis', 'questions': 'Q1?\nQ2?'}
+    llm = DummyAsyncLLM()
+    controller = MainController(output_dir=str(tmp_path), llm_client=llm,
+                                config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(SAMPLE_CSV)
+    assert controller.analyze_trades()
+    assert controller.generate_llm_insights()
+    assert llm.batches == [['insights', 'questions']]
+    assert controller.state['llm']['questions'] == ['Q1?', 'Q2?']
+
+@patch('openai.AsyncOpenAI')
+def test_on_delta_streams_partial_text(mock_async):
+    async def stream(*texts):
+        for text in texts:
+            await asyncio.sleep(0)
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+    async def create(model, messages, max_tokens, **kwargs):
+        assert kwargs['stream']
+        return stream('Hel', 'lo')
+
+    mock_async.return_value.chat.completions.create = create
+    mock_async.return_value.close = MagicMock(side_effect=lambda: asyncio.sleep(0))
+    client = AsyncOpenAIClient(api_key='test-key', rate_limit=60000)
+    deltas = []
+    results = client.complete_all({'x': 'a'}, on_delta=lambda name, text: deltas.append((name, text)))
+    assert deltas == [('x', 'Hel'), ('x', 'Hello')]
+    assert results == {'x': 'Hello'}
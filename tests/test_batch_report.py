@@ -0,0 +1,43 @@
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from src.models.trade import Trade
+from src.models.position import Position
+from src.reports.batch_report import BatchReportGenerator
+
+def make_position(symbol, entry, exit_, pnl):
+    t_in = Trade("1", symbol, "2024-12-20", 100.0, "Call", "BTO", 1, 1.0, entry)
+    t_out = Trade("2", symbol, "2024-12-20", 100.0, "Call", "STC", 1, 1.0 + pnl, exit_)
+    return Position(entry_trades=[t_in], exit_trades=[t_out], status='closed', pnl=pnl, holding_period=1.0)
+
+POSITIONS = [
+    make_position("AAPL", "2024-01-03 10:00", "2024-01-05 10:00", 50.0),
+    make_position("MSFT", datetime(2024, 1, 20, 9, 30), datetime(2024, 2, 1, 9, 30), -20.0),
+    make_position("AAPL", "2024-02-10 10:00:00", "2024-02-12 10:00:00", 30.0),
+    make_position("IBIT", "2024-03-01 10:00", "2024-03-02 10:00", 10.0),
+]
+
+def test_partition_by_month():
+    parts = BatchReportGenerator.partition_by_month(POSITIONS)
+    assert list(parts) == ["2024-01", "2024-02", "2024-03"]
+    assert len(parts["2024-01"]) == 2
+    assert parts["2024-02"][0] is POSITIONS[2]
+    assert BatchReportGenerator.partition_by_month([]) == {}
+
+def test_generate_without_charts(tmp_path):
+    gen = BatchReportGenerator(str(tmp_path), max_workers=2, include_charts=False, executor_cls=ThreadPoolExecutor)
+    paths = gen.generate(POSITIONS)
+    assert set(paths) == {"2024-01", "2024-02", "2024-03", "index"}
+    jan = open(paths["2024-01"], encoding="utf-8").read()
+    assert "Key Metrics Overview" in jan
+    assert "Total PnL:** 30.0" in jan
+    index = open(paths["index"], encoding="utf-8").read()
+    assert "[2024-02](2024-02/report.md)" in index
+    assert index.index("2024-01") < index.index("2024-03")
+
+def test_generate_with_charts_in_worker_processes(tmp_path):
+    gen = BatchReportGenerator(str(tmp_path), max_workers=2)
+    paths = gen.generate(POSITIONS[:2])
+    assert os.path.exists(tmp_path / "2024-01" / "cumulative_pnl.png")
+    report = open(paths["2024-01"], encoding="utf-8").read()
+    assert "![cumulative_pnl](cumulative_pnl.png)" in report
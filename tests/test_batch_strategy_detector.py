@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from src.analyzers.batch_strategy_detector import BatchStrategyDetector, LEG_COLUMNS
+from src.analyzers.strategy_detector import StrategyDetector
+from src.models.strategy_components import StrategyLeg, StrategyPattern
+
+ORDERS = {
+    'condor': [('SPY', 'Aug 15', 400, 'Put', 'Buy', 1), ('SPY', 'Aug 15', 410, 'Put', 'Sell', -1),
+               ('SPY', 'Aug 15', 430, 'Call', 'Sell', -1), ('SPY', 'Aug 15', 440, 'Call', 'Buy', 1)],
+    'fly': [('SPY', 'Aug 15', 420, 'Call', 'Buy', 1), ('SPY', 'Aug 15', 410, 'Call', 'Sell', -2), ('SPY', 'Aug 15', 400, 'Call', 'Buy', 1)],
+    'iron_fly': [('SPY', 'Aug 15', 400, 'Put', 'Buy', 1), ('SPY', 'Aug 15', 410, 'Put', 'Sell', -1),
+                 ('SPY', 'Aug 15', 410, 'Call', 'Sell', -1), ('SPY', 'Aug 15', 420, 'Call', 'Buy', 1)],
+    'calendar': [('SPY', 'Aug 15', 400, 'Call', 'Sell', -1), ('SPY', 'Sep 19', 400, 'Call', 'Buy', 1)],
+    'ratio': [('SPY', 'Aug 15', 400, 'Put', 'Buy', 1), ('SPY', 'Aug 15', 390, 'Put', 'Sell', -2)],
+    'vertical': [('SPY', 'Aug 15', 400, 'Call', 'Buy', 2), ('SPY', 'Aug 15', 405, 'Call', 'Sell', -2)],
+    'straddle': [('SPY', 'Aug 15', 400, 'Call', 'Sell', -1), ('SPY', 'Aug 15', 400, 'Put', 'Sell', -1)],
+    'strangle': [('SPY', 'Aug 15', 390, 'Put', 'Sell', -1), ('SPY', 'Aug 15', 410, 'Call', 'Sell', -1)],
+    'single': [('SPY', 'Aug 15', 400, 'Put', 'Sell', -3)],
+    'mixed_symbols': [('SPY', 'Aug 15', 400, 'Put', 'Buy', 1), ('QQQ', 'Aug 15', 390, 'Put', 'Sell', -1)],
+    'five_legs': [('SPY', 'Aug 15', 400 + i, 'Call', 'Buy', 1) for i in range(5)],
+}
+EXPECTED = {
+    'condor': 'IRON_CONDOR', 'fly': 'BUTTERFLY', 'iron_fly': 'BUTTERFLY', 'calendar': 'CALENDAR_SPREAD',
+    'ratio': 'RATIO_SPREAD', 'vertical': 'VERTICAL_SPREAD', 'straddle': 'STRADDLE', 'strangle': 'STRANGLE',
+    'single': 'SINGLE_LEG', 'mixed_symbols': 'COMPLEX', 'five_legs': 'COMPLEX',
+}
+
+@pytest.fixture
+def legs():
+    rows = [(order,) + leg for order, order_legs in ORDERS.items() for leg in order_legs]
+    # Shuffle leg order: the signature must not depend on it
+    return pd.DataFrame(rows[::-1], columns=LEG_COLUMNS)
+
+def test_classify_returns_categorical_per_order(legs):
+    result = BatchStrategyDetector.classify(legs)
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert set(result.cat.categories) == {p.name for p in StrategyPattern}
+    assert result.to_dict() == EXPECTED
+
+def test_single_group_detect_matches_batch():
+    for order, order_legs in ORDERS.items():
+        pattern = StrategyDetector.detect([StrategyLeg(*leg) for leg in order_legs])
+        assert pattern.name == EXPECTED[order], order
+
+def test_legs_frame_parses_descriptions_vectorized():
+    df = pd.DataFrame({
+        'Order #': ['#10', '#11', '#12'],
+        'Symbol': ['SPY', 'SPY', 'AAPL'],
+        'Description': ['-1 Aug 15 30d 410 Put STO\n1 Aug 15 30d 400 Put BTO', None, '1 Aug 15 30d 150 Call BTO'],
+    })
+    legs = BatchStrategyDetector.legs_frame(df)
+    assert legs['order'].tolist() == ['10', '10', '12']
+    assert legs['side'].tolist() == ['Sell', 'Buy', 'Buy']
+    assert legs['strike'].tolist() == [410.0, 400.0, 150.0]
+    assert BatchStrategyDetector.classify_orders(df).to_dict() == {'10': 'VERTICAL_SPREAD', '12': 'SINGLE_LEG'}
+
+def test_empty_input():
+    empty = BatchStrategyDetector.legs_frame(pd.DataFrame({'Order #': [], 'Symbol': [], 'Description': []}))
+    assert list(empty.columns) == LEG_COLUMNS
+    assert BatchStrategyDetector.classify(empty).empty
@@ -250,4 +250,98 @@ class TestBrokerAPIClient:
         request = mock_requests.request_history[0]
         # Note: requests-mock doesn't expose the timeout in request history,
         # but we can verify the request was made successfully
-        assert request.url == "https://api.broker.com/v1/account"
\ No newline at end of file
+        assert request.url == "https://api.broker.com/v1/account"
+
+def order(n):
+    return {"order_id": f"ord_{n}", "symbol": "AAPL", "price": "1.25 cr", "timestamp": "2024-07-01T13:30:00Z",
+            "expiry": "2024-07-19", "strike": 150.0, "option_type": "Call", "side": "BTO", "quantity": 1}
+
+
+def paged_orders(total, page_size, with_count):
+    """requests-mock callback serving ``total`` orders by page number."""
+    def respond(request, context):
+        page = int(request.qs['page'][0])
+        orders = [order(n) for n in range((page - 1) * page_size, min(page * page_size, total))]
+        return {"orders": orders, "total_pages": -(-total // page_size)} if with_count else orders
+    return respond
+
+
+class TestOrderHistoryPagination:
+    """Test cases for BrokerAPIClient.iter_order_history."""
+
+    def test_numbered_pages_in_order(self, mock_requests):
+        mock_requests.get("https://api.broker.com/v1/orders", json=paged_orders(25, 10, with_count=True))
+        client = BrokerAPIClient("test-api-key")
+        pages = list(client.iter_order_history("2024-01-01", page_size=10, max_parallel=3))
+        assert [len(p) for p in pages] == [10, 10, 5]
+        assert [o["order_id"] for p in pages for o in p] == [f"ord_{n}" for n in range(25)]
+        assert all("start_date=2024-01-01" in r.url for r in mock_requests.request_history)
+        assert mock_requests.call_count == 3
+
+    def test_pages_without_count_stop_at_short_page(self, mock_requests):
+        mock_requests.get("https://api.broker.com/v1/orders", json=paged_orders(20, 10, with_count=False))
+        client = BrokerAPIClient("test-api-key")
+        pages = list(client.iter_order_history(page_size=10, max_parallel=2))
+        assert [len(p) for p in pages] == [10, 10]
+
+    def test_cursor_pages(self, mock_requests):
+        def respond(request, context):
+            cursor = request.qs.get('cursor', ['0'])[0]
+            step = int(cursor)
+            return {"orders": [order(step)], "next_cursor": str(step + 1) if step < 2 else None}
+        mock_requests.get("https://api.broker.com/v1/orders", json=respond)
+        client = BrokerAPIClient("test-api-key")
+        pages = list(client.iter_order_history(page_size=1))
+        assert [p[0]["order_id"] for p in pages] == ["ord_0", "ord_1", "ord_2"]
+
+    def test_iter_trades_uses_csv_parsing(self, mock_requests):
+        orders = [order(1), {**order(2), "symbol": "not a symbol"}]
+        mock_requests.get("https://api.broker.com/v1/orders", json=orders)
+        client = BrokerAPIClient("test-api-key")
+        [trades] = list(client.iter_trades())
+        assert len(trades) == 1
+        assert trades[0].order_id == "ord_1"
+        assert trades[0].price == 1.25
+        assert trades[0].time == "2024-07-01 13:30:00"
+
+
+class TestIncrementalSync:
+    """Test cases for conditional requests and BrokerAPIClient.sync_orders."""
+
+    def test_positions_revalidated_with_etag(self, mock_requests):
+        positions = [{"symbol": "AAPL", "quantity": 10}]
+        mock_requests.get("https://api.broker.com/v1/positions", [
+            {"json": positions, "headers": {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jul 2024 09:30:00 GMT"}},
+            {"status_code": 304},
+        ])
+        client = BrokerAPIClient("test-api-key")
+        assert client.get_positions() == positions
+        assert client.get_positions() == positions
+        second = mock_requests.request_history[1]
+        assert second.headers["If-None-Match"] == '"v1"'
+        assert second.headers["If-Modified-Since"] == "Mon, 01 Jul 2024 09:30:00 GMT"
+
+    def test_sync_fetches_only_new_orders(self, mock_requests):
+        from src.storage import TradeStore
+        history = [order(1), {**order(2), "side": "STC", "timestamp": "2024-07-02T14:00:00Z"}]
+
+        def respond(request, context):
+            after = request.qs.get("after_id", [None])[0]
+            return history if after is None else [o for o in history if o["order_id"] > after]
+
+        mock_requests.get("https://api.broker.com/v1/orders", json=respond)
+        client = BrokerAPIClient("test-api-key")
+        with TradeStore() as store:
+            assert client.sync_orders(store, account="acct") == 2
+            assert store.load_sync_cursor("acct") == {"last_order_id": "ord_2", "last_timestamp": "2024-07-02T14:00:00Z"}
+            assert client.sync_orders(store, account="acct") == 0
+            assert "after_id=ord_2" in mock_requests.last_request.url
+            assert "since=2024-07-02t14" in mock_requests.last_request.url.lower()
+
+            history.append({**order(3), "timestamp": "2024-07-03T14:00:00Z"})
+            assert client.sync_orders(store, account="acct") == 1
+            assert [t.order_id for t in store.load_fills(account="acct")] == ["ord_1", "ord_2", "ord_3"]
+            # The contract's position is re-linked with the new fill
+            [position] = store.load_positions(account="acct")
+            assert "ord_3" in [t.order_id for t in position.entry_trades + position.exit_trades]
+            assert store.load_sync_cursor("acct")["last_order_id"] == "ord_3"
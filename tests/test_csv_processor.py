@@ -74,4 +74,16 @@ def test_mock_file_handling(monkeypatch, valid_row):
     assert loaded.equals(df)
     trades = processor.to_trades()
     assert len(trades) == 2
-    assert {t.symbol for t in trades} == {"AAPL", "MSFT"} 
\ No newline at end of file
+    assert {t.symbol for t in trades} == {"AAPL", "MSFT"}
+
+def test_to_trades_reports_progress(monkeypatch):
+    import os
+    import src.processors.csv_processor as csv_processor
+    monkeypatch.setattr(csv_processor, 'PROGRESS_INTERVAL', 1)
+    processor = CSVProcessor(os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv"))
+    calls = []
+    trades = processor.to_trades(progress=lambda done, total: calls.append((done, total)))
+    total = len(processor.df)
+    assert calls[-1] == (total, total)
+    assert [done for done, _ in calls] == list(range(1, total + 1))
+    assert trades
@@ -0,0 +1,54 @@
+import pytest
+from src.models.report_content import ReportContent
+from src.reports.export_handler import ExportHandler
+from src.reports.export_engines import externalize_charts
+from src.visualizations.chart_generator import ChartGenerator
+
+def make_content(tmp_path):
+    chart_file = ChartGenerator.cumulative_pnl_chart([1, -2, 3], save_path=str(tmp_path / "cum.png"))
+    embedded = ChartGenerator.win_loss_ratio_chart([True, False])
+    return ReportContent(
+        metrics={'win_rate': 0.6, 'total_pnl': 120.5, 'time_weighted_return': 0.1, 'risk_adjusted_return': 1.2},
+        charts={'cumulative_pnl': chart_file, 'win_loss': embedded},
+        insights="Strong month.\nSized up <carefully>.",
+        questions=["What worked?"],
+        action_items=["Review losers"],
+    )
+
+def test_externalize_charts_writes_embedded_images(tmp_path):
+    embedded = ChartGenerator.win_loss_ratio_chart([True])
+    paths = externalize_charts({'win_loss': embedded, 'other': 'x.png'}, str(tmp_path / "assets"))
+    assert paths['other'] == 'x.png'
+    with open(paths['win_loss'], 'rb') as f:
+        assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+def test_html_export_references_external_charts(tmp_path):
+    out = tmp_path / "out" / "report.html"
+    out.parent.mkdir()
+    ExportHandler.export_report(make_content(tmp_path), str(out), 'html')
+    html = out.read_text(encoding='utf-8')
+    assert 'base64' not in html
+    assert '<img src="charts/win_loss.png"' in html
+    assert '<img src="../cum.png"' in html
+    assert 'Sized up &lt;carefully&gt;.' in html
+    assert '<li>What worked?</li>' in html
+
+def test_markdown_export_references_external_charts(tmp_path):
+    out = tmp_path / "report.md"
+    ExportHandler.export_report(make_content(tmp_path), str(out))
+    md = out.read_text(encoding='utf-8')
+    assert 'base64' not in md
+    assert '![win_loss](charts/win_loss.png)' in md
+    assert 'Key Metrics Overview' in md
+
+def test_pdf_export_in_background(tmp_path):
+    out = tmp_path / "report.pdf"
+    future = ExportHandler.export_report_async(make_content(tmp_path), str(out), 'pdf')
+    assert future.result(timeout=60) == str(out)
+    with open(out, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+    assert ExportHandler.get_download_info(str(out))['mime'] == 'application/pdf'
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        ExportHandler.export_report(ReportContent(), str(tmp_path / "r.docx"), 'docx')
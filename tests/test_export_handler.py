@@ -22,4 +22,29 @@ def test_get_download_link():
 
 def test_get_download_link_missing():
     link = ExportHandler.get_download_link('/tmp/nonexistent_file.md')
-    assert link is None 
\ No newline at end of file
+    assert link is None
+
+def test_save_report_stream_and_download_info():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'report.md')
+        chunks = (f"line {i}\n" for i in range(1000))
+        ExportHandler.save_report_stream(chunks, path)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == ''.join(f"line {i}\n" for i in range(1000))
+        info = ExportHandler.get_download_info(path)
+        assert info['path'] == path
+        assert info['file_name'] == 'report.md'
+        assert info['mime'] == 'text/markdown'
+        assert ExportHandler.get_download_info(os.path.join(tmpdir, 'missing.md')) is None
+
+def test_get_download_link_chunked_encoding(monkeypatch):
+    import base64
+    from src.reports import export_handler
+    monkeypatch.setattr(export_handler, 'DOWNLOAD_CHUNK_SIZE', 3 * 4)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'report.md')
+        content = "# Report\n" + "Some content with unicode ✓.\n" * 50
+        ExportHandler.save_report(content, path)
+        link = ExportHandler.get_download_link(path)
+        b64 = link.split('base64,')[1].split('"')[0]
+        assert base64.b64decode(b64).decode('utf-8') == content
@@ -0,0 +1,85 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.brokers.broker_api_client import BrokerAPIClient
+from src.llm.llm_analysis_service import LLMAnalysisService
+from src.utils.http_session import RETRY_STATUSES, build_session
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers with the queued status codes (then 200) and records each client connection."""
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self.server.requests += 1
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = b'{"analysis": "ok", "id": 1}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    httpd.connections = httpd.requests = 0
+    httpd.statuses = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def url(server, path=''):
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+def test_session_retries_on_retryable_status(server):
+    server.statuses = [503, 429]
+    session = build_session(max_retries=3, backoff_factor=0, backoff_jitter=0)
+    response = session.get(url(server, '/account'))
+    assert response.status_code == 200
+    assert server.requests == 3
+
+def test_final_status_returned_after_retries(server):
+    server.statuses = [500] * 5
+    session = build_session(max_retries=2, backoff_factor=0, backoff_jitter=0)
+    assert session.get(url(server)).status_code == 500
+    assert server.requests == 3
+
+def test_post_not_retried_by_default(server):
+    server.statuses = [503]
+    session = build_session(backoff_factor=0, backoff_jitter=0)
+    assert session.post(url(server), json={}).status_code == 503
+    assert server.requests == 1
+
+def test_clients_reuse_connections(server):
+    broker = BrokerAPIClient('key', base_url=url(server))
+    for _ in range(5):
+        assert broker.get_account_info()['id'] == 1
+    llm = LLMAnalysisService(url(server, '/analyze'))
+    server.statuses = [502]
+    for _ in range(3):
+        assert llm.analyze_trades({}) == 'ok'
+    broker.close()
+    llm.close()
+    # One kept-alive connection per client; the 502 was retried on the same connection
+    assert server.connections == 2
+    assert server.requests == 9
+
+def test_retry_configuration():
+    adapter = build_session(pool_size=4, max_retries=5, allowed_methods=['post']).get_adapter('https://example.com')
+    assert adapter.max_retries.total == 5
+    assert set(adapter.max_retries.status_forcelist) == set(RETRY_STATUSES)
+    assert adapter.max_retries.allowed_methods == frozenset({'POST'})
+    assert adapter._pool_maxsize == 4
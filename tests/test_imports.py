@@ -24,4 +24,17 @@ def test_imports():
     import src.app.ui_components
     import src.app.data_handler
     import src.app.duplicate_ui
-    import src.app.main_controller 
\ No newline at end of file
+    import src.app.main_controller 
+
+def test_ingestion_imports_skip_heavy_dependencies():
+    import subprocess
+    import sys
+    code = (
+        "import sys\n"
+        "import src.processors.csv_processor, src.analyzers.trade_linker\n"
+        "import src.analytics.advanced_analyzer, src.llm.openai_client\n"
+        "import src.insights.reflection_engine, src.visualizations.chart_coordinator\n"
+        "print(sorted(m for m in ('matplotlib', 'seaborn', 'scipy', 'openai') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
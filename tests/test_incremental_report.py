@@ -0,0 +1,39 @@
+from src.reports.incremental_report import IncrementalReportBuilder
+from src.reports.markdown_generator import MarkdownGenerator
+from src.utils.fingerprint import fingerprint
+
+METRICS = {'win_rate': 0.7, 'total_pnl': 1500, 'time_weighted_return': 0.18, 'risk_adjusted_return': 2.1}
+
+def test_first_build_renders_all_sections():
+    builder = IncrementalReportBuilder()
+    md = builder.build(METRICS, "![c](c.png)", "Good.", ["Q1"], ["A1"])
+    assert md == MarkdownGenerator.generate_report(METRICS, "![c](c.png)", "Good.", ["Q1"], ["A1"])
+    assert builder.last_rendered == ['metrics', 'charts', 'insights', 'reflection', 'actions']
+
+def test_rebuild_only_changed_sections():
+    builder = IncrementalReportBuilder()
+    builder.build(METRICS, "![c](c.png)", "Good.", ["Q1"], ["A1"])
+    md = builder.build(METRICS, "![c](c.png)", "Better.", ["Q1", "Q2"], ["A1"])
+    assert builder.last_rendered == ['insights', 'reflection']
+    assert md == MarkdownGenerator.generate_report(METRICS, "![c](c.png)", "Better.", ["Q1", "Q2"], ["A1"])
+    builder.build(METRICS, "![c](c.png)", "Better.", ["Q1", "Q2"], ["A1"])
+    assert builder.last_rendered == []
+
+def test_invalidate():
+    builder = IncrementalReportBuilder()
+    builder.build(METRICS, "", "", [], [])
+    assert builder.section_fingerprint('metrics') is not None
+    builder.invalidate('metrics')
+    builder.build(METRICS, "", "", [], [])
+    assert builder.last_rendered == ['metrics']
+    builder.invalidate()
+    builder.build(METRICS, "", "", [], [])
+    assert len(builder.last_rendered) == 5
+
+def test_fingerprint_is_stable_and_order_independent():
+    import pandas as pd
+    assert fingerprint({'a': 1, 'b': 2}) == fingerprint({'b': 2, 'a': 1})
+    assert fingerprint([1, 2]) != fingerprint([2, 1])
+    df = pd.DataFrame({'x': [1, 2]})
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(pd.DataFrame({'x': [1, 3]}))
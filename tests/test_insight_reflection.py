@@ -41,4 +41,9 @@ def test_generate_questions_llm():
         def _call_openai(self, prompt):
             return "Q1\nQ2\nQ3"
     questions = ReflectionEngine.generate_questions(analytics, DummyLLM())
-    assert questions == ["Q1", "Q2", "Q3"] 
\ No newline at end of file
+    assert questions == ["Q1", "Q2", "Q3"]
+
+def test_suggest_action_items():
+    items = InsightGenerator.suggest_action_items({'win_rate': 0.4, 'risk_adjusted_return': 0.5, 'total_pnl': -10})
+    assert len(items) == 3
+    assert InsightGenerator.suggest_action_items(analytics) == ["Keep current sizing and document what is working."]
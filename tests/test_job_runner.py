@@ -0,0 +1,131 @@
+import io
+import os
+import threading
+import pytest
+from src.app.job_runner import Job, JobCancelled, JobRunner
+from src.app import analysis_cache
+from src.app.main_controller import MainController
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv")
+
+@pytest.fixture
+def runner():
+    runner = JobRunner()
+    yield runner
+    runner.shutdown()
+
+def test_job_reports_progress_and_result(runner):
+    def work(job, n):
+        step = job.step(0.0, 1.0, "Counting")
+        for i in range(1, n + 1):
+            step(i, n)
+        return n * 2
+    runner.start(work, 4, key='k')
+    status = runner.wait(timeout=5)
+    assert status.state == 'done'
+    assert status.result == 8
+    assert status.progress == 1.0
+    assert runner.job.key == 'k'
+
+def test_job_failure_and_single_job_at_a_time(runner):
+    release = threading.Event()
+    def blocked(job):
+        release.wait(5)
+        raise ValueError("boom")
+    runner.start(blocked)
+    with pytest.raises(RuntimeError):
+        runner.start(blocked)
+    release.set()
+    status = runner.wait(timeout=5)
+    assert status.state == 'failed'
+    assert status.error == "boom"
+
+def test_cancel_stops_at_next_progress_update(runner):
+    started = threading.Event()
+    seen = []
+    def loop(job):
+        started.set()
+        for i in range(10_000):
+            seen.append(i)
+            job.update(i / 10_000)
+            threading.Event().wait(0.001)
+    runner.start(loop)
+    started.wait(5)
+    runner.cancel()
+    status = runner.wait(timeout=5)
+    assert status.state == 'cancelled'
+    assert len(seen) < 10_000
+
+def test_step_maps_counts_and_checks_cancel():
+    job = Job()
+    job.step(0.5, 1.0, "Parsing rows")(50, 100)
+    status = job.status()
+    assert status.progress == pytest.approx(0.75)
+    assert status.message == "Parsing rows (50/100)"
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        job.update(0.9)
+
+def test_report_job_runs_workflow_with_row_progress(tmp_path, runner, monkeypatch):
+    analysis_cache.cached_ingest.clear()
+    analysis_cache.cached_metrics.clear()
+    with open(SAMPLE_CSV, 'rb') as f:
+        upload = io.BytesIO(f.read())
+    controller = MainController(output_dir=str(tmp_path), config={'export_settings': {'include_charts': False, 'include_llm_insights': False}})
+    messages = []
+    original_step = Job.step
+    def recording_step(self, start, end, message):
+        callback = original_step(self, start, end, message)
+        def wrapper(done, total):
+            messages.append(message)
+            callback(done, total)
+        return wrapper
+    monkeypatch.setattr(Job, 'step', recording_step)
+    runner.start(analysis_cache.report_job, controller, upload, None, None)
+    status = runner.wait(timeout=30)
+    assert status.state == 'done', status.error
+    assert status.result['mime'] == 'text/markdown'
+    assert os.path.exists(status.result['path'])
+    assert 'Parsing rows' in messages and 'Linking positions' in messages
+    assert controller.progress_callbacks == {}
+
+def test_published_partials_are_snapshotted():
+    job = Job()
+    job.publish('insights', 'Your win')
+    status = job.status()
+    job.publish('insights', 'Your win rate improved')
+    assert status.partials == {'insights': 'Your win'}
+    assert job.status().partials == {'insights': 'Your win rate improved'}
+
+def test_restart_queues_new_job_without_waiting(runner):
+    release = threading.Event()
+    def slow(job):
+        # Ignores cancellation until released, like a stage without checkpoints
+        release.wait(5)
+        job.raise_if_cancelled()
+    runner.restart(slow, key='old')
+    runner.restart(lambda job: 'new result', key='new')
+    assert runner.job.key == 'old' and runner.busy
+    assert runner.latest_key == 'new'
+    assert runner.start_pending() is None
+    release.set()
+    assert runner.wait(timeout=5).state == 'cancelled'
+    assert runner.start_pending().key == 'new'
+    assert runner.wait(timeout=5).result == 'new result'
+    assert not runner.busy
+
+def test_cancel_drops_queued_job(runner):
+    release = threading.Event()
+    runner.restart(lambda job: release.wait(5), key='old')
+    runner.restart(lambda job: None, key='new')
+    runner.cancel()
+    release.set()
+    runner.wait(timeout=5)
+    assert runner.start_pending() is None
+    assert runner.latest_key == 'old'
+
+def test_publish_checks_for_cancellation():
+    job = Job()
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        job.publish('insights', 'Your win')
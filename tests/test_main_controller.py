@@ -2,16 +2,25 @@ import pytest
 from src.app.main_controller import MainController
 import os
 
-def test_workflow_success():
-    controller = MainController()
-    assert controller.process_csv('dummy_file')
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv")
+
+def test_workflow_success(tmp_path):
+    controller = MainController(output_dir=str(tmp_path))
+    assert controller.process_csv(SAMPLE_CSV)
     assert controller.analyze_trades()
     assert controller.generate_llm_insights()
     assert controller.generate_charts()
     assert controller.assemble_report()
     link = controller.export_report()
-    assert link == 'download_link'
+    assert link.startswith('<a href="data:text/markdown;base64,')
     assert controller.get_error() is None
+    assert os.path.exists(tmp_path / "report.md")
+    assert "Key Metrics Overview" in controller.state['report']
+
+def test_process_csv_missing_file():
+    controller = MainController()
+    assert not controller.process_csv('dummy_file')
+    assert "CSV processing failed" in controller.get_error()
 
 def test_csv_error(monkeypatch):
     controller = MainController()
@@ -83,8 +92,8 @@ def test_export_error(monkeypatch):
     assert controller.get_error() is not None
 
 # --- Backend integration tests for upload-to-report workflow ---
-def test_main_controller_valid_csv():
-    controller = MainController()
+def test_main_controller_valid_csv(tmp_path):
+    controller = MainController(output_dir=str(tmp_path))
     sample_csv = os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv")
     assert controller.process_csv(sample_csv)
     assert controller.analyze_trades()
@@ -92,8 +101,9 @@ def test_main_controller_valid_csv():
     assert controller.generate_charts()
     assert controller.assemble_report()
     link = controller.export_report()
-    assert link == 'download_link'
+    assert link.startswith('<a href=')
     assert controller.get_error() is None
+    assert len(controller.state['positions']) == 2
 
 def test_main_controller_invalid_csv():
     controller = MainController()
@@ -104,4 +114,206 @@ def test_main_controller_invalid_csv():
         return False
     controller.process_csv = fail_csv
     assert not controller.process_csv(sample_csv)
-    assert controller.get_error() is not None 
\ No newline at end of file
+    assert controller.get_error() is not None
+
+# --- Stage-level caching ---
+LINKED_CSV = """Symbol,Price,Time,Order #,Description,Expiry,Strike,OptionType,Side,Quantity
+AAPL,2.5,2024-07-01 09:30,1,-1 Jul 19 18d 150 Call STO,2024-07-19,150.0,Call,STO,1
+AAPL,1.0,2024-07-10 10:00,2,1 Jul 19 9d 150 Call BTC,2024-07-19,150.0,Call,BTC,1
+MSFT,1.8,2024-07-01 10:00,3,1 Jul 19 18d 300 Put BTO,2024-07-19,300.0,Put,BTO,2
+"""
+
+def run_all(controller):
+    assert controller.analyze_trades()
+    assert controller.generate_llm_insights()
+    assert controller.generate_charts()
+    assert controller.assemble_report()
+    return controller.export_report()
+
+def test_rerun_with_unchanged_input_uses_cache(tmp_path):
+    csv_path = tmp_path / "trades.csv"
+    csv_path.write_text(LINKED_CSV)
+    controller = MainController(output_dir=str(tmp_path), config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(str(csv_path))
+    run_all(controller)
+    assert controller.state['strategies'] == {'1': 'SINGLE_LEG', '2': 'SINGLE_LEG', '3': 'SINGLE_LEG'}
+    assert controller.state['analysis']['num_trades'] == 2
+    controller.pipeline.executed.clear()
+    assert controller.process_csv(str(csv_path))
+    run_all(controller)
+    assert controller.pipeline.executed == []
+
+def test_positions_use_deduplicated_rows_and_detected_strategies(tmp_path):
+    csv_path = tmp_path / "trades.csv"
+    # Order 3 is exported twice
+    csv_path.write_text(LINKED_CSV + LINKED_CSV.splitlines()[-1] + "\n")
+    controller = MainController(output_dir=str(tmp_path), config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(str(csv_path))
+    assert len(controller.state['duplicates']) == 2
+    assert controller.analyze_trades()
+    assert [t.order_id for t in controller.state['trades']] == ['1', '2', '3']
+    assert {p.strategy for p in controller.state['positions']} == {'SINGLE_LEG'}
+
+def test_changing_report_options_reruns_only_downstream(tmp_path):
+    csv_path = tmp_path / "trades.csv"
+    csv_path.write_text(LINKED_CSV)
+    controller = MainController(output_dir=str(tmp_path), config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(str(csv_path))
+    run_all(controller)
+    controller.pipeline.executed.clear()
+    controller.set_report_options(export_format='html')
+    link = run_all(controller)
+    assert controller.pipeline.executed == ['export']
+    assert link.startswith('<a href="data:text/html;base64,')
+    controller.pipeline.executed.clear()
+    controller.set_report_options(include_charts=True)
+    run_all(controller)
+    assert controller.pipeline.executed == ['charts', 'report', 'export']
+    assert controller.report_builder.last_rendered == ['charts']
+
+def test_changed_csv_content_reruns_pipeline(tmp_path):
+    csv_path = tmp_path / "trades.csv"
+    csv_path.write_text(LINKED_CSV)
+    controller = MainController(output_dir=str(tmp_path), config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(str(csv_path))
+    run_all(controller)
+    csv_path.write_text(LINKED_CSV.replace("AAPL,1.0,", "AAPL,0.5,"))
+    controller.pipeline.executed.clear()
+    assert controller.process_csv(str(csv_path))
+    run_all(controller)
+    assert 'positions' in controller.pipeline.executed
+    assert 'metrics' in controller.pipeline.executed
+
+def test_llm_client_used_when_enabled(tmp_path):
+    class DummyLLM:
+        def generate_performance_analysis(self, metrics):
+            return "LLM analysis"
+        def _call_openai(self, prompt):
+            return "Q1?\nQ2?"
+    controller = MainController(output_dir=str(tmp_path), llm_client=DummyLLM(),
+                                config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(SAMPLE_CSV)
+    run_all(controller)
+    assert controller.state['llm']['insights'] == "LLM analysis"
+    assert controller.state['llm']['questions'] == ["Q1?", "Q2?"]
+    assert "LLM analysis" in controller.state['report']
+
+
+def test_llm_output_streams_to_callback(tmp_path):
+    class StreamingLLM:
+        def stream_openai(self, prompt):
+            yield from (["Q1?\n", "Q2?"] if "reflection questions" in prompt else ["LLM ", "analysis"])
+    seen = []
+    controller = MainController(output_dir=str(tmp_path), llm_client=StreamingLLM(),
+                                config={'export_settings': {'include_charts': False}})
+    controller.stream_callback = lambda name, text: seen.append((name, text))
+    assert controller.process_csv(SAMPLE_CSV)
+    run_all(controller)
+    assert ('insights', 'LLM ') in seen and ('insights', 'LLM analysis') in seen
+    assert controller.state['llm']['insights'] == "LLM analysis"
+    assert controller.state['llm']['questions'] == ["Q1?", "Q2?"]
+
+def test_failed_stream_discards_partial_text(tmp_path):
+    from src.llm.openai_client import LLMStreamError
+    class BrokenStreamLLM:
+        def stream_openai(self, prompt):
+            yield "Your win rate "
+            raise LLMStreamError("OpenAI/LM Studio API error: connection reset")
+    controller = MainController(output_dir=str(tmp_path), llm_client=BrokenStreamLLM(),
+                                config={'export_settings': {'include_charts': False}})
+    controller.stream_callback = lambda name, text: None
+    assert controller.process_csv(SAMPLE_CSV)
+    run_all(controller)
+    assert controller.state['llm']['insights'].startswith("Monthly Summary")
+    assert "Your win rate" not in controller.state['report']
+
+def test_llm_deadline_falls_back_to_templates(tmp_path):
+    import threading
+    from src.insights.reflection_engine import ReflectionEngine
+    release = threading.Event()
+    class HangingLLM:
+        def generate_performance_analysis(self, metrics):
+            release.wait(5)
+            return "Too late"
+        def _call_openai(self, prompt):
+            return "Q1?"
+    controller = MainController(output_dir=str(tmp_path), llm_client=HangingLLM(),
+                                config={'export_settings': {'include_charts': False},
+                                        'llm_settings': {'deadline_seconds': 0.1}})
+    assert controller.process_csv(SAMPLE_CSV)
+    run_all(controller)
+    release.set()
+    assert controller.state['llm']['insights'].startswith("Monthly Summary")
+    assert controller.state['llm']['questions'] == ReflectionEngine.question_templates()
+
+def test_llm_error_text_is_not_used_as_questions(tmp_path):
+    from src.insights.reflection_engine import ReflectionEngine
+    class DownLLM:
+        def generate_performance_analysis(self, metrics):
+            return "OpenAI/LM Studio API error: Connection refused"
+        def _call_openai(self, prompt):
+            return "OpenAI/LM Studio API error: Connection refused"
+    controller = MainController(output_dir=str(tmp_path), llm_client=DownLLM(),
+                                config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(SAMPLE_CSV)
+    run_all(controller)
+    assert controller.state['llm']['insights'].startswith("Monthly Summary")
+    assert controller.state['llm']['questions'] == ReflectionEngine.question_templates()
+
+def test_fallback_insights_are_retried_on_next_run(tmp_path):
+    class FlakyLLM:
+        calls = 0
+        def generate_performance_analysis(self, metrics):
+            FlakyLLM.calls += 1
+            if FlakyLLM.calls == 1:
+                return "OpenAI/LM Studio API error: Connection refused"
+            return "Your win rate improved"
+        def _call_openai(self, prompt):
+            return "Q1?"
+    controller = MainController(output_dir=str(tmp_path), llm_client=FlakyLLM(),
+                                config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(SAMPLE_CSV)
+    run_all(controller)
+    assert controller.state['llm']['degraded']
+    assert FlakyLLM.calls == 1
+    run_all(controller)
+    assert FlakyLLM.calls == 2
+    assert controller.state['llm']['insights'] == "Your win rate improved"
+    assert not controller.state['llm']['degraded']
+    run_all(controller)
+    assert FlakyLLM.calls == 2
+
+def test_insights_and_charts_run_concurrently(tmp_path):
+    controller = MainController(output_dir=str(tmp_path))
+    try:
+        assert controller.process_csv(SAMPLE_CSV)
+        assert controller.analyze_trades()
+        assert controller.generate_insights_and_charts()
+        assert set(controller.state['charts']) >= {'cumulative_pnl', 'win_loss'}
+        assert os.path.exists(controller.state['charts']['cumulative_pnl'])
+        assert 'Monthly Summary' in controller.state['llm']['insights']
+        assert controller.assemble_report()
+        assert '![cumulative_pnl](charts/cumulative_pnl.png)' in controller.state['report']
+    finally:
+        controller.close()
+
+def test_broken_chart_pool_falls_back_in_thread_and_is_replaced(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    class BrokenPool:
+        def submit(self, fn, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+    broken, replacement = BrokenPool(), ThreadPoolExecutor(max_workers=1)
+    replaced = []
+    controller = MainController(output_dir=str(tmp_path), chart_executor=broken)
+    controller.replace_chart_executor = lambda pool: replaced.append(pool) or replacement
+    try:
+        assert controller.process_csv(SAMPLE_CSV)
+        assert controller.analyze_trades()
+        assert controller.generate_insights_and_charts(), controller.get_error()
+        assert os.path.exists(controller.state['charts']['cumulative_pnl'])
+        assert replaced == [broken]
+        assert controller._executors()['charts'] is replacement
+    finally:
+        controller.close()
+        replacement.shutdown()
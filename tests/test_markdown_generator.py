@@ -29,4 +29,21 @@ def test_generate_report_empty():
     assert "Visual Section" in md
     assert "Detailed Analysis Section" in md
     assert "Monthly Reflection Questions" in md
-    assert "Action Items and Improvement Areas" in md 
\ No newline at end of file
+    assert "Action Items and Improvement Areas" in md
+
+def test_stream_report_matches_generate_report():
+    import io
+    args = ({'win_rate': 0.5, 'total_pnl': 10}, '![c](c.png)', "Fine.", ["Q?"], ["Do X"])
+    chunks = list(MarkdownGenerator.stream_report(*args))
+    assert len(chunks) > 5
+    assert ''.join(chunks) == MarkdownGenerator.generate_report(*args)
+    buf = io.StringIO()
+    MarkdownGenerator.write_report(buf, *args)
+    assert buf.getvalue() == MarkdownGenerator.generate_report(*args)
+
+def test_group_summaries_section():
+    args = ({}, '', 'Insights', ['Q?'], ['Act'])
+    assert "Strategy Summaries" not in MarkdownGenerator.generate_report(*args)
+    md = MarkdownGenerator.generate_report(*args, {'VERTICAL_SPREAD': 'Steady credit.'})
+    assert "- **VERTICAL_SPREAD:** Steady credit." in md
+    assert md.index("Strategy Summaries") < md.index("Monthly Reflection Questions")
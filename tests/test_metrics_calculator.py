@@ -1,4 +1,5 @@
 import pytest
+import pandas as pd
 from src.analytics.metrics_calculator import MetricsCalculator
 from src.models.position import Position
 
@@ -56,4 +57,47 @@ def test_calculate_all():
     assert result.total_pnl == 5
     assert result.time_weighted_return == pytest.approx(0.15)
     assert result.holding_periods == [5, 10]
-    assert result.num_trades == 2 
\ No newline at end of file
+    assert result.num_trades == 2
+    assert result.grouped_results == {}
+
+def test_strategy_groups():
+    positions = [DummyPosition(pnl=10), DummyPosition(pnl=-4), DummyPosition(pnl=6), DummyPosition(pnl=1)]
+    for position, strategy in zip(positions, ['VERTICAL_SPREAD', 'VERTICAL_SPREAD', 'STRADDLE', None]):
+        position.strategy = strategy
+    assert MetricsCalculator.strategy_groups(positions) == {
+        'VERTICAL_SPREAD': {'num_trades': 2, 'win_rate': 0.5, 'total_pnl': 6},
+        'STRADDLE': {'num_trades': 1, 'win_rate': 1.0, 'total_pnl': 6},
+    }
+
+def test_chart_series():
+    from src.models.trade import Trade
+    t = Trade("1", "AAPL", "2024-12-20", 100.0, "Call", "BTO", 2, 1.0, "2024-01-01 10:00")
+    p1 = Position(entry_trades=[t], exit_trades=[], status='open', pnl=10, time_weighted_return=10, strategy='SINGLE_LEG')
+    p2 = DummyPosition(pnl=-5, dte=10, time_weighted_return=-5)
+    series = MetricsCalculator.chart_series([p1, p2])
+    assert series['pnl_series'] == [10, -5]
+    assert series['win_loss'] == [True, False]
+    assert series['strategy_pnls'] == {'SINGLE_LEG': 10, 'UNKNOWN': -5}
+    assert series['comparison_data'] == {'SINGLE_LEG': [10], 'UNKNOWN': [-5]}
+    assert series['dte_buckets'] == {'8-30': -5.0}
+    assert series['position_sizes'] == [2]
+
+def test_filter_by_date_range():
+    from datetime import date
+    from src.models.trade import Trade
+    def at(when):
+        t = Trade("1", "AAPL", "2024-12-20", 100.0, "Call", "BTO", 1, 1.0, when)
+        return Position(entry_trades=[t], exit_trades=[], status='open')
+    jan, feb, undated = at("2024-01-31 15:00"), at("2024-02-01 09:30"), DummyPosition(pnl=1)
+    positions = [jan, feb, undated]
+    assert MetricsCalculator.filter_by_date_range(positions) == positions
+    assert MetricsCalculator.filter_by_date_range(positions, date(2024, 1, 1), date(2024, 1, 31)) == [jan]
+    assert MetricsCalculator.filter_by_date_range(positions, start=date(2024, 2, 1)) == [feb]
+
+def test_positions_frame():
+    from src.models.trade import Trade
+    t = Trade("1", "AAPL", "2024-12-20", 100.0, "Call", "BTO", 2, 1.0, "2024-01-01 10:00")
+    frame = MetricsCalculator.positions_frame([Position(entry_trades=[t], exit_trades=[], status='open', pnl=4.0), DummyPosition()])
+    assert list(frame['Symbol']) == ['AAPL', 'UNKNOWN']
+    assert list(frame['Quantity']) == [2, 0]
+    assert frame['PnL'].iloc[0] == 4.0 and pd.isna(frame['PnL'].iloc[1])
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from src.llm.prompt_builder import PromptBuilder
-from src.llm.openai_client import OpenAIClient
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.openai_client import LLMStreamError, OpenAIClient, is_llm_error
 
 metrics = {
     'win_rate': 0.6,
@@ -27,23 +28,76 @@ def test_format_context():
     assert "foo" in context
     assert "Trading Data Context" in context
 
-@patch('openai.ChatCompletion.create')
-def test_generate_performance_analysis(mock_create):
-    mock_create.return_value = MagicMock(choices=[MagicMock(message={"content": "Analysis result"})])
+@patch('openai.OpenAI')
+def test_generate_performance_analysis(mock_openai):
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value = MagicMock(choices=[MagicMock(message=MagicMock(content="Analysis result"))])
     client = OpenAIClient(api_key="test-key", rate_limit=1000)
     result = client.generate_performance_analysis(metrics)
     assert "Analysis result" in result
 
-@patch('openai.ChatCompletion.create', side_effect=Exception("API error"))
-def test_openai_api_error(mock_create):
+@patch('openai.OpenAI')
+def test_openai_api_error(mock_openai):
+    mock_openai.return_value.chat.completions.create.side_effect = Exception("API error")
     client = OpenAIClient(api_key="test-key", rate_limit=1000)
     result = client.generate_performance_analysis(metrics)
     assert "API error" in result
 
+@patch('openai.OpenAI')
+def test_breaker_skips_requests_after_failures(mock_openai):
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.side_effect = Exception("timed out")
+    client = OpenAIClient(api_key="test-key", rate_limit=1000, request_timeout=2.5,
+                          breaker=CircuitBreaker(failure_threshold=2))
+    results = [client.generate_performance_analysis(metrics) for _ in range(4)]
+    assert all(is_llm_error(r) for r in results)
+    assert "circuit open" in results[-1]
+    assert mock_create.call_count == 2
+    assert mock_create.call_args.kwargs['timeout'] == 2.5
+
 def test_rate_limiting():
     import time
     client = OpenAIClient(api_key="test-key", rate_limit=120)
     start = time.time()
     client._rate_limit()  # Should not sleep on first call
     elapsed = time.time() - start
-    assert elapsed < 0.5  # Should be fast 
\ No newline at end of file
+    assert elapsed < 0.5  # Should be fast
+
+def test_client_created_lazily_without_global_state():
+    import openai
+    client = OpenAIClient(api_key="test-key", api_base="http://localhost:1234/v1")
+    assert client._client is None
+    with patch('openai.OpenAI') as mock_openai:
+        client._get_client()
+        client._get_client()
+        mock_openai.assert_called_once_with(api_key="test-key", base_url="http://localhost:1234/v1")
+    assert getattr(openai, 'api_base', None) != "http://localhost:1234/v1"
+
+def stream_chunks(*texts):
+    return [MagicMock(choices=[MagicMock(delta=MagicMock(content=t))]) for t in texts]
+
+@patch('openai.OpenAI')
+def test_stream_yields_chunks_and_caches_full_text(mock_openai):
+    from src.llm.response_cache import ResponseCache
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value = iter(stream_chunks("Strong ", None, "month."))
+    client = OpenAIClient(api_key="test-key", rate_limit=1000, cache=ResponseCache())
+    assert list(client.stream_openai("prompt")) == ["Strong ", "month."]
+    assert mock_create.call_args.kwargs['stream'] is True
+    assert list(client.stream_openai("prompt")) == ["Strong month."]
+    assert client._call_openai("prompt") == "Strong month."
+    assert mock_create.call_count == 1
+
+@patch('openai.OpenAI')
+def test_stream_failure_raises_after_partial_text(mock_openai):
+    def broken_stream():
+        yield from stream_chunks("Your win rate ")
+        raise ConnectionError("connection reset")
+    mock_openai.return_value.chat.completions.create.return_value = broken_stream()
+    client = OpenAIClient(api_key="test-key", rate_limit=1000)
+    chunks = []
+    with pytest.raises(LLMStreamError, match="connection reset") as error:
+        for chunk in client.stream_openai("prompt"):
+            chunks.append(chunk)
+    assert chunks == ["Your win rate "]
+    assert is_llm_error(str(error.value))
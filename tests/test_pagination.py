@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.pagination import paginate_frame, row_order
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'Symbol': ['AAPL', 'MSFT', 'aapl', 'TSLA', 'SPY'],
+        'PnL': [10.0, None, -5.0, 3.0, 7.0],
+    })
+
+def test_paginate_slices_one_page(frame):
+    page = paginate_frame(frame, page=2, page_size=2)
+    assert list(page.rows['Symbol']) == ['aapl', 'TSLA']
+    assert (page.total_rows, page.page_count, page.start, page.end) == (5, 3, 2, 4)
+
+def test_page_is_clamped(frame):
+    assert paginate_frame(frame, page=99, page_size=2).page == 3
+    assert paginate_frame(frame, page=0, page_size=2).page == 1
+    with pytest.raises(ValueError):
+        paginate_frame(frame, page_size=0)
+
+def test_filter_and_sort(frame):
+    page = paginate_frame(frame, sort_by='PnL', ascending=False, page_size=10)
+    assert list(page.rows['Symbol']) == ['AAPL', 'SPY', 'TSLA', 'aapl', 'MSFT']
+    page = paginate_frame(frame, query='aap', sort_by='PnL')
+    assert list(page.rows['Symbol']) == ['aapl', 'AAPL']
+    assert page.total_rows == 2
+
+def test_filter_with_no_matches(frame):
+    page = paginate_frame(frame, query='QQQ')
+    assert page.total_rows == 0 and page.page == 1 and page.rows.empty
+
+def test_precomputed_order_and_mixed_types():
+    df = pd.DataFrame({'x': [3, 'b', 1]})
+    order = row_order(df, sort_by='x')
+    assert list(order) == [2, 0, 1]
+    assert list(paginate_frame(df, order=np.array([1]), page_size=5).rows['x']) == ['b']
+
+def test_table_component_sends_one_page():
+    from streamlit.testing.v1 import AppTest
+    def app():
+        import pandas as pd
+        from src.app.ui_components import paginated_table_component
+        paginated_table_component(pd.DataFrame({'n': range(1000)}), key="t", page_size=25)
+    at = AppTest.from_function(app).run()
+    assert len(at.dataframe[0].value) == 25
+    at.number_input[0].set_value(40).run()
+    assert at.dataframe[0].value['n'].iloc[0] == 975
+    at.text_input[0].set_value("99").run()
+    assert at.number_input[0].value == 1
+    assert at.caption[0].value == "Rows 1-19 of 19"
@@ -0,0 +1,73 @@
+import os
+from datetime import date
+import pytest
+from src.models.trade import Trade
+from src.storage.parquet_store import FILL_SCHEMA, ParquetTradeStore
+
+def trade(order_id, side, price, when, symbol="AAPL", strike=150.0):
+    return Trade(order_id, symbol, "2024-07-19", strike, "Call", side, 1, price, when)
+
+@pytest.fixture
+def store(tmp_path):
+    return ParquetTradeStore(str(tmp_path / "journal"))
+
+def test_hive_layout_and_cross_month_linking(store):
+    store.import_trades([trade("1", "STO", 2.5, "2024-06-28 09:30")])
+    store.import_trades([trade("2", "BTC", 1.0, "2024-07-10 10:00")], strategies={"2": "SINGLE"})
+    assert os.path.isdir(os.path.join(store.fills_dir, "account=default", "year=2024", "month=6"))
+    assert os.path.isdir(os.path.join(store.fills_dir, "account=default", "year=2024", "month=7"))
+    positions = store.load_positions()
+    assert len(positions) == 1
+    assert positions[0].status == 'closed'
+    assert positions[0].pnl == pytest.approx(-1.5)
+    assert [t.order_id for t in positions[0].entry_trades + positions[0].exit_trades] == ["1", "2"]
+    assert store.load_strategies() == {"2": "SINGLE"}
+
+def test_upsert_replaces_fill_even_when_it_moves_month(store):
+    store.import_trades([trade("1", "STO", 2.5, "2024-06-28 09:30")])
+    store.import_trades([trade("1", "STO", 2.75, "2024-07-01 09:30")])
+    frame = store.fills_frame()
+    assert frame[['order_id', 'price', 'month']].values.tolist() == [["1", 2.75, 7]]
+    # The position moved to July too, and June's now-empty partition is gone
+    assert store.positions_frame()['month'].tolist() == [7]
+    assert not os.path.exists(os.path.join(store.positions_dir, "account=default", "year=2024", "month=6"))
+
+def test_date_range_reads_only_needed_partitions(store):
+    store.import_trades([
+        trade("1", "STO", 2.5, "2024-01-15 09:30", symbol="SPY"),
+        trade("2", "STO", 2.5, "2024-03-01 09:30", symbol="MSFT"),
+        trade("3", "STO", 2.5, "2024-03-31 16:00", symbol="AAPL"),
+    ])
+    assert [t.order_id for t in store.load_fills(start=date(2024, 3, 1), end=date(2024, 3, 31))] == ["2", "3"]
+    assert [t.order_id for t in store.load_fills(end="2024-03-01")] == ["1", "2"]
+    assert store.fills_frame(symbols=["AAPL"], columns=["order_id", "price"]).columns.tolist() == ["order_id", "price"]
+    assert len(store.load_positions(start=date(2024, 2, 1))) == 2
+    # Partition pruning: a January read never touches the March files
+    expr = store._filter(start=date(2024, 1, 1), end=date(2024, 1, 31))
+    files = [f.path for f in store._dataset(store.fills_dir, FILL_SCHEMA).get_fragments(filter=expr)]
+    assert files and all("month=1" in path for path in files)
+
+def test_accounts_are_separate_and_empty_store_reads(store):
+    assert store.load_positions() == []
+    assert store.date_range() == (None, None)
+    store.import_trades([trade("1", "BTO", 1.0, "2024-05-01 10:00")], account="ira")
+    store.import_trades([trade("1", "BTO", 2.0, "2024-05-02 10:00")])
+    assert [t.price for t in store.load_fills(account="ira")] == [1.0]
+    assert len(store.load_positions()) == 2
+    assert store.date_range(account="ira") == ("2024-05-01 10:00", "2024-05-01 10:00")
+
+def test_open_store_and_lookback(tmp_path):
+    from src.storage import TradeStore, open_store
+    from src.utils.time_utils import lookback_range
+    assert isinstance(open_store({'backend': 'parquet', 'path': str(tmp_path / 'pq')}), ParquetTradeStore)
+    with open_store({'path': str(tmp_path / 'journal.db')}) as sqlite_store:
+        assert isinstance(sqlite_store, TradeStore)
+    with pytest.raises(ValueError):
+        open_store({'backend': 'csv'})
+    assert lookback_range(90, today=date(2024, 3, 31)) == (date(2024, 1, 1), date(2024, 3, 31))
+
+def test_sync_cursor_persists(store):
+    assert store.load_sync_cursor() is None
+    store.save_sync_cursor({"last_order_id": "7", "last_timestamp": "2024-07-01T09:30:00Z"})
+    assert ParquetTradeStore(store.root).load_sync_cursor() == {"last_order_id": "7", "last_timestamp": "2024-07-01T09:30:00Z"}
+    assert store.load_sync_cursor("other") is None
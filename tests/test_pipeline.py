@@ -0,0 +1,124 @@
+import pytest
+from src.app.pipeline import Pipeline, Stage
+
+def make_pipeline(calls):
+    def source(n):
+        calls.append('source')
+        return list(range(n))
+    def double(source):
+        calls.append('double')
+        return [x * 2 for x in source]
+    def total(double, offset):
+        calls.append('total')
+        return sum(double) + offset
+    return Pipeline([
+        Stage('source', source, params=('n',)),
+        Stage('double', double, deps=('source',)),
+        Stage('total', total, deps=('double',), params=('offset',)),
+    ])
+
+def test_run_and_memoize():
+    calls = []
+    p = make_pipeline(calls)
+    p.set_params(n=3, offset=0)
+    assert p.run('total') == 6
+    assert calls == ['source', 'double', 'total']
+    assert p.run('total') == 6
+    assert calls == ['source', 'double', 'total']
+    assert p.cached('double')
+
+def test_param_change_only_invalidates_downstream():
+    calls = []
+    p = make_pipeline(calls)
+    p.set_params(n=3, offset=0)
+    p.run('total')
+    calls.clear()
+    p.set_params(offset=10)
+    assert p.run('total') == 16
+    assert calls == ['total']
+    calls.clear()
+    p.set_params(n=4)
+    assert p.run('total') == 22
+    assert calls == ['source', 'double', 'total']
+
+def test_param_key_override_and_invalidate():
+    calls = []
+    p = make_pipeline(calls)
+    p.set_param('n', 3, key='same')
+    p.set_params(offset=0)
+    p.run('total')
+    calls.clear()
+    p.set_param('n', 3, key='same')
+    p.run('total')
+    assert calls == []
+    p.invalidate('double', 'total')
+    p.run('total')
+    assert calls == ['double', 'total']
+
+def test_unknown_dependency_and_missing_param():
+    with pytest.raises(ValueError, match="unknown stages"):
+        Pipeline([Stage('a', lambda b: b, deps=('b',))])
+    p = Pipeline([Stage('a', lambda x: x, params=('x',))])
+    with pytest.raises(ValueError, match="missing parameters"):
+        p.run('a')
+
+def test_run_concurrent_overlaps_independent_stages():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+    def base():
+        calls.append('base')
+        return 1
+    def slow_a(base):
+        barrier.wait()  # only passes if slow_b is running at the same time
+        return base + 1
+    def slow_b(base):
+        barrier.wait()
+        return base + 2
+    p = Pipeline([
+        Stage('base', base),
+        Stage('a', slow_a, deps=('base',)),
+        Stage('b', slow_b, deps=('base',)),
+    ])
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = p.run_concurrent(['a', 'b'], {'a': pool, 'b': pool})
+    assert results == {'a': 2, 'b': 3}
+    assert calls == ['base']
+    assert p.cached('a') and p.cached('b')
+    assert p.run_concurrent(['a', 'b']) == {'a': 2, 'b': 3}
+
+def test_run_concurrent_propagates_errors():
+    from concurrent.futures import ThreadPoolExecutor
+    def boom():
+        raise RuntimeError("stage failed")
+    p = Pipeline([Stage('ok', lambda: 1), Stage('bad', boom)])
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with pytest.raises(RuntimeError, match="stage failed"):
+            p.run_concurrent(['ok', 'bad'], {'bad': pool})
+    assert p.cached('ok')
+    assert not p.cached('bad')
+
+def test_seed_skips_execution():
+    calls = []
+    p = make_pipeline(calls)
+    p.set_params(n=3, offset=1)
+    p.seed('double', [10, 20])
+    assert p.run('total') == 31
+    assert calls == ['total']
+    assert p.executed == ['total']
+
+def test_run_concurrent_joins_submitted_stages_when_a_submit_fails():
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    class BrokenPool:
+        def submit(self, fn, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+    calls = []
+    pipeline = Pipeline([Stage('a', lambda: calls.append('a') or 1), Stage('b', lambda: 2)])
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(BrokenProcessPool):
+            pipeline.run_concurrent(['a', 'b'], {'a': pool, 'b': BrokenPool()})
+    assert pipeline.cached('a')
+    assert pipeline.run_concurrent(['a', 'b']) == {'a': 1, 'b': 2}
+    assert calls == ['a']
@@ -0,0 +1,63 @@
+import random
+from datetime import date, datetime
+import pytest
+from src.analytics.position_index import PositionIndex
+from src.models.position import Position
+from src.models.trade import Trade
+
+def position(symbol, entry, exit=None):
+    entries = [Trade("1", symbol, "2024-12-20", 100.0, "Call", "BTO", 1, 1.0, entry)]
+    exits = [Trade("2", symbol, "2024-12-20", 100.0, "Call", "STC", 1, 2.0, exit)] if exit else []
+    return Position(entry_trades=entries, exit_trades=exits, status='closed' if exit else 'open')
+
+@pytest.fixture
+def positions():
+    return [
+        position("IBIT", "2024-01-05 10:00", "2024-01-20 15:00"),
+        position("SPY", "2024-01-10 09:30", "2024-02-15 10:00"),
+        position("IBIT", "2024-02-01 10:00"),
+        position("IBIT", "2024-04-02 11:00", "2024-04-03 11:00"),
+        position("AAPL", "2024-03-31 16:00", "2024-04-01 09:30"),
+    ]
+
+def test_entered_between_and_symbol_ranges(positions):
+    index = PositionIndex(positions)
+    assert len(index) == 5
+    assert index.symbols() == ["AAPL", "IBIT", "SPY"]
+    assert index.entered_between() == positions
+    q1 = index.entered_between(date(2024, 1, 1), date(2024, 3, 31))
+    assert q1 == [positions[0], positions[1], positions[2], positions[4]]
+    assert index.entered_between(date(2024, 1, 1), date(2024, 3, 31), symbol="IBIT") == [positions[0], positions[2]]
+    assert index.entered_between(start="2024-04-01", symbol="IBIT") == [positions[3]]
+    assert index.for_symbol("QQQ") == [] and index.entered_between(symbol="QQQ") == []
+
+def test_open_at(positions):
+    index = PositionIndex(positions)
+    assert index.open_at(date(2024, 1, 20)) == [positions[0], positions[1]]
+    assert index.open_at(datetime(2024, 1, 20, 16, 0)) == [positions[1]]
+    assert index.open_at(date(2024, 4, 1)) == [positions[2], positions[4]]
+    assert index.open_at(date(2024, 4, 2), symbol="IBIT") == [positions[2], positions[3]]
+    assert index.count_open_at(date(2024, 4, 2)) == 2
+    assert index.open_between(date(2024, 2, 16), date(2024, 3, 30)) == [positions[2]]
+
+def test_matches_linear_scan_on_random_positions():
+    rng = random.Random(7)
+    sample = []
+    for _ in range(500):
+        start = datetime(2024, 1, 1) + (datetime(2024, 12, 31) - datetime(2024, 1, 1)) * rng.random()
+        end = None if rng.random() < 0.2 else start + (datetime(2025, 1, 31) - start) * rng.random() * 0.2
+        sample.append(position(rng.choice(["A", "B", "C"]), start.strftime("%Y-%m-%d %H:%M"), end and end.strftime("%Y-%m-%d %H:%M")))
+    index = PositionIndex(sample)
+    for _ in range(50):
+        when = datetime(2024, 1, 1) + (datetime(2025, 1, 31) - datetime(2024, 1, 1)) * rng.random()
+        stamp = when.strftime("%Y-%m-%d %H:%M")
+        expected = {id(p) for p in sample if p.entry_time() <= stamp and (p.exit_time() is None or p.exit_time() >= stamp)}
+        assert {id(p) for p in index.open_at(stamp)} == expected
+        assert index.count_open_at(stamp) == len(expected)
+        assert {id(p) for p in index.open_at(stamp, symbol="B")} == {id(p) for p in sample if id(p) in expected and p.entry_trades[0].symbol == "B"}
+
+def test_empty_index():
+    index = PositionIndex([])
+    assert index.open_at(date(2024, 1, 1)) == []
+    assert index.entered_between(date(2024, 1, 1), date(2024, 1, 2)) == []
+    assert index.count_open_at(date(2024, 1, 1)) == 0
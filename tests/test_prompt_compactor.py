@@ -0,0 +1,59 @@
+import random
+from src.llm.llm_analysis_service import LLMAnalysisService
+from src.llm.prompt_builder import PromptBuilder
+from src.llm.prompt_compactor import PromptCompactor, estimate_tokens
+
+def journal(n, seed=1):
+    rng = random.Random(seed)
+    return [{'symbol': f'SYM{i % 40}', 'pnl': rng.gauss(20, 150), 'quantity': rng.randint(1, 10)} for i in range(n)]
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Win rate: 0.6") == 6
+    assert estimate_tokens("a" * 40) == 10
+
+def test_short_lists_kept_verbatim():
+    compactor = PromptCompactor()
+    assert compactor.compact_value([5, 10, 15]) == "[5, 10, 15]"
+    assert compactor.compact_value({'a': 1.23456}) == "{a: 1.235}"
+
+def test_numeric_list_summary_has_quantiles_histogram_and_outliers():
+    values = list(range(100)) + [10_000]
+    summary = PromptCompactor(top_k=1, bins=4).summarize_numbers(values)
+    assert summary.startswith("n=101")
+    assert "median=50" in summary
+    assert summary.count("..") == 4
+    assert summary.endswith("outliers: 1e+04")
+
+def test_records_summarized_with_top_k_by_pnl():
+    records = journal(500)
+    records[7]['pnl'] = -5000
+    text = PromptCompactor(top_k=2).compact_value(records)
+    assert text.startswith("500 records")
+    assert "pnl: n=500" in text and "quantity: n=500" in text
+    assert "top 2 by |pnl|: symbol=SYM7, pnl=-5000" in text
+
+def test_prompt_size_constant_in_journal_size():
+    compactor = PromptCompactor(max_tokens=400)
+    small = estimate_tokens(compactor.format({'trades': journal(200)}))
+    large = estimate_tokens(compactor.format({'trades': journal(20_000)}))
+    assert abs(large - small) <= 10
+    periods = PromptBuilder.build_performance_prompt({'holding_periods': [float(i % 30) for i in range(50_000)]})
+    assert estimate_tokens(periods) < 200
+
+def test_fit_enforces_budget():
+    compactor = PromptCompactor(max_tokens=20)
+    text = compactor.format({f'k{i}': 'word ' * 10 for i in range(10)})
+    assert estimate_tokens(text) <= 20
+    assert text.endswith("... (truncated)")
+    # A single long line is cut between words rather than dropped
+    assert compactor.fit("alpha " * 50).startswith("alpha alpha")
+
+def test_analysis_service_prompt_is_compacted(mock_requests):
+    url = "https://api.llm-service.com/analyze"
+    mock_requests.post(url, json={"analysis": "ok"})
+    service = LLMAnalysisService(url, prompt_token_budget=300)
+    service.analyze_trades({'trades': journal(5_000), 'win_rate': 0.55})
+    prompt = mock_requests.request_history[0].json()['messages'][1]['content']
+    assert "5000 records" in prompt and "win_rate: 0.55" in prompt
+    assert estimate_tokens(prompt) <= 310
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import pytest
+from src.utils.rate_limiter import FileTokenBucket, TokenBucket, reset_shared, shared_bucket
+
+def test_burst_then_wait(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock)
+    bucket.reserve(2)
+    clock.now = 100
+    assert bucket.available() == 2
+
+def test_try_acquire_does_not_go_negative(clock):
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now = 1
+    assert bucket.try_acquire()
+
+def test_per_minute_and_validation():
+    assert TokenBucket.per_minute(120).rate == 2
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=1).reserve(2)
+
+def test_acquire_sleeps_for_deficit(clock):
+    bucket = TokenBucket(rate=4, capacity=1, clock=clock)
+    slept = []
+    bucket.acquire(sleep=slept.append)
+    bucket.acquire(sleep=slept.append)
+    assert slept == [pytest.approx(0.25)]
+
+def test_threads_share_one_budget(clock):
+    bucket = TokenBucket(rate=10, capacity=5, clock=clock)
+    waits = []
+    lock = threading.Lock()
+
+    def worker():
+        wait = bucket.reserve()
+        with lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 5 immediate, then one every 0.1s: reservations never overlap
+    assert sorted(waits) == pytest.approx([0] * 5 + [0.1 * i for i in range(1, 16)])
+
+def test_acquire_async():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    async def main():
+        return [await bucket.acquire_async() for _ in range(3)]
+
+    waits = asyncio.run(main())
+    assert waits[0] == 0
+    assert waits[1] > 0
+
+def test_shared_bucket_is_reused_per_key():
+    a = shared_bucket(('openai', 'http://x'), 1.0)
+    assert shared_bucket(('openai', 'http://x'), 1.0) is a
+    assert shared_bucket(('openai', 'http://y'), 1.0) is not a
+
+def test_shared_bucket_first_registration_sets_budget():
+    from src.llm.async_openai_client import AsyncOpenAIClient
+    from src.llm.openai_client import OpenAIClient
+    a = AsyncOpenAIClient(api_key="k", api_base="http://llm", rate_limit=60, max_concurrency=4)
+    b = OpenAIClient(api_key="k", api_base="http://llm", rate_limit=600)
+    assert a.limiter is b.limiter
+    assert (a.limiter.rate, a.limiter.capacity) == (1.0, 4)
+
+def test_shared_file_bucket_named_by_key_only(tmp_path):
+    a = shared_bucket(('broker', 'http://x'), 1.0, lock_dir=str(tmp_path))
+    reset_shared()
+    b = shared_bucket(('broker', 'http://x'), 2.0, capacity=5, lock_dir=str(tmp_path))
+    assert a.path == b.path
+
+def test_file_bucket_shares_budget_across_instances(tmp_path, clock):
+    path = str(tmp_path / 'limits' / 'api.bucket')
+    # Two instances stand in for two processes using the same lock file
+    first = FileTokenBucket(path, rate=1, capacity=2, clock=clock)
+    second = FileTokenBucket(path, rate=1, capacity=2, clock=clock)
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert first.reserve() == pytest.approx(1.0)
+    clock.now = 3
+    assert second.available() == pytest.approx(2)
+
+def test_clients_draw_from_their_limiter(mock_requests, clock):
+    from src.brokers.broker_api_client import BrokerAPIClient
+    from src.llm.llm_analysis_service import LLMAnalysisService
+    limiter = TokenBucket(rate=1, capacity=3, clock=clock)
+    mock_requests.get("https://api.broker.com/v1/account", json={"id": 1})
+    mock_requests.post("https://llm.example/analyze", json={"analysis": "ok"})
+    BrokerAPIClient("key", limiter=limiter).get_account_info()
+    LLMAnalysisService("https://llm.example/analyze", limiter=limiter).analyze_trades({})
+    assert limiter.available() == pytest.approx(1)
@@ -38,4 +38,11 @@ def test_assemble_report_error(monkeypatch):
             raise Exception("fail")
     monkeypatch.setattr(report_assembler, 'MarkdownGenerator', FailingMarkdownGenerator)
     with pytest.raises(Exception):
-        ReportAssembler.assemble_report({}, "", "", [], []) 
\ No newline at end of file
+        ReportAssembler.assemble_report({}, "", "", [], [])
+
+def test_write_report(tmp_path):
+    path = tmp_path / "report.md"
+    result = ReportAssembler.write_report(str(path), {'win_rate': 0.7}, "", "Insight", ["Q1"], ["A1"])
+    assert result == str(path)
+    text = path.read_text(encoding='utf-8')
+    assert text == ReportAssembler.assemble_report({'win_rate': 0.7}, "", "Insight", ["Q1"], ["A1"])
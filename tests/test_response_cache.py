@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src.llm.llm_analysis_service import LLMAnalysisService
+from src.llm.openai_client import OpenAIClient
+from src.llm.response_cache import ResponseCache
+
+metrics = {'win_rate': 0.6, 'total_pnl': 1000}
+messages = [{"role": "user", "content": "Analyze"}]
+
+def test_key_depends_on_model_messages_and_params():
+    key = ResponseCache.make_key("m", messages, max_tokens=300, temperature=None)
+    assert key == ResponseCache.make_key("m", messages, temperature=None, max_tokens=300)
+    assert key != ResponseCache.make_key("other", messages, max_tokens=300, temperature=None)
+    assert key != ResponseCache.make_key("m", messages, max_tokens=200, temperature=None)
+    assert key != ResponseCache.make_key("m", [{"role": "user", "content": "Other"}], max_tokens=300, temperature=None)
+
+def test_get_set_and_persistence(tmp_path):
+    path = str(tmp_path / "cache" / "llm.db")
+    cache = ResponseCache(path)
+    assert cache.get("k") is None
+    cache.set("k", {"analysis": "ok"})
+    assert cache.get("k") == {"analysis": "ok"}
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+    assert ResponseCache(path).get("k") == {"analysis": "ok"}
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60, clock=clock)
+    cache.set("k", "v")
+    clock.now += 59
+    assert cache.get("k") == "v"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ResponseCache(max_entries=2, clock=clock)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+@patch('openai.OpenAI')
+def test_openai_client_repeat_prompt_makes_no_model_call(mock_openai):
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value = MagicMock(choices=[MagicMock(message=MagicMock(content="Analysis result"))])
+    client = OpenAIClient(api_key="test-key", rate_limit=1000, cache=ResponseCache())
+    assert client.generate_performance_analysis(metrics) == "Analysis result"
+    assert client.generate_performance_analysis(metrics) == "Analysis result"
+    assert mock_create.call_count == 1
+
+@patch('openai.OpenAI')
+def test_openai_client_does_not_cache_errors(mock_openai):
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.side_effect = Exception("API error")
+    cache = ResponseCache()
+    client = OpenAIClient(api_key="test-key", rate_limit=1000, cache=cache)
+    client.generate_performance_analysis(metrics)
+    client.generate_performance_analysis(metrics)
+    assert mock_create.call_count == 2
+    assert len(cache) == 0
+
+def test_analysis_service_uses_cache(mock_requests):
+    url = "https://api.llm-service.com/analyze"
+    adapter = mock_requests.post(url, json={"analysis": "Cached"}, status_code=200)
+    service = LLMAnalysisService(url, "test-key", cache=ResponseCache())
+    assert service.analyze_trades({"total_trades": 5}) == "Cached"
+    assert service.analyze_trades({"total_trades": 5}) == "Cached"
+    assert adapter.call_count == 1
+
+def test_cache_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("LLM_CACHE_PATH", raising=False)
+    assert ResponseCache.from_env() is None
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setenv("LLM_CACHE_TTL_SECONDS", "30")
+    cache = ResponseCache.from_env()
+    assert cache.ttl_seconds == 30
@@ -0,0 +1,74 @@
+import os
+from datetime import date
+import pytest
+from src.analytics.metrics_calculator import MetricsCalculator
+from src.models.trade import Trade
+from src.processors.csv_processor import CSVProcessor
+from src.storage import TradeStore
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv")
+
+def trade(order_id, side, price, when, symbol="AAPL", strike=150.0):
+    return Trade(order_id, symbol, "2024-07-19", strike, "Call", side, 1, price, when)
+
+@pytest.fixture
+def store(tmp_path):
+    with TradeStore(str(tmp_path / "journal.db")) as store:
+        yield store
+
+def test_positions_link_across_imports(store):
+    store.import_trades([trade("1", "STO", 2.5, "2024-07-01 09:30")])
+    assert store.positions_frame()['status'].tolist() == ['open']
+    # The closing fill arrives in a later CSV
+    store.import_trades([trade("2", "BTC", 1.0, "2024-07-10 10:00")])
+    positions = store.load_positions()
+    assert len(positions) == 1
+    assert positions[0].status == 'closed'
+    assert positions[0].pnl == pytest.approx(-1.5)
+    assert [t.order_id for t in positions[0].entry_trades] == ["1"]
+    assert [t.order_id for t in positions[0].exit_trades] == ["2"]
+
+def test_upsert_is_idempotent(store):
+    fills = [trade("1", "STO", 2.5, "2024-07-01 09:30")]
+    store.import_trades(fills)
+    store.import_trades([trade("1", "STO", 2.75, "2024-07-01 09:30")])
+    frame = store.fills_frame()
+    assert len(frame) == 1
+    assert frame['price'].iloc[0] == 2.75
+
+def test_queries_filter_by_date_symbol_and_account(store):
+    store.import_trades([trade("1", "STO", 2.5, "2024-07-01 09:30"), trade("2", "BTO", 1.0, "2024-08-31 15:59", symbol="MSFT")])
+    store.import_trades([trade("1", "BTO", 3.0, "2024-08-01 10:00", symbol="SPY")], account="ira")
+    assert [t.order_id for t in store.load_fills(end=date(2024, 7, 31))] == ["1"]
+    assert [t.symbol for t in store.load_fills(start="2024-08-31", account="")] == ["MSFT"]
+    assert len(store.load_positions(symbols=["MSFT", "SPY"])) == 2
+    assert [p.entry_trades[0].symbol for p in store.load_positions(account="ira")] == ["SPY"]
+    assert store.date_range() == ("2024-07-01 09:30", "2024-08-31 15:59")
+
+def test_metrics_from_store_match_csv(store):
+    processor = CSVProcessor(SAMPLE_CSV)
+    trades = processor.to_trades()
+    store.import_trades(trades, strategies={t.order_id: "SINGLE" for t in trades})
+    from src.analyzers.trade_linker import TradeLinker
+    expected = MetricsCalculator.calculate_all(TradeLinker.link_trades(trades))
+    actual = MetricsCalculator.calculate_all(store.load_positions())
+    assert actual.num_trades == expected.num_trades
+    assert actual.total_pnl == pytest.approx(expected.total_pnl)
+    assert len(store.load_strategies()) == len(trades)
+
+def test_reopen_persists(tmp_path):
+    path = str(tmp_path / "journal.db")
+    with TradeStore(path) as store:
+        store.import_trades([trade("1", "STO", 2.5, "2024-07-01 09:30")])
+    with TradeStore(path) as store:
+        assert len(store.load_positions()) == 1
+
+def test_sync_cursor_per_account(tmp_path):
+    path = str(tmp_path / "journal.db")
+    with TradeStore(path) as store:
+        assert store.load_sync_cursor("a") is None
+        store.save_sync_cursor({"last_order_id": "1", "last_timestamp": "2024-07-01T09:30:00Z"}, "a")
+        store.save_sync_cursor({"last_order_id": "2", "last_timestamp": "2024-07-02T09:30:00Z"}, "a")
+    with TradeStore(path) as store:
+        assert store.load_sync_cursor("a") == {"last_order_id": "2", "last_timestamp": "2024-07-02T09:30:00Z"}
+        assert store.load_sync_cursor("b") is None
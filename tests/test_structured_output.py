@@ -0,0 +1,124 @@
+import json
+import os
+from unittest.mock import patch, MagicMock
+from src.app.main_controller import MainController
+from src.llm.openai_client import OpenAIClient
+from src.llm.prompt_builder import PromptBuilder
+from src.llm.structured_output import (
+    REPORT_SECTIONS_SCHEMA, extract_json, parse_group_summaries, parse_report_sections, partial_report_sections
+)
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "sample_valid_trades.csv")
+metrics = {'win_rate': 0.6, 'total_pnl': 1000, 'holding_periods': [1, 2]}
+SECTIONS = {"analysis": "Solid month.", "questions": ["Why?", "How?"], "action_items": ["Size down"]}
+
+def reply(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+def test_extract_json_tolerates_fences_and_prose():
+    assert extract_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert extract_json('Sure! Here it is: {"a": {"b": 2}} Hope that helps.') == {"a": {"b": 2}}
+    assert extract_json('no json here') is None
+    assert extract_json('{"a": ') is None
+
+def test_parse_report_sections():
+    sections = parse_report_sections(json.dumps(SECTIONS))
+    assert sections == {'insights': 'Solid month.', 'questions': ['Why?', 'How?'], 'action_items': ['Size down']}
+    # Questions given as one newline-separated string are split
+    assert parse_report_sections('{"analysis": "x", "questions": "A?\\nB?"}')['questions'] == ['A?', 'B?']
+    assert parse_report_sections('{"questions": []}') is None
+    assert parse_report_sections('OpenAI/LM Studio API error: timeout') is None
+
+def test_partial_sections_while_streaming():
+    text = '{"analysis": "Win rate is up.\\nKeep'
+    assert partial_report_sections(text) == {'insights': 'Win rate is up.\nKeep', 'questions': []}
+    text = '{"analysis": "Done.", "questions": ["First?", "Sec'
+    assert partial_report_sections(text) == {'insights': 'Done.', 'questions': ['First?']}
+
+def test_parse_group_summaries_keeps_requested_groups():
+    text = json.dumps({"groups": [{"group": "SPY", "summary": " Good "}, {"group": "XYZ", "summary": "?"}]})
+    assert parse_group_summaries(text, ["SPY", "QQQ"]) == {"SPY": "Good"}
+    assert parse_group_summaries("garbage", ["SPY"]) == {}
+
+def test_combined_prompt_carries_metrics_once():
+    prompt = PromptBuilder.build_combined_prompt(metrics)
+    assert prompt.count("Win Rate: 0.6") == 1
+    assert all(key in prompt for key in ('"analysis"', '"questions"', '"action_items"'))
+
+@patch('openai.OpenAI')
+def test_report_sections_in_one_request(mock_openai):
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value = reply(json.dumps(SECTIONS))
+    client = OpenAIClient(api_key="test-key", rate_limit=1000)
+    sections = client.generate_report_sections(metrics)
+    assert sections['questions'] == ['Why?', 'How?']
+    assert mock_create.call_count == 1
+    request = mock_create.call_args.kwargs
+    assert request['response_format']['json_schema']['schema'] == REPORT_SECTIONS_SCHEMA
+
+@patch('openai.OpenAI')
+def test_group_summaries_batched(mock_openai):
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value = reply('{"groups": [{"group": "SPY", "summary": "a"}, {"group": "QQQ", "summary": "b"}]}')
+    client = OpenAIClient(api_key="test-key", rate_limit=1000)
+    groups = {"SPY": {"total_pnl": 10}, "QQQ": {"total_pnl": -5}}
+    assert client.generate_group_summaries(groups) == {"SPY": "a", "QQQ": "b"}
+    assert mock_create.call_count == 1
+    assert "SPY" in mock_create.call_args.kwargs['messages'][0]['content']
+
+def run_insights(tmp_path, llm):
+    controller = MainController(output_dir=str(tmp_path), llm_client=llm,
+                                config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(SAMPLE_CSV)
+    assert controller.analyze_trades()
+    assert controller.generate_llm_insights()
+    return controller.state['llm']
+
+def test_controller_uses_combined_sections(tmp_path):
+    class SectionsLLM:
+        calls = 0
+        def generate_report_sections(self, metrics, on_delta=None):
+            self.calls += 1
+            return parse_report_sections(json.dumps(SECTIONS))
+    llm = SectionsLLM()
+    result = run_insights(tmp_path, llm)
+    assert llm.calls == 1
+    assert result['insights'] == 'Solid month.'
+    assert result['action_items'] == ['Size down']
+
+def test_controller_falls_back_when_sections_unparseable(tmp_path):
+    class BrokenJSONLLM:
+        def generate_report_sections(self, metrics, on_delta=None):
+            return None
+        def generate_performance_analysis(self, metrics):
+            return "Plain analysis"
+        def _call_openai(self, prompt):
+            return "Q1?"
+    result = run_insights(tmp_path, BrokenJSONLLM())
+    assert result['insights'] == "Plain analysis"
+    assert result['questions'] == ["Q1?"]
+
+def test_controller_reports_group_summaries(tmp_path):
+    class GroupsLLM:
+        def generate_report_sections(self, metrics, on_delta=None):
+            return parse_report_sections(json.dumps(SECTIONS))
+        def generate_group_summaries(self, groups):
+            return {name: f"{name} summary" for name in groups}
+    csv_path = tmp_path / "trades.csv"
+    csv_path.write_text(
+        "Symbol,Price,Time,Order #,Description,Expiry,Strike,OptionType,Side,Quantity\n"
+        "AAPL,2.5,2024-07-01 09:30,1,-1 Jul 19 18d 150 Call STO,2024-07-19,150.0,Call,STO,1\n"
+        "AAPL,1.0,2024-07-10 10:00,2,1 Jul 19 9d 150 Call BTC,2024-07-19,150.0,Call,BTC,1\n"
+    )
+    controller = MainController(output_dir=str(tmp_path), llm_client=GroupsLLM(),
+                                config={'export_settings': {'include_charts': False}})
+    assert controller.process_csv(str(csv_path))
+    assert controller.analyze_trades()
+    assert controller.generate_llm_insights()
+    groups = controller.state['analysis']['grouped_results']
+    assert groups
+    assert controller.state['llm']['group_summaries'] == {name: f"{name} summary" for name in groups}
+    assert controller.assemble_report()
+    assert "Strategy Summaries" in controller.state['report']
+    path = controller.export_report() and controller.state['report_path']
+    assert f"{next(iter(groups))} summary" in open(path).read()